@@ -71,6 +71,12 @@ case $MODE in
             echo "Clipboard manager not found. Install clipmenu or similar."
         fi
         ;;
+    "keys"|"keybinds")
+        # Every keybinding from the keybind reference's prebuilt index, most used first;
+        # picking a Hyprland binding runs it
+        rofi -show keys -modi "keys:/home/derrick/dotfiles/scripts/keybind-reference.py --rofi" \
+            -theme ~/.config/rofi/config.rasi
+        ;;
     "calc"|"calculator")
         rofi -show calc -modi calc -no-show-match -no-sort -theme ~/.config/rofi/config.rasi
         ;;
@@ -95,6 +101,7 @@ case $MODE in
         echo "  combi, all      - Combined mode (apps + run + windows)"
         echo "  power           - Power menu (shutdown, reboot, etc.)"
         echo "  clipboard, clip - Clipboard history"
+        echo "  keys, keybinds  - Search keybindings (Hyprland, Zellij, Neovim, ...)"
         echo "  calc            - Calculator"
         echo "  emoji           - Emoji picker"
         echo "  help            - Show this help"
@@ -17,17 +17,67 @@ if ! python3 -c "import gi; gi.require_version('Gtk', '4.0'); gi.require_version
     }
 fi
 
-# Make the script executable
-chmod +x /home/derrick/dotfiles/scripts/keybind-reference.py
+KEYBIND_REFERENCE=/home/derrick/dotfiles/scripts/keybind-reference.py
+PACKAGE_DIR=/home/derrick/dotfiles/scripts/keybind_reference
 
-# Test the application
+# Make the launcher executable
+chmod +x "$KEYBIND_REFERENCE"
+
+# Best of three headless launches (`--list` loads every source), in milliseconds
+launch_ms() {
+    local best=0 start elapsed
+    for _ in 1 2 3; do
+        start=$(date +%s%N)
+        python3 "$KEYBIND_REFERENCE" --list >/dev/null 2>&1
+        elapsed=$(( ($(date +%s%N) - start) / 1000000 ))
+        if [ "$best" -eq 0 ] || [ "$elapsed" -lt "$best" ]; then
+            best=$elapsed
+        fi
+    done
+    echo "$best"
+}
+
+# Precompile the package, so no launch (and no D-Bus activation) ever compiles
+# it from source; the launcher itself is only a few lines
+echo "📦 Precompiling bytecode..."
+find "$PACKAGE_DIR" -name __pycache__ -type d -prune -exec rm -rf {} +
+BEFORE_MS=$(PYTHONDONTWRITEBYTECODE=1 launch_ms)
+python3 -m compileall -q "$PACKAGE_DIR"
+AFTER_MS=$(launch_ms)
+echo "⏱️  Cold launch: ${BEFORE_MS} ms from source, ${AFTER_MS} ms from cached bytecode"
+
+# Register a D-Bus service so the resident instance can be activated on demand
+# (e.g. `gapplication action org.keybind.reference toggle`)
+DBUS_SERVICE_DIR="${XDG_DATA_HOME:-$HOME/.local/share}/dbus-1/services"
+mkdir -p "$DBUS_SERVICE_DIR"
+cat > "$DBUS_SERVICE_DIR/org.keybind.reference.service" << EOF
+[D-BUS Service]
+Name=org.keybind.reference
+Exec=/usr/bin/python3 $KEYBIND_REFERENCE --gapplication-service
+EOF
+
+# Ahead-of-time snapshot: render the color themes (and pack them into a GResource
+# bundle when glib-compile-resources is available), resolve every source's bindings
+# into one snapshot file and build the index the rofi `keys` mode reads, so neither
+# the panel nor rofi parses anything on its first launch
+echo "🎨 Building themes and keybinding snapshot..."
+python3 "$KEYBIND_REFERENCE" --build-snapshot >/dev/null || \
+    echo "⚠️  Snapshot build failed; sources and themes will be compiled on first launch"
+
+# Test the application headlessly: a real launch through the package, without the GUI
 echo "🧪 Testing application..."
-if python3 /home/derrick/dotfiles/scripts/keybind-reference.py --help >/dev/null 2>&1; then
+if python3 "$KEYBIND_REFERENCE" --version >/dev/null 2>&1 && \
+        python3 "$KEYBIND_REFERENCE" --help >/dev/null 2>&1; then
     echo "✅ Application installed successfully!"
     echo ""
     echo "🎹 Usage:"
     echo "  • Press SUPER + / to open keybinding reference"
+    echo "  • Run with --daemon to keep the panel resident (started by Hyprland's exec-once)"
+    echo "  • Run with --show, --hide or --toggle to control the resident panel"
+    echo "  • Run with --theme mocha|frappe|latte|macchiato (or a TOML palette in ~/.config/keybind-reference/themes)"
+    echo "  • Run with --stats (or --stats --json) to see the resident panel's load, reload and scrolling costs"
     echo "  • Click the keyboard icon (󰌌) in Waybar"
+    echo "  • Run ~/.config/rofi/launcher.sh keys to search bindings in rofi (picking a Hyprland one runs it)"
     echo "  • Press Escape to close the panel"
     echo ""
     echo "📋 Available Keybinding References:"
@@ -0,0 +1,357 @@
+#!/usr/bin/python3
+"""
+Keybinding Reference Benchmarks
+Times the keybind panel's hot paths on generated configurations and compares
+the results against a stored baseline
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import tracemalloc
+import importlib
+from pathlib import Path
+
+PACKAGE_ROOT = Path(__file__).resolve().parent
+# The dotfiles' own Hyprland config, the corpus for the categorization benchmark
+REAL_HYPRLAND_CONF = Path(__file__).resolve().parent.parent / 'hyprland' / '.config' / 'hypr' / 'hyprland.conf'
+
+DEFAULT_SIZES = (100, 1000, 10000, 50000)
+DEFAULT_BASELINE = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'keybind-reference' / 'bench-baseline.json'
+
+# Realistic dispatchers, so categorization sees the same mix as a real config
+DISPATCHERS = [
+    'exec, alacritty', 'exec, rofi -show drun', 'killactive', 'togglefloating', 'fullscreen, 0',
+    'workspace, 3', 'movetoworkspace, 5', 'movefocus, l', 'togglesplit', 'pseudo',
+    'resizeactive, 20 0', 'exec, wpctl set-volume @DEFAULT_AUDIO_SINK@ 5%+', 'exit',
+]
+KEYS = 'QWERTYUIOPASDFGHJKLZXCVBNM1234567890'
+MODIFIERS = ['SUPER', 'SUPER SHIFT', 'SUPER CTRL', 'ALT', 'SUPER ALT', '$mainMod']
+ZELLIJ_MODES = ['normal', 'locked', 'pane', 'tab', 'resize', 'move', 'scroll', 'session', 'tmux']
+ZELLIJ_ACTIONS = ['MoveFocus "Left";', 'NewPane "Down";', 'SwitchToMode "Normal";', 'GoToTab 1;', 'Resize "Increase";']
+
+
+def load_module():
+    """Import the keybind_reference package's submodules as one namespace
+    
+    The package directory is put on the path (and on PYTHONPATH, so worker
+    processes of the Neovim scanner's pool find it the same way). The GUI
+    module is looked at last, after import_gtk() has filled in its Gtk and
+    GLib globals.
+    """
+    sys.path.insert(0, str(PACKAGE_ROOT))
+    os.environ['PYTHONPATH'] = os.pathsep.join(filter(None, [str(PACKAGE_ROOT), os.environ.get('PYTHONPATH')]))
+    modules = [importlib.import_module(f"keybind_reference.{name}")
+               for name in ('sources', 'model', 'hyprland', 'gui')]
+    
+    class Namespace:
+        def __getattr__(self, name):
+            for module in modules:
+                if hasattr(module, name):
+                    return getattr(module, name)
+            raise AttributeError(name)
+    return Namespace()
+
+
+def generate_hyprland(root, binds, depth=8):
+    """Write hyprland.conf with `binds` binds spread over a source= chain `depth` files deep"""
+    hypr = root / '.config' / 'hypr'
+    hypr.mkdir(parents=True, exist_ok=True)
+    files = [hypr / 'hyprland.conf'] + [hypr / f"binds-{level}.conf" for level in range(1, depth)]
+    per_file = -(-binds // len(files))
+    count = 0
+    for level, path in enumerate(files):
+        lines = ['$mainMod = SUPER', '$terminal = alacritty', 'general {', '    gaps_in = 5', '}']
+        if level + 1 < len(files):
+            lines.append(f"source = ./{files[level + 1].name}")
+        for _ in range(per_file):
+            if count >= binds:
+                break
+            modifiers = MODIFIERS[count % len(MODIFIERS)]
+            key = KEYS[count % len(KEYS)] + (str(count // len(KEYS)) if count >= len(KEYS) else '')
+            dispatcher = DISPATCHERS[count % len(DISPATCHERS)]
+            lines.append(f"bind = {modifiers}, {key}, {dispatcher}  # binding {count}")
+            count += 1
+        path.write_text('\n'.join(lines) + '\n')
+    return files[0]
+
+
+def generate_zellij(root, binds, layout_lines=2000):
+    """Write config.kdl with `binds` binds over the modes after a large layout block"""
+    zellij = root / '.config' / 'zellij'
+    zellij.mkdir(parents=True, exist_ok=True)
+    lines = ['layout {']
+    lines.extend(f'    pane split_direction="vertical" {{ pane command="htop" {{ args "-d" "{line}"; }} }}'
+                 for line in range(layout_lines))
+    lines.append('}')
+    lines.append('keybinds clear-defaults=true {')
+    per_mode = -(-binds // len(ZELLIJ_MODES))
+    count = 0
+    for mode in ZELLIJ_MODES:
+        lines.append(f"    {mode} {{")
+        for _ in range(per_mode):
+            if count >= binds:
+                break
+            lines.append(f'        bind "Alt {KEYS[count % len(KEYS)]}{count}" {{ {ZELLIJ_ACTIONS[count % len(ZELLIJ_ACTIONS)]} }}')
+            count += 1
+        lines.append('    }')
+    lines.append('    shared_except "locked" { bind "Ctrl g" { SwitchToMode "Locked"; } }')
+    lines.append('}')
+    path = zellij / 'config.kdl'
+    path.write_text('\n'.join(lines) + '\n')
+    return path
+
+
+def generate_neovim(root, binds, per_file=50):
+    """Write an init.lua and a lua/ tree holding `binds` keymaps"""
+    nvim = root / '.config' / 'nvim'
+    (nvim / 'lua' / 'plugins').mkdir(parents=True, exist_ok=True)
+    (nvim / 'init.lua').write_text('vim.g.mapleader = " "\nrequire("keymaps")\n')
+    for number in range(-(-binds // per_file)):
+        lines = ['local map = vim.keymap.set', 'local opts = { noremap = true, silent = true }']
+        for index in range(number * per_file, min(binds, (number + 1) * per_file)):
+            if index % 3 == 0:
+                lines.append(f'map("n", "<leader>{index}", function() print({index}) end, {{ desc = "Action {index}" }})')
+            else:
+                lines.append(f'map({{ "n", "v" }}, "<leader>k{index}", "<cmd>echo {index}<CR>", opts) -- Echo {index}')
+        (nvim / 'lua' / 'plugins' / f"generated_{number}.lua").write_text('\n'.join(lines) + '\n')
+    return nvim
+
+
+def measure(function, repeat):
+    """Best and median wall time over `repeat` runs, then one traced run for memory
+
+    Memory comes from a separate run because tracemalloc slows the code down.
+    Allocations are the blocks still allocated after the run (what it retains).
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    times.sort()
+
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    result = function()
+    _, peak = tracemalloc.get_traced_memory()
+    retained_blocks = sys.getallocatedblocks() - blocks
+    tracemalloc.stop()
+    del result
+    return {
+        'best_ms': round(times[0] * 1000, 3),
+        'median_ms': round(times[len(times) // 2] * 1000, 3),
+        'peak_kb': round(peak / 1024, 1),
+        'blocks': retained_blocks,
+    }
+
+
+def start_broadway():
+    """Start a Broadway display server so GTK can build widgets without a screen
+
+    Returns the process, or None when GTK or gtk4-broadwayd is unavailable.
+    """
+    import shutil
+    import subprocess
+
+    daemon = shutil.which('gtk4-broadwayd') or shutil.which('broadwayd')
+    if daemon is None:
+        return None
+    display = ':93'
+    process = subprocess.Popen([daemon, display], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    os.environ['GDK_BACKEND'] = 'broadway'
+    os.environ['BROADWAY_DISPLAY'] = display
+    return process
+
+
+def widget_benchmarks(module, tables, repeat):
+    """create_keybind_section timings, or {} when no headless display is available"""
+    broadway = start_broadway()
+    if broadway is None:
+        print("skipping widget benchmarks: gtk4-broadwayd not found", file=sys.stderr)
+        return {}
+    try:
+        try:
+            module.import_gtk()
+        except (ImportError, ValueError) as e:
+            print(f"skipping widget benchmarks: {e}", file=sys.stderr)
+            return {}
+        Gtk, GLib = module.Gtk, module.GLib
+        if not Gtk.init_check():
+            print("skipping widget benchmarks: cannot open the Broadway display", file=sys.stderr)
+            return {}
+        app = module.KeybindingReference()
+        results = {}
+        for size, table in tables.items():
+            def build():
+                store = app.create_keybind_store(table)
+                filtered, _, rank_sorter = app.create_search_models(store, 'hyprland_keybinds')
+                page, _ = app.create_keybind_section(filtered, rank_sorter)
+                window = Gtk.Window()
+                window.set_child(page)
+                window.present()
+                # Let the list view lay out and instantiate its visible rows
+                context = GLib.MainContext.default()
+                while context.iteration(False):
+                    pass
+                window.destroy()
+            results[f"create_keybind_section/{size}"] = measure(build, repeat)
+        return results
+    finally:
+        broadway.terminate()
+
+
+def run_benchmarks(sizes, repeat, widgets):
+    """Benchmark in a throwaway HOME, removed afterwards along with the environment changes"""
+    environ = dict(os.environ)
+    with tempfile.TemporaryDirectory(prefix='keybind-bench-') as root:
+        try:
+            return benchmark_sources(Path(root), sizes, repeat, widgets)
+        finally:
+            os.environ.clear()
+            os.environ.update(environ)
+
+
+def benchmark_sources(root, sizes, repeat, widgets):
+    os.environ['HOME'] = str(root)
+    os.environ['XDG_CACHE_HOME'] = str(root / 'cache')
+    os.environ['XDG_CONFIG_HOME'] = str(root / '.config')
+    # Inside a Hyprland session the loaders would ask the running compositor
+    # over IPC instead of parsing the generated configuration
+    for name in ('ZELLIJ_CONFIG_FILE', 'ZELLIJ_CONFIG_DIR', 'HYPRLAND_INSTANCE_SIGNATURE'):
+        os.environ.pop(name, None)
+    module = load_module()
+
+    results = {}
+    tables = {}
+    for size in sizes:
+        print(f"benchmarking {size} binds...", file=sys.stderr)
+        generate_hyprland(root, size)
+        generate_zellij(root, size)
+        generate_neovim(root, size)
+
+        def cold_sources():
+            # A fresh cache directory per run, so every run parses
+            os.environ['XDG_CACHE_HOME'] = tempfile.mkdtemp(dir=root)
+            return module.KeybindSources()
+
+        results[f"load_hyprland_keybinds/cold/{size}"] = measure(lambda: cold_sources().load_hyprland_keybinds(), repeat)
+        os.environ['XDG_CACHE_HOME'] = str(root / 'cache')
+        sources = module.KeybindSources()
+        sources.load_hyprland_keybinds()
+        results[f"load_hyprland_keybinds/cached/{size}"] = measure(sources.load_hyprland_keybinds, repeat)
+        results[f"load_zellij_keybinds/cold/{size}"] = measure(lambda: cold_sources().load_zellij_keybinds(), repeat)
+        results[f"load_neovim_keybinds/cold/{size}"] = measure(lambda: cold_sources().load_neovim_lsp_keybinds(), repeat)
+        os.environ['XDG_CACHE_HOME'] = str(root / 'cache')
+
+        records, _ = sources.parse_hyprland_keybinds()
+        actions = [f"{record['dispatcher']}, {record['args']}" for record in records]
+        results[f"categorize_hyprland_action/{size}"] = measure(
+            lambda: [sources.categorize_hyprland_action(action) for action in actions], repeat)
+        results[f"group/{size}"] = measure(
+            lambda: module.KeybindTable.from_records(records, 'hyprland').sections(), repeat)
+
+        table = module.KeybindTable.from_records(records, 'hyprland')
+        tables[size] = table
+        results[f"search_index/{size}"] = measure(lambda: module.SearchIndex(table), repeat)
+        index = module.SearchIndex(table)
+        results[f"search/{size}"] = measure(lambda: (index.search(''), index.search('workspace 5')), repeat)
+
+    if REAL_HYPRLAND_CONF.is_file():
+        # The real binds repeated up to the largest size, so the dispatcher mix is ours
+        records, _ = module.HyprlandConfigParser().parse(REAL_HYPRLAND_CONF)
+        sources = module.KeybindSources()
+        corpus = [(record['dispatcher'], record['args']) for record in records]
+        corpus = (corpus * (max(sizes) // max(len(corpus), 1) + 1))[:max(sizes)]
+        results[f"categorize/real-corpus/{len(corpus)}"] = measure(
+            lambda: [sources.hyprland_categorizer.categorize(dispatcher, args) for dispatcher, args in corpus],
+            repeat)
+    
+    if widgets:
+        results.update(widget_benchmarks(module, tables, repeat))
+    return results
+
+
+def compare(results, baseline, time_threshold, memory_threshold):
+    """Return the benchmarks that got slower or bigger than the thresholds allow"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        # Sub-millisecond timings are too noisy to compare as ratios
+        if previous['best_ms'] >= 1 and result['best_ms'] > previous['best_ms'] * time_threshold:
+            regressions.append(f"{name}: {previous['best_ms']} ms -> {result['best_ms']} ms")
+        if previous['peak_kb'] >= 64 and result['peak_kb'] > previous['peak_kb'] * memory_threshold:
+            regressions.append(f"{name}: peak {previous['peak_kb']} KiB -> {result['peak_kb']} KiB")
+    return regressions
+
+
+def print_results(results, baseline):
+    width = max(len(name) for name in results)
+    print(f"{'BENCHMARK'.ljust(width)}  {'BEST ms':>10}  {'MEDIAN ms':>10}  {'PEAK KiB':>10}  {'BLOCKS':>8}  {'VS BASELINE':>11}")
+    for name, result in results.items():
+        previous = baseline.get(name)
+        change = f"{result['best_ms'] / previous['best_ms']:.2f}x" if previous and previous['best_ms'] else ''
+        print(f"{name.ljust(width)}  {result['best_ms']:>10}  {result['median_ms']:>10}  "
+              f"{result['peak_kb']:>10}  {result['blocks']:>8}  {change:>11}")
+
+
+def main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='keybind-reference-bench',
+        description="Benchmark the keybinding reference panel on generated configurations.",
+    )
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated bind counts (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per benchmark (default: %(default)s)")
+    parser.add_argument('--quick', action='store_true', help="only the two smallest sizes, 3 runs each")
+    parser.add_argument('--no-widgets', action='store_true', help="skip the GTK widget benchmarks")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE,
+                        help="baseline JSON to compare against (default: %(default)s)")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--time-threshold', type=float, default=1.25,
+                        help="fail when a benchmark is this many times slower (default: %(default)s)")
+    parser.add_argument('--memory-threshold', type=float, default=1.25,
+                        help="fail when peak memory grows by this factor (default: %(default)s)")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    args = parser.parse_args(argv[1:])
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    repeat = args.repeat
+    if args.quick:
+        sizes, repeat = sorted(sizes)[:2], 3
+
+    baseline = {}
+    if args.baseline.is_file():
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f).get('results', {})
+
+    results = run_benchmarks(sizes, repeat, widgets=not args.no_widgets)
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        print_results(results, baseline)
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2)
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    regressions = compare(results, baseline, args.time_threshold, args.memory_threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
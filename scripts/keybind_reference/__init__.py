@@ -0,0 +1,17 @@
+"""
+Keybinding Reference Panel
+A modern, Catppuccin-themed floating panel showing Hyprland and Zellij keybindings
+
+The code lives in this package rather than in the keybind-reference.py
+launcher, so Python caches its bytecode instead of compiling the whole tool
+from source on every launch. Submodules are imported by what a command
+needs: a headless query never imports the GUI, and a source whose cache
+entry is current never imports its parser.
+"""
+
+import time
+
+# Startup phases are reported relative to this
+STARTED = time.perf_counter()
+
+__version__ = '2.0.0'
@@ -0,0 +1,202 @@
+"""
+Categories for window manager binds, from the dispatcher and its arguments
+"""
+
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+
+
+
+# Default categorization rules. Dispatchers are looked up directly; the argument
+# patterns (checked first, in order) catch what the dispatcher alone cannot
+# tell, such as an exec that changes the volume.
+HYPRLAND_CATEGORY_RULES = {
+    'default': 'General',
+    'dispatchers': {
+        'exec': 'Applications', 'execr': 'Applications',
+        'killactive': 'Window Management', 'closewindow': 'Window Management',
+        'togglefloating': 'Window Management', 'setfloating': 'Window Management',
+        'settiled': 'Window Management', 'fullscreen': 'Window Management',
+        'fullscreenstate': 'Window Management', 'pseudo': 'Window Management',
+        'togglesplit': 'Window Management', 'swapsplit': 'Window Management',
+        'layoutmsg': 'Window Management', 'splitratio': 'Window Management',
+        'pin': 'Window Management', 'centerwindow': 'Window Management',
+        'resizeactive': 'Window Management', 'resizewindow': 'Window Management',
+        'resizewindowpixel': 'Window Management', 'moveactive': 'Window Management',
+        'movewindow': 'Window Management', 'movewindowpixel': 'Window Management',
+        'swapwindow': 'Window Management', 'togglegroup': 'Window Management',
+        'changegroupactive': 'Window Management', 'moveintogroup': 'Window Management',
+        'moveoutofgroup': 'Window Management', 'lockgroups': 'Window Management',
+        'movefocus': 'Navigation', 'cyclenext': 'Navigation', 'focuswindow': 'Navigation',
+        'focusmonitor': 'Navigation', 'focusurgentorlast': 'Navigation',
+        'focuscurrentorlast': 'Navigation', 'alterzorder': 'Navigation', 'bringactivetotop': 'Navigation',
+        'workspace': 'Workspaces', 'movetoworkspace': 'Workspaces',
+        'movetoworkspacesilent': 'Workspaces', 'togglespecialworkspace': 'Workspaces',
+        'renameworkspace': 'Workspaces', 'focusworkspaceoncurrentmonitor': 'Workspaces',
+        'movecurrentworkspacetomonitor': 'Workspaces', 'moveworkspacetomonitor': 'Workspaces',
+        'swapactiveworkspaces': 'Workspaces',
+        'exit': 'System', 'dpms': 'System', 'forcerendererreload': 'System',
+        'submap': 'System', 'global': 'System', 'pass': 'System', 'sendshortcut': 'System',
+        # dwm and dwl functions
+        'spawn': 'Applications', 'killclient': 'Window Management', 'setlayout': 'Window Management',
+        'togglelayout': 'Window Management', 'setmfact': 'Window Management',
+        'incnmaster': 'Window Management', 'zoom': 'Window Management',
+        'togglefullscreen': 'Window Management', 'movemouse': 'Window Management',
+        'resizemouse': 'Window Management', 'moveresize': 'Window Management',
+        'tagmon': 'Window Management', 'focusstack': 'Navigation', 'focusmon': 'Navigation',
+        'view': 'Workspaces', 'toggleview': 'Workspaces', 'tag': 'Workspaces', 'toggletag': 'Workspaces',
+        'quit': 'System', 'chvt': 'System', 'togglebar': 'System',
+        # Qtile lazy commands; object.method names fall back to the object
+        'window': 'Window Management', 'layout': 'Window Management', 'group': 'Workspaces',
+        'screen': 'Navigation', 'layout.left': 'Navigation', 'layout.right': 'Navigation',
+        'layout.up': 'Navigation', 'layout.down': 'Navigation', 'layout.next': 'Navigation',
+        'layout.previous': 'Navigation', 'window.togroup': 'Workspaces', 'next_layout': 'Window Management',
+        'prev_layout': 'Window Management', 'spawncmd': 'Applications', 'shutdown': 'System',
+        'reload_config': 'System', 'restart': 'System',
+    },
+    'patterns': [
+        {'category': 'System', 'words': [
+            'volume', 'wpctl', 'pactl', 'pamixer', 'amixer', 'brightness', 'brightnessctl',
+            'playerctl', 'hyprlock', 'swaylock', 'loginctl', 'poweroff', 'reboot', 'suspend',
+        ]},
+    ],
+}
+
+
+class HyprlandCategorizer:
+    """Data-driven categorization of Hyprland binds
+    
+    The dispatcher is looked up in a dict; the arguments are matched
+    against one precompiled alternation whose named groups are the
+    categories, so each bind costs one lookup and at most one regex search
+    however many rules there are. User rules in
+    $XDG_CONFIG_HOME/keybind-reference/categories.toml extend the defaults:
+    
+        default = "Other"
+        [dispatchers]
+        togglesplit = "Layout"
+        [[patterns]]
+        category = "Screenshots"
+        words = ["grim", "hyprshot"]
+    
+    User patterns are checked before the built-in ones. The merged rules are
+    kept in the cache, so the TOML file is only read again after it changes.
+    """
+    
+    def __init__(self, cache):
+        self.cache = cache
+        config_home = os.environ.get('XDG_CONFIG_HOME') or str(Path.home() / '.config')
+        self.rules_path = Path(config_home) / 'keybind-reference' / 'categories.toml'
+        self.dispatchers = None
+        self.pattern = None
+        self.pattern_categories = {}
+        self.default = 'General'
+        self.warned = False
+        # The hyprland, qtile, dwm and dwl loaders share one categorizer from their own threads
+        self.lock = threading.Lock()
+    
+    def load_rules(self):
+        """Merged rules, from the cache while categories.toml is unchanged"""
+        rules = self.cache.lookup('categories')
+        if rules is not None:
+            return rules
+        
+        rules = {
+            'default': HYPRLAND_CATEGORY_RULES['default'],
+            'dispatchers': dict(HYPRLAND_CATEGORY_RULES['dispatchers']),
+            'patterns': list(HYPRLAND_CATEGORY_RULES['patterns']),
+        }
+        if self.rules_path.is_file():
+            try:
+                user_rules = self.read_user_rules()
+            except ValueError as e:
+                # Categorize with the built-in rules rather than fail every source;
+                # nothing is cached, so fixing the file takes effect on the next load
+                if not self.warned:
+                    self.warned = True
+                    print(f"Error in {self.rules_path}: {e}; using the built-in categories", file=sys.stderr)
+                return rules
+            rules['default'] = user_rules['default'] or rules['default']
+            rules['dispatchers'].update(user_rules['dispatchers'])
+            rules['patterns'] = user_rules['patterns'] + rules['patterns']
+        self.cache.store('categories', [self.rules_path], rules)
+        return rules
+    
+    def read_user_rules(self):
+        """categories.toml checked for shape; raises ValueError when unreadable or malformed"""
+        import tomllib
+        
+        try:
+            with open(self.rules_path, 'rb') as f:
+                user_rules = tomllib.load(f)
+        except OSError as e:
+            raise ValueError(e.strerror or str(e)) from None
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(str(e)) from None
+        try:
+            default = user_rules.get('default')
+            if default is not None and not isinstance(default, str):
+                raise TypeError("default must be a string")
+            dispatchers = {}
+            for dispatcher, category in user_rules.get('dispatchers', {}).items():
+                if not isinstance(category, str):
+                    raise TypeError(f"dispatchers.{dispatcher} must be a string")
+                dispatchers[dispatcher.lower()] = category
+            patterns = []
+            for pattern in user_rules.get('patterns', []):
+                words, category = pattern['words'], pattern['category']
+                if not isinstance(category, str) or isinstance(words, str) \
+                        or not all(isinstance(word, str) for word in words):
+                    raise TypeError("each [[patterns]] needs a category string and a list of words")
+                patterns.append({'category': category, 'words': list(words)})
+        except KeyError as e:
+            raise ValueError(f"[[patterns]] entry without {e.args[0]!r}") from None
+        except (TypeError, AttributeError) as e:
+            raise ValueError(str(e)) from None
+        return {'default': default, 'dispatchers': dispatchers, 'patterns': patterns}
+    
+    def compile(self):
+        """Build the lookup tables once, even when several loader threads categorize at the same time
+        
+        categorize() only checks self.dispatchers, so it is published last:
+        a thread that sees it also sees the pattern it goes with.
+        """
+        with self.lock:
+            if self.dispatchers is not None:
+                return
+            rules = self.load_rules()
+            alternatives = []
+            pattern_categories = {}
+            for number, pattern in enumerate(rules['patterns']):
+                words = '|'.join(re.escape(word.lower())
+                                 for word in sorted(pattern['words'], key=len, reverse=True))
+                if words:
+                    alternatives.append(f"(?P<rule{number}>{words})")
+                    pattern_categories[f"rule{number}"] = pattern['category']
+            # Matched against lowercased arguments: re.IGNORECASE would defeat the
+            # literal prefix scan and make every search several times slower
+            self.pattern = re.compile('|'.join(alternatives)) if alternatives else None
+            self.pattern_categories = pattern_categories
+            self.default = rules['default']
+            self.dispatchers = rules['dispatchers']
+    
+    def categorize(self, dispatcher, args=''):
+        """Category of one bind from its dispatcher and arguments"""
+        if self.dispatchers is None:
+            self.compile()
+        if args and self.pattern is not None:
+            match = self.pattern.search(args.lower())
+            if match is not None:
+                return self.pattern_categories[match.lastgroup]
+        dispatcher = dispatcher.strip().lower()
+        category = self.dispatchers.get(dispatcher)
+        if category is None and '.' in dispatcher:
+            category = self.dispatchers.get(dispatcher.partition('.')[0])
+        return category or self.default
+    
+    def dependencies(self):
+        """Files whose changes must re-categorize cached binds"""
+        return [self.rules_path]
@@ -0,0 +1,148 @@
+"""
+Command line entry point: dispatches to the headless queries or the panel,
+importing only what the chosen mode needs
+"""
+
+import sys
+import time
+
+from . import STARTED, __version__
+from .core import PROFILER
+
+
+def create_argument_parser():
+    """Command line for both the headless queries and the panel"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        prog='keybind-reference',
+        description="Catppuccin-themed keybinding reference panel with a headless query mode.",
+        epilog="Without a query option the GTK panel is started.",
+    )
+    
+    panel = parser.add_argument_group('panel')
+    panel.add_argument('-d', '--daemon', action='store_true', help="stay resident with the window pre-built")
+    panel.add_argument('--show', action='store_true', help="show the reference window")
+    panel.add_argument('--hide', action='store_true', help="hide the reference window")
+    panel.add_argument('-t', '--toggle', action='store_true', help="show the window if hidden, hide it otherwise")
+    panel.add_argument('--theme', metavar='NAME',
+                       help="color theme: macchiato (default), mocha, frappe, latte or a TOML palette")
+    panel.add_argument('--stats', action='store_true',
+                       help="print the resident panel's runtime counters and timings (with --json: as JSON)")
+    parser.add_argument('--version', action='version', version=f"%(prog)s {__version__}")
+    parser.add_argument('--compile-themes', action='store_true',
+                        help="render every theme to CSS (and a GResource bundle if possible), then exit")
+    parser.add_argument('--build-snapshot', action='store_true',
+                        help="compile the themes and snapshot every source's bindings ahead of time, then exit")
+    parser.add_argument('--profile', nargs='?', const='-', metavar='FILE',
+                        help="write startup phase timings as JSON to FILE (default: stderr)")
+    
+    query = parser.add_argument_group('headless queries (never load GTK)')
+    query.add_argument('--list', action='store_true', help="print bindings as a table")
+    query.add_argument('--json', action='store_true', help="print bindings as a JSON array")
+    query.add_argument('--ndjson', action='store_true', help="print bindings as one JSON object per line")
+    query.add_argument('--search', metavar='TEXT', help="only bindings matching every word of TEXT")
+    query.add_argument('--lookup', metavar='CHORD', help="what a chord such as SUPER+J does")
+    query.add_argument('--source', metavar='NAME',
+                       help="only this source (hyprland, qtile, dwm, dwl, zellij, neovim_lsp); a prefix is enough")
+    query.add_argument('--category', metavar='NAME', help="only categories containing NAME")
+    query.add_argument('--check', action='store_true',
+                       help="report chords bound twice, prefix clashes and shadowed bindings; exit 1 if any")
+    query.add_argument('--rofi', nargs='?', const='', metavar='ENTRY',
+                       help="rofi script mode: list bindings, most used first, or run the picked ENTRY")
+    return parser
+
+
+def is_query(args):
+    return any((args.list, args.json, args.ndjson, args.search, args.lookup, args.source, args.category,
+                args.check, args.rofi is not None))
+
+
+def compile_themes():
+    """Headless theme compilation step, run by the installer"""
+    from .core import KeybindCache
+    from .themes import ThemeCompiler
+    
+    themes = ThemeCompiler(KeybindCache())
+    try:
+        for name in themes.names():
+            print(f"{name}: {themes.compile(name)}")
+        bundle = themes.compile_bundle()
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Error compiling themes: {e}", file=sys.stderr)
+        return 1
+    print(f"bundle: {bundle or 'skipped (glib-compile-resources not found)'}")
+    return 0
+
+
+def build_snapshot():
+    """Ahead-of-time build run by the installer: themes, the snapshot and the rofi index
+    
+    Every source is loaded from its configuration files (never from the
+    running compositor), so the snapshot holds what a launch would parse.
+    """
+    from .rofi import RofiIndex
+    from .sources import KeybindSources
+    
+    status = compile_themes()
+    sources = KeybindSources()
+    if sources.hyprland_config_path().is_file():
+        sources.load_cached('hyprland', 'hyprland', sources.parse_hyprland_keybinds)
+    rows = RofiIndex(sources.cache).build(sources)
+    try:
+        path = sources.snapshot.write()
+    except OSError as e:
+        print(f"Error writing the snapshot: {e}", file=sys.stderr)
+        return 1
+    print(f"snapshot: {path} ({len(sources.snapshot.entries)} sources, {len(rows)} bindings)")
+    return status
+
+
+def strip_profile_option(argv, value):
+    """Remove --profile[=FILE] from argv before GApplication sees it"""
+    stripped = []
+    skip_next = False
+    for position, token in enumerate(argv):
+        if skip_next:
+            skip_next = False
+            continue
+        if token.startswith('--profile='):
+            continue
+        if token == '--profile':
+            # argparse consumed a separate FILE argument
+            skip_next = position + 1 < len(argv) and argv[position + 1] == value
+            continue
+        stripped.append(token)
+    return stripped
+
+
+def main(argv):
+    imported = time.perf_counter()
+    # Unknown options (e.g. --gapplication-service) are left for GApplication
+    args, _ = create_argument_parser().parse_known_args(argv[1:])
+    if args.profile:
+        PROFILER.enable(args.profile)
+        argv = strip_profile_option(argv, args.profile)
+    PROFILER.record('import', STARTED, imported)
+    
+    if args.compile_themes:
+        return compile_themes()
+    
+    if args.build_snapshot:
+        return build_snapshot()
+    
+    if args.stats:
+        from .export import run_stats
+        return run_stats(args)
+    
+    if is_query(args):
+        from .export import run_query
+        try:
+            return run_query(args)
+        except BrokenPipeError:
+            # Output piped into head, fzf, rofi, ... which exited early
+            return 0
+    
+    from .gui import KeybindingReference
+    app = KeybindingReference()
+    return app.run(argv)
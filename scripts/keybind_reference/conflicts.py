@@ -0,0 +1,301 @@
+"""
+Canonical chords across sources, and the duplicates, prefix clashes and
+shadowed bindings they reveal
+"""
+
+import re
+from functools import lru_cache
+
+
+# Modifier spellings of every source -> canonical name, and their display order
+CHORD_MODIFIERS = {
+    'SUPER': 'SUPER', 'WIN': 'SUPER', 'LOGO': 'SUPER', 'MOD4': 'SUPER',
+    'CTRL': 'CTRL', 'CONTROL': 'CTRL', 'CTL': 'CTRL',
+    'ALT': 'ALT', 'MOD1': 'ALT', 'META': 'ALT',
+    'SHIFT': 'SHIFT',
+}
+
+
+CHORD_MODIFIER_ORDER = {'SUPER': 0, 'CTRL': 1, 'ALT': 2, 'SHIFT': 3}
+
+
+# Neovim <X-...> modifier letters
+VIM_MODIFIERS = {'C': 'CTRL', 'M': 'ALT', 'A': 'ALT', 'S': 'SHIFT', 'D': 'SUPER', 'T': 'SUPER'}
+
+
+# Key names that are spelled differently across sources
+CHORD_KEY_ALIASES = {
+    'ENTER': 'RETURN', 'CR': 'RETURN', 'ESC': 'ESCAPE', 'BS': 'BACKSPACE', 'DEL': 'DELETE',
+    '/': 'SLASH', ',': 'COMMA', '.': 'PERIOD', '-': 'MINUS', '=': 'EQUAL', ';': 'SEMICOLON',
+    "'": 'APOSTROPHE', '\\': 'BACKSLASH', '[': 'BRACKETLEFT', ']': 'BRACKETRIGHT',
+    ' ': 'SPACE', 'LT': '<', 'BAR': '|',
+}
+
+
+VIM_KEY_TOKEN = re.compile(r'(<[^<>\s]+>)')
+
+
+CHORD_STEP_TOKENS = re.compile(r'[\s+]+')
+
+
+# Steps of a multi-key chord: 'Ctrl + a, x', but not the comma key in 'SUPER + ,'
+CHORD_STEPS = re.compile(r',\s+(?=\S)')
+
+
+VIM_MODE_SUFFIX = re.compile(r'^(.*) \([^()]*\)$', re.S)
+
+
+# Actions that only lead into a mode or key sequence (a Zellij SwitchToMode,
+# a Hyprland submap, a tmux-style prefix), which longer chords continue
+MODE_ENTRY_ACTION = re.compile(r'^(?:SwitchToMode\b|submap\b|Enter\b.*\bMode$)', re.I)
+
+
+# Modes a Neovim mode letter covers, as given to vim.keymap.set
+VIM_MODE_SCOPES = {'': 'nxso', 'nvo': 'nxso', 'v': 'xs', '!': 'ic', 'l': 'ic'}
+
+
+def canonical_modifiers(names):
+    return sorted(set(names), key=lambda name: (CHORD_MODIFIER_ORDER.get(name, len(CHORD_MODIFIER_ORDER)), name))
+
+
+@lru_cache(maxsize=None)
+def canonical_modifier_tokens(tokens):
+    """The modifier tokens of a step ('SUPER', 'shift', 'CTRL_ALT', ...) in canonical order
+    
+    A configuration uses a handful of modifier combinations for all of its
+    binds, so each is worked out once.
+    """
+    modifiers = []
+    for token in tokens:
+        parts = re.split(r'[_&]', token.upper())
+        if all(part in CHORD_MODIFIERS for part in parts):
+            modifiers.extend(CHORD_MODIFIERS[part] for part in parts)
+        else:
+            modifiers.append(token.upper())
+    return tuple(canonical_modifiers(modifiers))
+
+
+def canonical_step(step, keep_case=False):
+    """One 'SUPER SHIFT + q' style step as 'SUPER+SHIFT+Q'
+    
+    Window managers match keys case-insensitively. With keep_case (Zellij)
+    'H' and 'h' stay distinct keys, except under Ctrl alone, where a
+    terminal cannot tell them apart.
+    """
+    step = step.strip()
+    tokens = [token for token in CHORD_STEP_TOKENS.split(step) if token]
+    # A trailing '+' is the plus key itself
+    if step == '+' or step.endswith((' +', '++')):
+        tokens.append('+')
+    if not tokens:
+        return ''
+    modifiers = canonical_modifier_tokens(tuple(tokens[:-1]))
+    key = tokens[-1]
+    if not (keep_case and len(key) == 1 and modifiers != ('CTRL',)):
+        key = key.upper()
+    return '+'.join([*modifiers, CHORD_KEY_ALIASES.get(key, key)])
+
+
+@lru_cache(maxsize=None)
+def canonical_vim_key(token):
+    """One <...> key of a Neovim left-hand side: '<C-d>' -> 'CTRL+D', '<Leader>' -> '<leader>'"""
+    *modifiers, name = token[1:-1].split('-')
+    if not name and modifiers:
+        # <C--> and friends: the key is the minus sign
+        modifiers, name = modifiers[:-1], '-'
+    if not all(modifier.upper() in VIM_MODIFIERS for modifier in modifiers):
+        return token.lower()
+    modifiers = canonical_modifiers(VIM_MODIFIERS[modifier.upper()] for modifier in modifiers)
+    if not modifiers and name.lower() in ('leader', 'localleader'):
+        return f"<{name.lower()}>"
+    if len(name) == 1:
+        # Terminals cannot tell <C-a> from <C-A>; other letters keep their case
+        name = name.upper() if modifiers == ['CTRL'] else name
+    else:
+        name = name.upper()
+    name = CHORD_KEY_ALIASES.get(name, name)
+    return '+'.join([*modifiers, name]) if modifiers else name
+
+
+def canonical_vim_keys(lhs):
+    """A Neovim left-hand side as a tuple of canonical keys: '<Leader>tR' -> ('<leader>', 't', 'R')"""
+    steps = []
+    # split() leaves the <...> keys at odd positions and runs of plain keys between them
+    for number, token in enumerate(VIM_KEY_TOKEN.split(lhs)):
+        if number % 2:
+            steps.append(canonical_vim_key(token))
+        elif ' ' in token:
+            steps.extend(CHORD_KEY_ALIASES[' '] if char == ' ' else char for char in token)
+        else:
+            steps.extend(token)
+    return tuple(steps)
+
+
+@lru_cache(maxsize=None)
+def canonical_chords(source, key):
+    """Chords a key of one source's table stands for, as tuples of canonical steps
+    
+    Neovim keys lose the ' (modes)' suffix of mappings outside normal mode;
+    Zellij keys listed as 'Ctrl + a / Alt + a' give one chord per alternative.
+    """
+    if source == 'neovim_lsp':
+        match = VIM_MODE_SUFFIX.match(key)
+        return (canonical_vim_keys(key if match is None else match.group(1)),)
+    chords = []
+    keep_case = source == 'zellij'
+    for alternative in key.split(' / '):
+        steps = CHORD_STEPS.split(alternative) if ',' in alternative else (alternative,)
+        chord = tuple(canonical_step(step, keep_case) for step in steps)
+        if all(chord):
+            chords.append(chord)
+    return tuple(chords)
+
+
+def chord_text(source, chord):
+    """A canonical chord as display text: '<leader>tr' in Neovim, 'CTRL+A, X' elsewhere"""
+    return ''.join(chord) if source == 'neovim_lsp' else ', '.join(chord)
+
+
+CONFLICT_KINDS = {
+    'duplicate': 'Bound Twice',
+    'prefix': 'Prefix Waits for a Timeout',
+    'shadowed': 'Shadowed by the Window Manager or Zellij',
+}
+
+
+class ChordIndex:
+    """Bindings of every source keyed by scope and canonical chord
+    
+    A chord is a tuple of steps, with canonical modifier order, modifier
+    spelling and key case: ('<leader>', 't', 'r') for a Neovim mapping,
+    ('SUPER+SHIFT+Q',) for a window manager bind. The scope is where a
+    binding applies: a Neovim mode (buffer-local mappings are scoped to
+    their file), a Zellij mode or a Hyprland submap. Each source is indexed
+    in one pass when it loads, off the main loop; conflicts() then walks
+    the index once and reports
+    
+      duplicate  one chord bound more than once in the same scope
+      prefix     a binding that makes a longer one wait for a timeout
+                 (keys that enter a mode or sequence are not counted)
+      shadowed   a chord the window manager (or Zellij) consumes before
+                 the application inside it ever sees it
+    """
+    
+    APPLICATIONS = ('zellij', 'neovim_lsp')
+    # Zellij modes that are active while typing into a pane
+    ZELLIJ_PASSTHROUGH = ('normal', 'locked', '')
+    
+    def __init__(self):
+        self.tables = {}
+        # Source -> {(scope, chord): [positions]}
+        self.entries = {}
+    
+    @staticmethod
+    def scoped_chords(table, position):
+        """(scope, chord) pairs a binding occupies"""
+        key = table.keys[position]
+        mode = table.modes[table.mode_ids[position]]
+        chords = canonical_chords(table.source, key)
+        if table.source == 'neovim_lsp':
+            # Keys of mappings outside normal mode carry a ' (modes)' suffix
+            if VIM_MODE_SUFFIX.match(key) is not None:
+                letters = ''.join(VIM_MODE_SCOPES.get(name, name) for name in mode.split(', '))
+            else:
+                letters = 'n'
+            buffer = table.category(position).endswith('(buffer)')
+            where = f"@{table.files[table.file_ids[position]]}" if buffer else ''
+            return [(f"{letter}{where}", chords[0]) for letter in dict.fromkeys(letters)]
+        return [(mode, chord) for chord in chords]
+    
+    @classmethod
+    def index(cls, table):
+        """{(scope, chord): [positions]} of one table, in one pass"""
+        entries = {}
+        scoped_chords = cls.scoped_chords
+        for position in range(len(table)):
+            for entry in scoped_chords(table, position):
+                positions = entries.get(entry)
+                if positions is None:
+                    entries[entry] = [position]
+                else:
+                    positions.append(position)
+        return entries
+    
+    def update(self, table, entries=None):
+        """Replace one source's bindings, with entries from index() if already built"""
+        self.tables[table.source] = table
+        self.entries[table.source] = self.index(table) if entries is None else entries
+    
+    def conflicts(self):
+        """Conflicts as dicts: kind, source, chord (display text), scopes and bindings
+        
+        bindings lists (source, position) pairs into the indexed tables; for
+        prefix and shadowed conflicts the binding that takes the keys first
+        comes first.
+        """
+        found = {}
+        
+        def report(kind, source, scope, chord, bindings):
+            key = (kind, chord, tuple(bindings))
+            conflict = found.get(key)
+            if conflict is None:
+                found[key] = {'kind': kind, 'source': source, 'chord': chord_text(source, chord),
+                              'scopes': [scope], 'bindings': bindings}
+            elif scope not in conflict['scopes']:
+                conflict['scopes'].append(scope)
+        
+        # Chords the window managers and Zellij's typing modes take first
+        window_manager_steps, zellij_steps = {}, {}
+        for source, entries in self.entries.items():
+            if source == 'neovim_lsp':
+                continue
+            steps = zellij_steps if source == 'zellij' else window_manager_steps
+            for (scope, chord), positions in entries.items():
+                if source == 'zellij' and scope not in self.ZELLIJ_PASSTHROUGH:
+                    continue
+                steps.setdefault(chord[0], []).extend((source, position) for position in positions)
+        
+        for source, entries in self.entries.items():
+            actions = self.tables[source].actions
+            for (scope, chord), positions in entries.items():
+                bindings = [(source, position) for position in positions]
+                if len(positions) > 1:
+                    report('duplicate', source, scope, chord, bindings)
+                for length in range(1, len(chord)):
+                    prefix = entries.get((scope, chord[:length]))
+                    if prefix is not None and source != 'neovim_lsp':
+                        # Outside Neovim a key entering a mode is how the longer chord is typed
+                        prefix = [position for position in prefix if not MODE_ENTRY_ACTION.match(actions[position])]
+                    if prefix:
+                        report('prefix', source, scope, chord, [(source, position) for position in prefix] + bindings)
+                        break
+                if source in self.APPLICATIONS:
+                    layers = window_manager_steps.get(chord[0], [])
+                    if source == 'neovim_lsp':
+                        layers = layers + zellij_steps.get(chord[0], [])
+                    if layers:
+                        report('shadowed', source, scope, chord, layers + bindings)
+        return list(found.values())
+    
+    def binding(self, source, position):
+        return self.tables[source][position]
+    
+    def table(self, conflicts=None):
+        """Conflicts as a KeybindTable for the panel, one category per kind"""
+        from .model import KeybindTable
+        
+        records = []
+        for conflict in self.conflicts() if conflicts is None else conflicts:
+            for source, position in conflict['bindings']:
+                keybind = self.binding(source, position)
+                records.append({
+                    'key': keybind.key,
+                    'action': f"{keybind.action} ({source}, {keybind.category})",
+                    'category': CONFLICT_KINDS[conflict['kind']],
+                    'mode': ', '.join(conflict['scopes']),
+                    'file': keybind.file,
+                    'line': keybind.line,
+                })
+        order = {label: number for number, label in enumerate(CONFLICT_KINDS.values())}
+        records.sort(key=lambda record: order[record['category']])
+        return KeybindTable.from_records(records, 'conflicts')
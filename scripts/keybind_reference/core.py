@@ -0,0 +1,373 @@
+"""
+Shared plumbing: debug output, atomic writes, the startup profiler, runtime
+metrics and the versioned on-disk cache of parsed keybindings
+"""
+
+import os
+import sys
+import json
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+from . import STARTED
+
+
+
+# Bump when the cached keybind model changes shape
+CACHE_VERSION = 5
+
+
+# Set KEYBIND_REFERENCE_DEBUG=1 to report cache hits and misses on stderr
+DEBUG = os.environ.get('KEYBIND_REFERENCE_DEBUG', '') not in ('', '0')
+
+
+def debug(message):
+    if DEBUG:
+        print(f"[keybind-reference] {message}", file=sys.stderr)
+
+
+def write_atomically(path, text):
+    """Replace a file through a temporary file and a rename, so readers never see it half-written"""
+    import tempfile
+    
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_memory_usage():
+    """Current and peak resident set size in KiB, from /proc/self/status"""
+    usage = {}
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith(('VmRSS:', 'VmHWM:')):
+                    name, value = line.split(':', 1)
+                    usage['rss_kb' if name == 'VmRSS' else 'peak_rss_kb'] = int(value.split()[0])
+    except OSError:
+        pass
+    return usage
+
+
+class StartupProfiler:
+    """Records monotonic timestamps for startup phases
+    
+    Enabled with --profile[=FILE] or KEYBIND_REFERENCE_PROFILE=FILE, where a
+    FILE of '-' (or '1') means stderr. Phases are reported relative to the
+    start of the module import, as JSON, once the first frame is drawn (or
+    when a headless query finishes).
+    """
+    
+    def __init__(self):
+        self.output = os.environ.get('KEYBIND_REFERENCE_PROFILE') or None
+        self.phases = []
+        self.reported = False
+    
+    @property
+    def enabled(self):
+        return self.output is not None
+    
+    def enable(self, output):
+        self.output = output
+    
+    def record(self, name, start, end=None):
+        """Record a phase from perf_counter() timestamps (end=None marks an instant)"""
+        if not self.enabled:
+            return
+        import threading
+        
+        end = start if end is None else end
+        self.phases.append({
+            'name': name,
+            'start_ms': round((start - STARTED) * 1000, 3),
+            'duration_ms': round((end - start) * 1000, 3),
+            'thread': threading.current_thread().name,
+        })
+    
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+    
+    def report(self, **extra):
+        """Write the phases plus memory usage and any extra counters, once"""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        
+        report = {
+            'total_ms': round((time.perf_counter() - STARTED) * 1000, 3),
+            'phases': sorted(self.phases, key=lambda phase: phase['start_ms']),
+            **read_memory_usage(),
+            **extra,
+        }
+        if self.output in ('-', '1'):
+            json.dump(report, sys.stderr, indent=2)
+            sys.stderr.write('\n')
+        else:
+            with open(self.output, 'w') as f:
+                json.dump(report, f, indent=2)
+
+
+PROFILER = StartupProfiler()
+
+
+class Histogram:
+    """Durations in power-of-two millisecond buckets, with their count, total and maximum"""
+    
+    BOUNDS_MS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+    
+    __slots__ = ('buckets', 'count', 'total_ms', 'max_ms')
+    
+    def __init__(self):
+        # One bucket per bound plus the overflow bucket
+        self.buckets = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def add(self, ms):
+        self.buckets[bisect_left(self.BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+    
+    def snapshot(self):
+        labels = [f"<={bound}" for bound in self.BOUNDS_MS] + [f">{self.BOUNDS_MS[-1]}"]
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'buckets': {label: count for label, count in zip(labels, self.buckets) if count},
+        }
+
+
+class RuntimeMetrics:
+    """Counters and duration histograms of a long-lived panel process
+    
+    Unlike the StartupProfiler this is always on: recording is a dict
+    update under a lock (loader threads record their parse times), so a
+    panel left open all day keeps its load, reload and scrolling costs for
+    `keybind-reference --stats` to read over D-Bus.
+    """
+    
+    def __init__(self):
+        import threading
+        
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+    
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def observe(self, name, ms):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(ms)
+    
+    @contextmanager
+    def timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+    
+    def snapshot(self, **gauges):
+        """JSON-serializable counters and histograms, plus gauges read by the caller"""
+        with self.lock:
+            return {
+                'uptime_s': round(time.monotonic() - self.started, 1),
+                **read_memory_usage(),
+                **gauges,
+                'counters': dict(sorted(self.counters.items())),
+                'histograms': {name: histogram.snapshot() for name, histogram in sorted(self.histograms.items())},
+            }
+
+
+# The panel's metrics object, next to the application's own /org/keybind/reference
+METRICS_OBJECT_PATH = '/org/keybind/reference/metrics'
+
+
+METRICS_INTERFACE_NAME = 'org.keybind.reference.Metrics'
+
+
+METRICS_INTERFACE = f"""
+<node>
+  <interface name="{METRICS_INTERFACE_NAME}">
+    <method name="GetStats">
+      <arg type="s" name="stats" direction="out"/>
+    </method>
+  </interface>
+</node>
+"""
+
+
+@lru_cache(maxsize=None)
+def code_stamp():
+    """(name, mtime, size) of every module of this package
+    
+    Stored with every cache entry: the parsers are inputs too, so editing
+    any module invalidates what the previous code produced. Only stat()ed,
+    once per process.
+    """
+    package = Path(__file__).resolve().parent
+    return [[path.name, st.st_mtime_ns, st.st_size]
+            for path in sorted(package.glob('*.py')) for st in (path.stat(),)]
+
+
+def file_fingerprint(path, previous=None):
+    """Return the (mtime, size, sha256) fingerprint of a file, or None if it is missing
+    
+    When a previous fingerprint with the same mtime and size is given, it is
+    reused without hashing the file again. A directory is fingerprinted by
+    its sorted listing, so added and removed files are noticed.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if previous and previous.get('mtime_ns') == st.st_mtime_ns and previous.get('size') == st.st_size:
+        return previous
+    import hashlib
+    
+    try:
+        if os.path.isdir(path):
+            digest = hashlib.sha256('\0'.join(sorted(os.listdir(path))).encode()).hexdigest()
+        else:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+    return {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'sha256': digest}
+
+
+class KeybindCache:
+    """Versioned on-disk cache of parsed keybindings, one JSON file per source
+    
+    Each entry records the fingerprint of every file that fed the parse
+    (including source= includes), so an unchanged configuration is never
+    parsed twice. Writes go through a temporary file and an atomic rename,
+    so concurrent writers cannot leave a half-written entry behind.
+    """
+    
+    def __init__(self):
+        import threading
+        
+        cache_home = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / '.cache')
+        self.directory = Path(cache_home) / 'keybind-reference'
+        self.hits = 0
+        self.misses = 0
+        # Loader threads look up their sources concurrently
+        self.lock = threading.Lock()
+        # Source name -> files that fed its last parse (for file monitoring)
+        self.deps = {}
+    
+    def entry_path(self, name):
+        return self.directory / f"{name}.json"
+    
+    def count(self, hit):
+        """Count one hit or miss; += on an attribute is not atomic across threads"""
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+    
+    def read_entry(self, name):
+        """Return a cache entry of the current version, or None"""
+        try:
+            with open(self.entry_path(name), 'r') as f:
+                entry = json.load(f)
+            if not isinstance(entry, dict):
+                raise ValueError("entry is not an object")
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.discard(name, e)
+            return None
+        if entry.get('version') != CACHE_VERSION or entry.get('code') != code_stamp():
+            return None
+        return entry
+    
+    def write_entry(self, name, entry):
+        """Atomically replace a cache entry"""
+        try:
+            write_atomically(self.entry_path(name),
+                             json.dumps({**entry, 'version': CACHE_VERSION, 'code': code_stamp()}))
+        except OSError as e:
+            debug(f"cache {name}: write failed ({e})")
+    
+    def discard(self, name, reason):
+        debug(f"cache {name}: discarding corrupt entry ({reason})")
+        try:
+            self.entry_path(name).unlink()
+        except OSError:
+            pass
+    
+    def lookup(self, name):
+        """Return cached keybinds for a source, or None if missing or stale"""
+        entry = self.read_entry(name)
+        if entry is None:
+            return None
+        try:
+            for dep in entry['deps']:
+                # A file whose content hash matches still counts as unchanged
+                current = file_fingerprint(dep['path'], dep['fingerprint'])
+                if current is None or dep['fingerprint'] is None:
+                    if current != dep['fingerprint']:
+                        return None
+                elif current['sha256'] != dep['fingerprint']['sha256']:
+                    return None
+            self.deps[name] = [Path(dep['path']) for dep in entry['deps']]
+            return entry['keybinds']
+        except (KeyError, TypeError) as e:
+            self.discard(name, e)
+            return None
+    
+    def store(self, name, deps, keybinds):
+        """Atomically write the keybinds for a source with its dependency fingerprints"""
+        self.write_entry(name, {
+            'deps': [{'path': str(dep), 'fingerprint': file_fingerprint(dep)} for dep in deps],
+            'keybinds': keybinds,
+        })
+    
+    def load(self, name, parse):
+        """Return cached keybinds for a source, calling parse() on a miss
+        
+        parse() must return (keybinds, deps), where deps lists every file read.
+        """
+        keybinds = self.lookup(name)
+        if keybinds is not None:
+            self.count(hit=True)
+            debug(f"cache {name}: hit")
+            return keybinds
+        
+        self.count(hit=False)
+        debug(f"cache {name}: miss")
+        keybinds, deps = parse()
+        self.deps[name] = list(deps)
+        self.store(name, deps, keybinds)
+        return keybinds
@@ -0,0 +1,252 @@
+"""
+dwm and dwl keybindings, read from the keys[] and buttons[] arrays of config.h
+"""
+
+import re
+from pathlib import Path
+
+
+
+C_COMMENT = re.compile(r'/\*.*?\*/|//[^\n]*|"(?:\\.|[^"\\\n])*"', re.S)
+
+
+C_TOKEN = re.compile(r'"(?:\\.|[^"\\\n])*"|\w+|[{}(),\[\]|&]|[^\s\w{}(),\[\]|&"]+')
+
+
+C_DEFINE = re.compile(r'#\s*define\s+(\w+)(?:\(([^)]*)\))?\s*(.*)', re.S)
+
+
+C_STRING_ARRAY = re.compile(r'\*\s*(\w+)\s*\[\s*\]\s*=\s*\{([^{}]*)\}')
+
+
+C_BINDING_ARRAY = re.compile(r'\b(keys|buttons|layouts)\s*\[\s*\w*\s*\]\s*=\s*\{')
+
+
+class DwmConfigParser:
+    """Reads the keys[] and buttons[] arrays of a dwm or dwl config.h
+    
+    Comments and preprocessor lines are blanked out (keeping line numbers),
+    #define macros are collected so MODKEY, SHCMD(...) and TAGKEYS(...)
+    rows expand the way the preprocessor would, and the arrays are split
+    into rows with a small brace-matching tokenizer. Spawned commands are
+    resolved through their `static const char *cmd[]` arrays, so actions
+    read as the command line they run.
+    """
+    
+    MODIFIERS = {
+        'Mod4Mask': 'SUPER', 'Mod1Mask': 'ALT', 'ShiftMask': 'SHIFT', 'ControlMask': 'CTRL',
+        'LockMask': 'CAPS', 'Mod2Mask': 'MOD2', 'Mod3Mask': 'MOD3', 'Mod5Mask': 'MOD5',
+        'WLR_MODIFIER_LOGO': 'SUPER', 'WLR_MODIFIER_ALT': 'ALT', 'WLR_MODIFIER_SHIFT': 'SHIFT',
+        'WLR_MODIFIER_CTRL': 'CTRL', 'WLR_MODIFIER_CAPS': 'CAPS', 'WLR_MODIFIER_MOD2': 'MOD2',
+        'WLR_MODIFIER_MOD3': 'MOD3', 'WLR_MODIFIER_MOD5': 'MOD5',
+    }
+    MODIFIER_ORDER = ('SUPER', 'CTRL', 'ALT', 'SHIFT', 'CAPS', 'MOD2', 'MOD3', 'MOD5')
+    BUTTONS = {
+        'Button1': 'Mouse Left', 'Button2': 'Mouse Middle', 'Button3': 'Mouse Right',
+        'Button4': 'Mouse Wheel Up', 'Button5': 'Mouse Wheel Down',
+        'BTN_LEFT': 'Mouse Left', 'BTN_MIDDLE': 'Mouse Middle', 'BTN_RIGHT': 'Mouse Right',
+    }
+    
+    def __init__(self):
+        self.macros = {}
+        self.commands = {}
+        self.layouts = []
+    
+    @staticmethod
+    def unquote(text):
+        return text[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+    
+    def preprocess(self, source):
+        """Blank comments and preprocessor lines, collecting #define macros"""
+        text = C_COMMENT.sub(lambda match: match.group(0) if match.group(0).startswith('"')
+                             else '\n' * match.group(0).count('\n'), source)
+        lines = text.split('\n')
+        self.macros = {}
+        index = 0
+        while index < len(lines):
+            if not lines[index].lstrip().startswith('#'):
+                index += 1
+                continue
+            # Join backslash continuations, blanking every physical line
+            start, directive = index, lines[index]
+            while directive.endswith('\\') and index + 1 < len(lines):
+                index += 1
+                directive = directive[:-1] + ' ' + lines[index]
+            for blank in range(start, index + 1):
+                lines[blank] = ''
+            match = C_DEFINE.match(directive.strip())
+            if match is not None:
+                name, params, body = match.groups()
+                params = [param.strip() for param in params.split(',')] if params is not None else None
+                self.macros[name] = (params, body.strip())
+            index += 1
+        return '\n'.join(lines)
+    
+    def resolve(self, text):
+        """Follow object-like macros: MODKEY -> Mod4Mask"""
+        for _ in range(16):
+            macro = self.macros.get(text)
+            if macro is None or macro[0] is not None:
+                break
+            text = macro[1]
+        return text
+    
+    def expand(self, name, args):
+        """Body of a function-like macro with its parameters substituted"""
+        params, body = self.macros[name]
+        values = dict(zip(params, args))
+        return re.sub(r'\b\w+\b', lambda match: values.get(match.group(0), match.group(0)), body)
+    
+    @staticmethod
+    def split(tokens, start):
+        """Split the braced or parenthesized list opening at tokens[start] on its top-level commas
+        
+        Returns (items, index just past the closing bracket).
+        """
+        items, depth, index = [[]], 0, start + 1
+        while index < len(tokens):
+            text = tokens[index][0]
+            if text in '{([':
+                depth += 1
+            elif text in '})]':
+                if depth == 0:
+                    return [item for item in items if item], index + 1
+                depth -= 1
+            elif text == ',' and depth == 0:
+                items.append([])
+                index += 1
+                continue
+            items[-1].append(tokens[index])
+            index += 1
+        return [item for item in items if item], index
+    
+    @staticmethod
+    def render(tokens):
+        """Join tokens back into text, spacing only between adjacent words"""
+        text = ''
+        for token, _ in tokens:
+            if text and (text[-1].isalnum() or text[-1] in '_"') and (token[0].isalnum() or token[0] in '_"'):
+                text += ' '
+            text += token
+        return text
+    
+    @staticmethod
+    def tokenize(text, line=1, start=0):
+        """(token, line) pairs from text[start:]; line is the line at start"""
+        tokens, position = [], start
+        for match in C_TOKEN.finditer(text, start):
+            line += text.count('\n', position, match.start())
+            position = match.start()
+            tokens.append((match.group(0), line))
+        return tokens
+    
+    def rows(self, tokens, start):
+        """Rows of the array opening at tokens[start], with macro calls expanded
+        
+        Returns ([(fields, line), ...], index just past the array).
+        """
+        items, end = self.split(tokens, start)
+        rows = []
+        for item in items:
+            # TAGKEYS(...) rows are often not separated by commas
+            position = 0
+            while position < len(item):
+                name, line = item[position]
+                if name == '{':
+                    fields, position = self.split(item, position)
+                    rows.append((fields, line))
+                elif (self.macros.get(name, (None,))[0] is not None
+                      and position + 1 < len(item) and item[position + 1][0] == '('):
+                    args, position = self.split(item, position + 1)
+                    body = self.expand(name, [self.render(arg) for arg in args])
+                    rows.extend(self.rows(self.tokenize('{' + body + '}', line), 0)[0])
+                else:
+                    position += 1
+        return rows, end
+    
+    def modifiers(self, field):
+        names = {self.MODIFIERS.get(self.resolve(name), self.resolve(name))
+                 for name in self.render(field).split('|')}
+        names.discard('0')
+        return ' '.join(sorted(names, key=lambda name: (
+            self.MODIFIER_ORDER.index(name) if name in self.MODIFIER_ORDER else len(self.MODIFIER_ORDER), name)))
+    
+    def key_name(self, field):
+        key = self.render(field)
+        resolved = self.resolve(key)
+        # Keysyms defined by number in config.h keep their name
+        if re.fullmatch(r'[A-Za-z_]\w*', resolved):
+            key = resolved
+        if key in self.BUTTONS:
+            return self.BUTTONS[key]
+        if key.startswith('XF86XK_'):
+            return 'XF86' + key[len('XF86XK_'):]
+        return re.sub(r'^(?:XKB_KEY_|XK_)', '', key)
+    
+    def argument(self, function, field):
+        """Readable argument: {.v = termcmd} -> 'foot', {.ui = 1 << 2} -> '3'"""
+        if field and field[0][0] in self.macros and len(field) > 1 and field[1][0] == '(':
+            # SHCMD("...") and friends: show what is passed to the macro
+            args = self.split(field, 1)[0]
+            return ' '.join(self.unquote(value) if value.startswith('"') else value
+                            for value in (self.resolve(self.render(arg)) for arg in args))
+        text = self.render(field)
+        match = re.fullmatch(r'\{(?:\.\w+=)?(.*?)\}', text)
+        value = match.group(1) if match else text
+        if value in self.commands:
+            return self.commands[value]
+        layout = re.fullmatch(r'&?layouts\[(\d+)\]', value)
+        if layout and int(layout.group(1)) < len(self.layouts):
+            return self.layouts[int(layout.group(1))]
+        if function in ('view', 'toggleview', 'tag', 'toggletag'):
+            tag = re.fullmatch(r'1<<(\d+)', value)
+            if tag:
+                return str(int(tag.group(1)) + 1)
+            if value == '~0':
+                return 'all'
+        return '' if value == '0' else value.lstrip('&')
+    
+    def parse(self, path):
+        """Parse a config.h, returning (bind records, files read)"""
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = self.preprocess(f.read())
+        
+        # Commands run by spawn: static const char *termcmd[] = { "foot", NULL };
+        self.commands = {}
+        for match in C_STRING_ARRAY.finditer(text):
+            words = [self.resolve(word.strip()) for word in match.group(2).split(',')]
+            self.commands[match.group(1)] = ' '.join(self.unquote(word) if word.startswith('"') else word
+                                                     for word in words if word and word != 'NULL')
+        
+        arrays = {}
+        for match in C_BINDING_ARRAY.finditer(text):
+            start = match.end() - 1
+            tokens = self.tokenize(text, text.count('\n', 0, start) + 1, start)
+            arrays[match.group(1)] = self.rows(tokens, 0)[0]
+        
+        # Layouts by index, named after their arrange function: { "[M]", monocle }
+        self.layouts = [self.render(fields[1]).replace('NULL', 'floating') if len(fields) > 1 else ''
+                        for fields, _ in arrays.get('layouts', [])]
+        
+        records = []
+        for kind in ('keys', 'buttons'):
+            for fields, row_line in arrays.get(kind, []):
+                # dwm buttons lead with the clicked area: { ClkTagBar, 0, Button1, view, {0} }
+                click = ''
+                if kind == 'buttons' and len(fields) >= 5:
+                    click = re.sub(r'(?<!^)(?=[A-Z])', ' ', self.render(fields[0]).removeprefix('Clk')).lower()
+                    fields = fields[1:]
+                if len(fields) < 3:
+                    continue
+                function = self.render(fields[2])
+                key = self.key_name(fields[1])
+                records.append({
+                    'mods': self.modifiers(fields[0]),
+                    'key': f"{key} ({click})" if click else key,
+                    'dispatcher': function,
+                    'args': self.argument(function, fields[3]) if len(fields) > 3 else '',
+                    'description': '',
+                    'file': str(path),
+                    'line': row_line,
+                })
+        return records, [Path(path)]
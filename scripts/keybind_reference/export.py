@@ -0,0 +1,179 @@
+"""
+Headless queries: bindings, conflicts and the panel's runtime metrics as
+tables, JSON or NDJSON
+"""
+
+import sys
+import json
+
+from .conflicts import canonical_chords, chord_text
+from .core import METRICS_INTERFACE_NAME, METRICS_OBJECT_PATH, PROFILER
+from .model import SearchIndex
+from .sources import KeybindSources
+
+
+def query_sources(args):
+    """KeybindSources limited to the --source selection, or None for an unknown source name"""
+    sources = KeybindSources()
+    if args.source:
+        names = [provider.name for provider in sources.providers]
+        if not any(name.startswith(args.source.lower()) for name in names):
+            # Worded like argparse's own usage errors, and with the same exit status
+            print(f"keybind-reference: error: argument --source: unknown source {args.source!r} "
+                  f"(choose from {', '.join(names)})", file=sys.stderr)
+            return None
+        sources.loaders = [(attribute, loader) for attribute, loader in sources.loaders
+                           if sources.source_name(attribute).startswith(args.source.lower())]
+    return sources
+
+
+def run_check(args):
+    """Print every chord conflict across the selected sources; exit status 1 if there are any"""
+    sources = query_sources(args)
+    if sources is None:
+        return 2
+    for keybinds in sources.load_all().values():
+        sources.chord_index.update(keybinds)
+    with PROFILER.phase('conflicts'):
+        conflicts = sources.chord_index.conflicts()
+    PROFILER.report(conflicts=len(conflicts))
+    
+    if args.json or args.ndjson:
+        for conflict in conflicts:
+            conflict['bindings'] = [
+                {'source': source, 'key': keybind.key, 'action': keybind.action, 'category': keybind.category,
+                 'file': keybind.file, 'line': keybind.line}
+                for source, keybind in ((source, sources.chord_index.binding(source, position))
+                                        for source, position in conflict['bindings'])
+            ]
+        if args.json:
+            json.dump(conflicts, sys.stdout, ensure_ascii=False, indent=2)
+            sys.stdout.write('\n')
+        else:
+            for conflict in conflicts:
+                sys.stdout.write(json.dumps(conflict, ensure_ascii=False) + '\n')
+    else:
+        lines = []
+        for conflict in conflicts:
+            scopes = ', '.join(scope or 'global' for scope in conflict['scopes'])
+            lines.append(f"{conflict['kind']}: {conflict['chord']} [{conflict['source']}, {scopes}]")
+            for source, position in conflict['bindings']:
+                keybind = sources.chord_index.binding(source, position)
+                where = f"  {keybind.file}:{keybind.line}" if keybind.file else ''
+                lines.append(f"    {source:<10}  {keybind.key}  {keybind.action}  ({keybind.category}){where}")
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
+        print(f"{len(conflicts)} conflict{'s' if len(conflicts) != 1 else ''}", file=sys.stderr)
+    return 1 if conflicts else 0
+
+
+def run_query(args):
+    """Headless mode: load sources synchronously and print the selected bindings"""
+    if args.check:
+        return run_check(args)
+    if args.rofi is not None:
+        from .rofi import run_rofi
+        return run_rofi(args)
+    sources = query_sources(args)
+    if sources is None:
+        return 2
+    rows = []
+    for attribute, keybinds in sources.load_all().items():
+        name = sources.source_name(attribute)
+        positions = range(len(keybinds))
+        if args.category:
+            # Categories are contiguous row ranges, so no row is looked at twice
+            category = args.category.lower()
+            positions = [position for section, start, stop in keybinds.sections() if category in section.lower()
+                         for position in range(start, stop)]
+        
+        if args.search:
+            results = SearchIndex(keybinds).search(args.search) or {}
+            selected = set(positions)
+            positions = sorted((position for position in results if position in selected),
+                               key=lambda position: (-results[position], position))
+        
+        if args.lookup:
+            # Compared as --check compares them: key aliases match, case counts only where the source keeps it
+            found = set()
+            for chord in canonical_chords(name, args.lookup):
+                found.update(keybinds.chord_positions().get(chord_text(name, chord), ()))
+            if isinstance(positions, range):
+                positions = sorted(found)
+            else:
+                positions = [position for position in positions if position in found]
+        
+        rows.extend({'source': name, 'key': keybinds.keys[position], 'action': keybinds.actions[position],
+                     'category': keybinds.category(position)} for position in positions)
+    
+    PROFILER.report(rows=len(rows))
+    
+    if args.json:
+        json.dump(rows, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write('\n')
+    elif args.ndjson:
+        for row in rows:
+            sys.stdout.write(json.dumps(row, ensure_ascii=False) + '\n')
+    else:
+        print_table(rows)
+    
+    # Like grep: a lookup or search that finds nothing is a failure
+    return 0 if rows or not (args.lookup or args.search) else 1
+
+
+def run_stats(args):
+    """Print the RuntimeMetrics of the resident panel, read over D-Bus (loads Gio, never GTK)"""
+    from gi.repository import Gio, GLib
+    
+    try:
+        bus = Gio.bus_get_sync(Gio.BusType.SESSION, None)
+        # Never auto-start: a freshly started panel has nothing to report
+        reply = bus.call_sync('org.keybind.reference', METRICS_OBJECT_PATH, METRICS_INTERFACE_NAME, 'GetStats',
+                              None, GLib.VariantType.new('(s)'), Gio.DBusCallFlags.NO_AUTO_START, 2000, None)
+    except GLib.Error as e:
+        print(f"No resident keybind-reference panel answered: {e.message}", file=sys.stderr)
+        return 1
+    stats = json.loads(reply.unpack()[0])
+    
+    if args.json:
+        json.dump(stats, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write('\n')
+    else:
+        print_stats(stats)
+    return 0
+
+
+def print_stats(stats):
+    hours, seconds = divmod(int(stats['uptime_s']), 3600)
+    counters = stats['counters']
+    lines = [
+        f"uptime     {hours}h {seconds // 60:02d}m",
+        f"memory     {stats.get('rss_kb', 0) / 1024:.1f} MiB resident, {stats.get('peak_rss_kb', 0) / 1024:.1f} MiB peak",
+        f"window     {stats['widgets']} widgets, {'visible' if stats['window_visible'] else 'hidden'}, "
+        f"shown {counters.get('shows', 0)} times",
+        f"cache      {stats['cache']['hits']} hits, {stats['cache']['misses']} misses",
+        f"reloads    {counters.get('reloads', 0)}, {stats['file_monitors']} files watched",
+        f"scrolling  {counters.get('scroll frames', 0)} frames, "
+        f"{counters.get('scroll frames over budget', 0)} over budget",
+        "rows       " + ', '.join(f"{label} {rows}" for label, rows in stats['rows_per_tab'].items()),
+    ]
+    if stats['histograms']:
+        width = max(len(name) for name in stats['histograms'])
+        lines.append('')
+        lines.append(f"{'TIMING'.ljust(width)}  {'COUNT':>6}  {'MEAN MS':>8}  {'MAX MS':>8}  {'TOTAL MS':>9}")
+        for name, histogram in stats['histograms'].items():
+            lines.append(f"{name.ljust(width)}  {histogram['count']:>6}  {histogram['mean_ms']:>8.1f}  "
+                         f"{histogram['max_ms']:>8.1f}  {histogram['total_ms']:>9.1f}")
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+
+def print_table(rows):
+    if not rows:
+        return
+    columns = ('source', 'category', 'key', 'action')
+    widths = {column: max([len(column)] + [len(row[column]) for row in rows]) for column in columns[:-1]}
+    header = '  '.join(column.upper().ljust(widths.get(column, 0)) for column in columns)
+    lines = [header.rstrip()]
+    for row in rows:
+        lines.append('  '.join(row[column].ljust(widths.get(column, 0)) for column in columns).rstrip())
+    sys.stdout.write('\n'.join(lines) + '\n')
@@ -0,0 +1,977 @@
+"""
+The GTK 4 / libadwaita panel
+"""
+
+import sys
+import json
+import math
+import time
+from bisect import bisect_left
+
+from .core import METRICS_INTERFACE, METRICS_OBJECT_PATH, PROFILER, RuntimeMetrics, debug
+from .conflicts import ChordIndex
+from .model import KeybindTable, SearchIndex, keyed_by_chord, normalize_chord
+from .sources import KeybindSources
+from .themes import DEFAULT_THEME, PALETTES, ThemeCompiler
+
+
+# GTK is imported on demand by import_gtk(), so the headless CLI never loads gi
+Gtk = Adw = Gdk = GLib = Gio = GObject = Pango = None
+
+
+KeybindItem = None
+
+
+def import_gtk():
+    """Import GTK 4 and libadwaita, and define the GObject types that need them"""
+    global Gtk, Adw, Gdk, GLib, Gio, GObject, Pango, KeybindItem
+    if KeybindItem is not None:
+        return
+    
+    start = time.perf_counter()
+    import gi
+    gi.require_version('Gtk', '4.0')
+    gi.require_version('Adw', '1')
+    from gi.repository import Gtk, Adw, Gdk, GLib, Gio, GObject, Pango
+    PROFILER.record('import gtk', start, time.perf_counter())
+    
+    class _KeybindItem(GObject.Object):
+        """List model item for one row of a KeybindTable in Gtk.ListView"""
+        __gtype_name__ = 'KeybindItem'
+        
+        key = GObject.Property(type=str, default='')
+        action = GObject.Property(type=str, default='')
+        category = GObject.Property(type=str, default='')
+        # The table's category id, which orders the category sections
+        section = GObject.Property(type=int, default=0)
+        
+        def __init__(self, table, position=0):
+            category_id = table.category_ids[position]
+            super().__init__(key=table.keys[position], action=table.actions[position],
+                             category=table.categories[category_id], section=category_id)
+            # Row number in the source's KeybindTable, as used by its SearchIndex
+            self.position = position
+    
+    KeybindItem = _KeybindItem
+
+
+class SmoothScroller:
+    """Eases a scrolled window's adjustment toward a target, once per frame
+    
+    Key presses and their auto-repeats only move the target; a tick callback
+    on the widget applies a single adjustment update per frame, so however
+    fast repeat events arrive there is one layout per frame at the display's
+    refresh rate. The easing is exponential in frame time, so it feels the
+    same at 60 and 144 Hz. Frames that arrive later than the display's
+    refresh interval (plus slack) are counted in the RuntimeMetrics.
+    """
+    
+    # Time constant of the ease-out, in microseconds (frame clock units)
+    TIME_CONSTANT_US = 60_000
+    # A frame counts as over budget beyond this many refresh intervals
+    FRAME_BUDGET_SLACK = 1.5
+    
+    def __init__(self, widget, adjustment, metrics=None):
+        self.widget = widget
+        self.adjustment = adjustment
+        self.metrics = metrics
+        self.target = None
+        self.tick_id = 0
+        self.last_frame_time = None
+        self.last_value = None
+    
+    def clamp(self, value):
+        adjustment = self.adjustment
+        return max(adjustment.get_lower(), min(value, adjustment.get_upper() - adjustment.get_page_size()))
+    
+    def scroll_by(self, delta):
+        # Deltas accumulate on the pending target, not on where the animation is now
+        start = self.target if self.target is not None else self.adjustment.get_value()
+        self.scroll_to(start + delta)
+    
+    def scroll_to(self, value):
+        self.target = self.clamp(value)
+        if not self.tick_id:
+            self.last_frame_time = None
+            self.last_value = self.adjustment.get_value()
+            self.tick_id = self.widget.add_tick_callback(self.on_tick)
+    
+    def stop(self):
+        if self.tick_id:
+            self.widget.remove_tick_callback(self.tick_id)
+        self.tick_id = 0
+        self.target = None
+    
+    def on_tick(self, widget, frame_clock):
+        current = self.adjustment.get_value()
+        if abs(current - self.last_value) > 1:
+            # Scrolled by something else (mouse, touchpad): give way to it
+            self.tick_id = 0
+            self.target = None
+            return GLib.SOURCE_REMOVE
+        
+        now = frame_clock.get_frame_time()
+        elapsed = now - self.last_frame_time if self.last_frame_time is not None else 16_667
+        if self.last_frame_time is not None and self.metrics is not None:
+            self.record_frame(frame_clock, now, elapsed)
+        self.last_frame_time = now
+        
+        # The page may have grown or shrunk since the target was set
+        target = self.clamp(self.target)
+        remaining = target - current
+        if abs(remaining) < 0.5:
+            self.adjustment.set_value(target)
+            self.tick_id = 0
+            self.target = None
+            return GLib.SOURCE_REMOVE
+        
+        value = current + remaining * (1 - math.exp(-elapsed / self.TIME_CONSTANT_US))
+        self.adjustment.set_value(value)
+        self.last_value = self.adjustment.get_value()
+        return GLib.SOURCE_CONTINUE
+    
+    def record_frame(self, frame_clock, now, elapsed):
+        refresh_interval, _ = frame_clock.get_refresh_info(now)
+        self.metrics.count('scroll frames')
+        if elapsed > (refresh_interval or 16_667) * self.FRAME_BUDGET_SLACK:
+            self.metrics.count('scroll frames over budget')
+            self.metrics.observe('scroll frame over budget', elapsed / 1000)
+
+
+class KeybindingReference(KeybindSources):
+    def __init__(self):
+        super().__init__()
+        import_gtk()
+        
+        self.app = Adw.Application(
+            application_id='org.keybind.reference',
+            flags=Gio.ApplicationFlags.HANDLES_COMMAND_LINE
+        )
+        self.app.connect('startup', self.on_startup)
+        self.app.connect('activate', self.on_activate)
+        self.app.connect('command-line', self.on_command_line)
+        
+        # Options are parsed locally and forwarded over D-Bus to the primary instance
+        self.app.add_main_option('daemon', ord('d'), GLib.OptionFlags.NONE, GLib.OptionArg.NONE,
+                                 "Stay resident with the window pre-built", None)
+        self.app.add_main_option('show', 0, GLib.OptionFlags.NONE, GLib.OptionArg.NONE,
+                                 "Show the reference window", None)
+        self.app.add_main_option('hide', 0, GLib.OptionFlags.NONE, GLib.OptionArg.NONE,
+                                 "Hide the reference window", None)
+        self.app.add_main_option('toggle', ord('t'), GLib.OptionFlags.NONE, GLib.OptionArg.NONE,
+                                 "Show the window if hidden, hide it otherwise", None)
+        self.app.add_main_option('theme', 0, GLib.OptionFlags.NONE, GLib.OptionArg.STRING,
+                                 "Color theme (macchiato, mocha, frappe, latte or a TOML palette)", "NAME")
+        
+        # Window state (built once and reused for the lifetime of the process)
+        self.window = None
+        self.css_provider = None
+        self.themes = ThemeCompiler(self.cache)
+        self.theme = DEFAULT_THEME
+        self.theme_resource = None
+        self.daemon = False
+        
+        # Loaders run on a worker pool started by the primary instance,
+        # so forwarding launches never parse
+        self.loaded_sources = set()
+        self.executor = None
+        
+        # Search state: attribute -> SearchIndex, and attribute -> {position: score}
+        # (None when no search is active)
+        self.search_indexes = {}
+        self.search_results = {}
+        self.search_query = ''
+        
+        # Live reload: watched path -> (Gio.FileMonitor, attribute), and pending debounce timers
+        self.file_monitors = {}
+        self.reload_timeouts = {}
+        
+        # Keyboard navigation: keyval -> handler(count), keys that take a count,
+        # a pending vim count with the tab it was typed on, and
+        # (tab index, orientation) -> SmoothScroller
+        self.key_handlers = {}
+        self.motion_keys = set()
+        self.pending_count = ''
+        self.count_page = 0
+        self.scrollers = {}
+        
+        # Runtime counters exported over D-Bus, and reload start times per source
+        self.metrics = RuntimeMetrics()
+        self.reload_started = {}
+    
+    def create_css_provider(self):
+        """Load the compiled stylesheet for the current theme
+        
+        Prefers the GResource bundle when it is up to date, then the compiled
+        file; if compiling fails the built-in palette is rendered in memory.
+        """
+        css_provider = Gtk.CssProvider()
+        try:
+            css_path = self.themes.compile(self.theme)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Error compiling theme {self.theme}: {e}", file=sys.stderr)
+            css_provider.load_from_string(self.themes.render(PALETTES[DEFAULT_THEME]))
+            return css_provider
+        
+        if self.themes.bundle_is_current(css_path):
+            try:
+                if self.theme_resource is None:
+                    self.theme_resource = Gio.Resource.load(str(self.themes.bundle_path))
+                    Gio.resources_register(self.theme_resource)
+                css_provider.load_from_resource(self.themes.resource_path(self.theme))
+                return css_provider
+            except GLib.Error as e:
+                debug(f"theme bundle unusable ({e.message})")
+        css_provider.load_from_path(str(css_path))
+        return css_provider
+    
+    def set_theme(self, name):
+        """Switch themes, restyling the window if it has already been built"""
+        if name == self.theme:
+            return
+        try:
+            self.themes.source_path(name)
+        except KeyError as e:
+            print(f"Error: {e.args[0]}", file=sys.stderr)
+            return
+        self.theme = name
+        if self.window is None:
+            return
+        
+        display = self.window.get_display()
+        Gtk.StyleContext.remove_provider_for_display(display, self.css_provider)
+        self.css_provider = self.create_css_provider()
+        Gtk.StyleContext.add_provider_for_display(display, self.css_provider,
+                                                  Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+    
+    def create_keybind_store(self, keybinds):
+        """Create the row model for a section"""
+        store = Gio.ListStore(item_type=KeybindItem)
+        store.splice(0, 0, [KeybindItem(keybinds, position) for position in range(len(keybinds))])
+        return store
+    
+    def create_search_models(self, store, attribute):
+        """Wrap a section's store in the search filter and match-quality sorter
+        
+        Both consult self.search_results, which on_search_changed recomputes
+        from the source's SearchIndex on every keystroke.
+        """
+        def matches(item, _data):
+            results = self.search_results.get(attribute)
+            return results is None or item.position in results
+        
+        def by_rank(first, second, _data):
+            results = self.search_results.get(attribute)
+            if not results:
+                return Gtk.Ordering.EQUAL
+            first_score = results.get(first.position, 0)
+            second_score = results.get(second.position, 0)
+            if first_score == second_score:
+                return Gtk.Ordering.EQUAL
+            return Gtk.Ordering.SMALLER if first_score > second_score else Gtk.Ordering.LARGER
+        
+        search_filter = Gtk.CustomFilter.new(matches, None)
+        rank_sorter = Gtk.CustomSorter.new(by_rank, None)
+        filtered = Gtk.FilterListModel(model=store, filter=search_filter)
+        return filtered, search_filter, rank_sorter
+    
+    def create_keybind_section(self, model, rank_sorter=None, show_leader_note=False):
+        """Create a section showing keybindings grouped by category
+        
+        Rows are rendered through a Gtk.ListView, so only the visible rows
+        are instantiated and their widgets are recycled while scrolling.
+        Returns (page, scrolled window).
+        """
+        # Sorting by category id both orders the categories (as they appear in the
+        # configuration) and defines the sections; within a category, rows are
+        # ordered by search match quality
+        category_sorter = Gtk.NumericSorter.new(Gtk.PropertyExpression.new(KeybindItem, None, 'section'))
+        sorted_model = Gtk.SortListModel(model=model, sorter=rank_sorter, section_sorter=category_sorter)
+        
+        # Category headers
+        header_factory = Gtk.SignalListItemFactory()
+        header_factory.connect('setup', self.on_header_setup)
+        header_factory.connect('bind', self.on_header_bind)
+        
+        # Keybind rows
+        factory = Gtk.SignalListItemFactory()
+        factory.connect('setup', self.on_row_setup)
+        factory.connect('bind', self.on_row_bind)
+        
+        list_view = Gtk.ListView(model=Gtk.NoSelection(model=sorted_model), factory=factory)
+        list_view.set_header_factory(header_factory)
+        list_view.set_css_classes(['keybind-list'])
+        # Keyboard navigation is handled by the window, not by the rows
+        list_view.set_can_focus(False)
+        list_view.set_margin_start(20)
+        list_view.set_margin_end(20)
+        
+        # Create scrolled window
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_css_classes(['scrolled-window'])
+        scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+        scrolled.set_vexpand(True)
+        scrolled.set_min_content_width(600)
+        scrolled.set_min_content_height(400)
+        scrolled.set_propagate_natural_width(True)
+        scrolled.set_child(list_view)
+        
+        if not show_leader_note:
+            return scrolled, scrolled
+        
+        # Add leader key explanation above the list
+        page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        leader_note = Gtk.Label(label="Note: <leader> is mapped to Space in this Neovim configuration")
+        leader_note.set_css_classes(['action-label'])
+        leader_note.set_xalign(0)
+        leader_note.set_wrap(True)
+        leader_note.set_wrap_mode(Pango.WrapMode.WORD)
+        leader_note.set_margin_top(16)
+        leader_note.set_margin_bottom(8)
+        leader_note.set_margin_start(20)
+        leader_note.set_margin_end(20)
+        page.append(leader_note)
+        page.append(scrolled)
+        return page, scrolled
+    
+    def on_header_setup(self, factory, header):
+        category_label = Gtk.Label()
+        category_label.set_css_classes(['category-label'])
+        category_label.set_xalign(0)
+        header.set_child(category_label)
+    
+    def on_header_bind(self, factory, header):
+        header.get_child().set_label(header.get_item().category)
+    
+    def on_row_setup(self, factory, list_item):
+        """Build one reusable row; its labels are filled in on bind"""
+        row_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=16)
+        row_box.set_css_classes(['keybind-row'])
+        
+        # Key combination - fixed width with wrapping
+        key_label = Gtk.Label()
+        key_label.set_css_classes(['key-label'])
+        key_label.set_size_request(180, -1)  # Slightly smaller to leave more room
+        key_label.set_xalign(0)
+        key_label.set_valign(Gtk.Align.START)
+        key_label.set_wrap(True)
+        key_label.set_wrap_mode(Pango.WrapMode.WORD_CHAR)
+        key_label.set_max_width_chars(25)
+        key_label.set_ellipsize(Pango.EllipsizeMode.END)
+        
+        # Action description - expandable with wrapping
+        action_label = Gtk.Label()
+        action_label.set_css_classes(['action-label'])
+        action_label.set_xalign(0)
+        action_label.set_valign(Gtk.Align.START)
+        action_label.set_hexpand(True)
+        action_label.set_wrap(True)
+        action_label.set_wrap_mode(Pango.WrapMode.WORD)
+        action_label.set_max_width_chars(50)
+        action_label.set_ellipsize(Pango.EllipsizeMode.END)
+        action_label.set_justify(Gtk.Justification.LEFT)
+        action_label.set_lines(3)  # Limit to 3 lines maximum
+        
+        row_box.append(key_label)
+        row_box.append(action_label)
+        list_item.set_child(row_box)
+    
+    def on_row_bind(self, factory, list_item):
+        item = list_item.get_item()
+        key_label = list_item.get_child().get_first_child()
+        action_label = key_label.get_next_sibling()
+        
+        key_label.set_label(item.key)
+        action_label.set_label(item.action)
+        
+        # Add tooltips for full text on hover
+        key_label.set_tooltip_text(item.key)
+        action_label.set_tooltip_text(item.action)
+    
+    def on_startup(self, app):
+        """Register show/hide/toggle actions and the metrics object so they can be reached over D-Bus"""
+        for name, callback in (('show', self.show_window),
+                               ('hide', self.hide_window),
+                               ('toggle', self.toggle_window)):
+            action = Gio.SimpleAction.new(name, None)
+            action.connect('activate', lambda _action, _param, cb=callback: cb())
+            app.add_action(action)
+        self.export_metrics(app)
+        
+        self.start_loading()
+        
+        # Started through D-Bus activation (--gapplication-service): stay resident
+        if app.get_flags() & Gio.ApplicationFlags.IS_SERVICE:
+            self.start_daemon()
+    
+    def export_metrics(self, app):
+        """Serve RuntimeMetrics snapshots at METRICS_OBJECT_PATH on the application's bus"""
+        connection = app.get_dbus_connection()
+        if connection is None:
+            return
+        interface = Gio.DBusNodeInfo.new_for_xml(METRICS_INTERFACE).interfaces[0]
+        try:
+            connection.register_object(METRICS_OBJECT_PATH, interface, self.on_metrics_call, None, None)
+        except GLib.Error as e:
+            print(f"Error exporting metrics: {e.message}", file=sys.stderr)
+    
+    def on_metrics_call(self, connection, sender, object_path, interface_name, method_name, parameters,
+                        invocation):
+        stats = json.dumps(self.metrics_snapshot(), ensure_ascii=False)
+        invocation.return_value(GLib.Variant('(s)', (stats,)))
+    
+    def metrics_snapshot(self):
+        """Counters and histograms plus the gauges only the main loop can read"""
+        tabs = self.tabs if self.window is not None else [
+            (provider.label, provider.attribute, None) for provider in self.active_providers]
+        return self.metrics.snapshot(
+            widgets=self.count_widgets(self.window) if self.window is not None else 0,
+            window_visible=self.window is not None and self.window.get_visible(),
+            rows_per_tab={label: len(getattr(self, attribute)) for label, attribute, _ in tabs},
+            cache={'hits': self.cache.hits, 'misses': self.cache.misses},
+            file_monitors=len(self.file_monitors),
+        )
+    
+    def start_loading(self):
+        """Load every source in parallel; each tab fills in as its source finishes"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        self.executor = ThreadPoolExecutor(max_workers=len(self.loaders),
+                                           thread_name_prefix='keybind-loader')
+        for attribute, loader in self.loaders:
+            self.submit_load(attribute, loader)
+    
+    def submit_load(self, attribute, loader):
+        future = self.executor.submit(self.load_source, attribute, loader)
+        # Results are applied on the main loop, never from the worker thread
+        future.add_done_callback(
+            lambda future: GLib.idle_add(self.on_source_loaded, attribute, future)
+        )
+    
+    def load_source(self, attribute, loader):
+        """Worker job: load a source and build its search index off the main loop"""
+        with PROFILER.phase(f"load {self.source_name(attribute)}"), \
+                self.metrics.timed(f"load {self.source_name(attribute)}"):
+            keybinds = loader()
+        with PROFILER.phase(f"index {self.source_name(attribute)}"):
+            search_index = SearchIndex(keybinds)
+            chords = ChordIndex.index(keybinds)
+        return keybinds, search_index, chords
+    
+    def on_source_loaded(self, attribute, future):
+        """Main-loop callback storing a finished source and filling in its tab"""
+        try:
+            keybinds, search_index, chords = future.result()
+        except Exception as e:
+            # A failing source leaves its tab empty without blocking the others
+            print(f"Error loading {attribute}: {e}", file=sys.stderr)
+            keybinds = KeybindTable(self.source_name(attribute))
+            search_index, chords = SearchIndex(keybinds), {}
+        
+        self.store_source(attribute, keybinds, search_index)
+        self.chord_index.update(keybinds, chords)
+        started = self.reload_started.pop(attribute, None)
+        if started is not None:
+            # From the debounced file change to the tab showing the new rows
+            self.metrics.count('reloads')
+            self.metrics.observe('reload', (time.perf_counter() - started) * 1000)
+        # Conflicts are only meaningful once every source is in
+        if all(loaded in self.loaded_sources for loaded, _ in self.loaders):
+            self.refresh_conflicts()
+        return GLib.SOURCE_REMOVE
+    
+    def refresh_conflicts(self):
+        with PROFILER.phase('conflicts'), self.metrics.timed('conflicts'):
+            keybinds = self.chord_index.table()
+        self.store_source('conflict_keybinds', keybinds, SearchIndex(keybinds))
+    
+    def store_source(self, attribute, keybinds, search_index):
+        """Store loaded keybinds, update a built tab in place and build pending ones"""
+        self.search_indexes[attribute] = search_index
+        self.search_results[attribute] = search_index.search(self.search_query)
+        if attribute in self.loaded_sources:
+            self.apply_reload(attribute, keybinds)
+        setattr(self, attribute, keybinds)
+        self.loaded_sources.add(attribute)
+        self.watch_source_files(attribute)
+        
+        if self.window is not None:
+            current_page = self.notebook.get_current_page()
+            if current_page >= 0 and self.tabs[current_page][1] == attribute:
+                self.ensure_tab(current_page)
+            GLib.idle_add(self.prewarm_tabs, priority=GLib.PRIORITY_LOW)
+    
+    def watch_source_files(self, attribute):
+        """Monitor every file that fed a source, including source= includes"""
+        cache_name = self.cache_names.get(attribute)
+        for path in self.cache.deps.get(cache_name, []):
+            path = str(path)
+            if path in self.file_monitors:
+                continue
+            # Monitoring a missing file still reports when it is created
+            # Directories are watched too, so added and removed files are noticed
+            monitor = Gio.File.new_for_path(path).monitor(Gio.FileMonitorFlags.WATCH_MOVES, None)
+            monitor.connect('changed', self.on_source_file_changed, attribute)
+            self.file_monitors[path] = (monitor, attribute)
+    
+    def on_source_file_changed(self, monitor, file, other_file, event_type, attribute):
+        """Debounce editor save bursts into a single reload per source"""
+        if event_type in (Gio.FileMonitorEvent.ATTRIBUTE_CHANGED, Gio.FileMonitorEvent.PRE_UNMOUNT):
+            return
+        pending = self.reload_timeouts.pop(attribute, None)
+        if pending is not None:
+            GLib.source_remove(pending)
+        self.reload_timeouts[attribute] = GLib.timeout_add(250, self.reload_source, attribute)
+    
+    def reload_source(self, attribute):
+        """Re-run one source's loader; the cache skips files that did not change"""
+        self.reload_timeouts.pop(attribute, None)
+        debug(f"reloading {attribute}")
+        self.reload_started.setdefault(attribute, time.perf_counter())
+        loader = dict(self.loaders)[attribute]
+        self.submit_load(attribute, loader)
+        return GLib.SOURCE_REMOVE
+    
+    def apply_reload(self, attribute, keybinds):
+        """Diff reloaded keybinds against the built tab's model by normalized chord
+        
+        Only removed, inserted and changed rows touch the list store, so the
+        scroll position and the widgets of unchanged rows are kept.
+        """
+        if self.window is None:
+            return
+        for index, (_, tab_attribute, _) in enumerate(self.tabs):
+            store = self.tab_stores[index]
+            if tab_attribute != attribute or store is None:
+                continue
+            
+            new_keyed = keyed_by_chord(keybinds)
+            seen = {}
+            old_keys = []
+            for position in range(store.get_n_items()):
+                item = store.get_item(position)
+                chord = normalize_chord(item.key, keybinds.source)
+                occurrence = seen.get(chord, 0)
+                seen[chord] = occurrence + 1
+                old_keys.append((chord, occurrence))
+            
+            # Walk backwards so removals do not shift positions still to visit
+            for position in reversed(range(len(old_keys))):
+                match = new_keyed.pop(old_keys[position], None)
+                if match is None:
+                    store.remove(position)
+                    continue
+                new_position, keybind = match
+                item = store.get_item(position)
+                if (item.key, item.action, item.category, item.section) != (
+                        keybind.key, keybind.action, keybind.category, keybinds.category_ids[new_position]):
+                    store.splice(position, 1, [KeybindItem(keybinds, new_position)])
+                else:
+                    item.position = new_position
+            
+            # Whatever is left is new and goes where the new table has it, since
+            # rows within a category are shown in store order
+            added = sorted(new_position for new_position, _ in new_keyed.values())
+            kept = [store.get_item(position).position for position in range(store.get_n_items())]
+            if kept == sorted(kept):
+                for offset, new_position in enumerate(added):
+                    store.insert(bisect_left(kept, new_position) + offset, KeybindItem(keybinds, new_position))
+            else:
+                # Rows were moved around in the configuration: re-splice in table order, keeping the items
+                items = [store.get_item(position) for position in range(len(kept))]
+                items += [KeybindItem(keybinds, new_position) for new_position in added]
+                items.sort(key=lambda item: item.position)
+                store.splice(0, len(kept), items)
+            
+            # Positions moved, so the filter has to look at every row again
+            self.tab_filters[index].changed(Gtk.FilterChange.DIFFERENT)
+            self.tab_sorters[index].changed(Gtk.SorterChange.DIFFERENT)
+        self.update_tab_labels()
+    
+    def on_command_line(self, app, command_line):
+        """Handle options from this process or forwarded from a later launch"""
+        options = command_line.get_options_dict()
+        
+        theme = options.lookup_value('theme', GLib.VariantType.new('s'))
+        if theme is not None:
+            self.set_theme(theme.get_string())
+        
+        if options.contains('daemon'):
+            self.start_daemon()
+        elif options.contains('show'):
+            self.show_window()
+        elif options.contains('hide'):
+            self.hide_window()
+        elif options.contains('toggle'):
+            self.toggle_window()
+        else:
+            app.activate()
+        return 0
+    
+    def on_activate(self, app):
+        self.show_window()
+    
+    def start_daemon(self):
+        """Keep the application and a pre-built, hidden window alive"""
+        if self.daemon:
+            return
+        self.daemon = True
+        self.app.hold()
+        self.build_window()
+        # Closing (Escape/q) only hides the window so the next toggle is instant
+        self.window.set_hide_on_close(True)
+    
+    def show_window(self):
+        self.build_window()
+        self.metrics.count('shows')
+        with PROFILER.phase('present'):
+            self.window.present()
+        if PROFILER.enabled and not PROFILER.reported:
+            self.window.get_frame_clock().connect('after-paint', self.on_first_frame)
+    
+    def on_first_frame(self, frame_clock):
+        """Finish the startup profile once the first frame has been drawn"""
+        frame_clock.disconnect_by_func(self.on_first_frame)
+        PROFILER.record('first frame', time.perf_counter())
+        PROFILER.report(
+            widgets=self.count_widgets(self.window),
+            rows_per_tab={label: len(getattr(self, attribute)) for label, attribute, _ in self.tabs},
+            tabs_built=[label for (label, _, _), scrolled in zip(self.tabs, self.scrolled_windows)
+                        if scrolled is not None],
+        )
+    
+    @staticmethod
+    def count_widgets(widget):
+        """Number of widgets in a widget tree, including the root"""
+        count = 1
+        child = widget.get_first_child()
+        while child is not None:
+            count += KeybindingReference.count_widgets(child)
+            child = child.get_next_sibling()
+        return count
+    
+    def hide_window(self):
+        if self.window is not None and self.window.get_visible():
+            self.window.close()
+    
+    def toggle_window(self):
+        if self.window is not None and self.window.get_visible():
+            self.hide_window()
+        else:
+            self.show_window()
+    
+    def build_window(self):
+        """Build the window, pages and CSS provider once"""
+        if self.window is not None:
+            return
+        
+        app = self.app
+        
+        # Load the compiled theme
+        with PROFILER.phase('css build'):
+            self.css_provider = self.create_css_provider()
+        
+        # Create main window
+        self.window = Adw.ApplicationWindow(application=app)
+        labels = [provider.label for provider in self.active_providers]
+        self.window.set_title(f"Keybinding Reference - {', '.join(labels[:-1])} & {labels[-1]}")
+        self.window.set_css_classes(['keybind-window'])
+        self.window.set_default_size(800, 750)
+        
+        # Make window focusable for keyboard navigation
+        self.window.set_can_focus(True)
+        
+        # Set window class for Hyprland window rules
+        GLib.set_prgname('keybind-reference')
+        if hasattr(self.window, 'set_wmclass'):
+            self.window.set_wmclass('keybind-reference', 'keybind-reference')
+        
+        # Create header bar
+        header = Adw.HeaderBar()
+        
+        # Title with navigation help
+        title_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
+        title_label = Gtk.Label(label="Keybinding Reference")
+        title_label.set_css_classes(['title-label'])
+        
+        nav_help = Gtk.Label(label="Nav: [count]j/k(scroll) • d/u(half-page) • g/G(top/bottom) • H/L(tabs) • 1-9(direct tab) • /(search) • q/Esc(quit)")
+        nav_help.set_css_classes(['nav-help-label'])
+        nav_help.set_wrap(True)
+        nav_help.set_wrap_mode(Pango.WrapMode.WORD)
+        nav_help.set_max_width_chars(80)
+        
+        title_box.append(title_label)
+        title_box.append(nav_help)
+        
+        header.set_title_widget(title_box)
+        
+        # Create notebook for tabs
+        self.notebook = Gtk.Notebook()
+        self.notebook.set_css_classes(['notebook'])
+        
+        # Tabs as (label, keybind attribute, show leader note); each page starts as
+        # an empty placeholder and is filled in the first time it is selected
+        self.tabs = [(provider.label, provider.attribute, provider.leader_note)
+                     for provider in self.active_providers]
+        self.tabs.append(("Conflicts", 'conflict_keybinds', False))
+        self.tab_pages = []
+        
+        # Store scrolled windows and row models for each tab (None until built)
+        self.scrolled_windows = [None] * len(self.tabs)
+        self.tab_stores = [None] * len(self.tabs)
+        self.tab_filters = [None] * len(self.tabs)
+        self.tab_sorters = [None] * len(self.tabs)
+        
+        for label, _, _ in self.tabs:
+            placeholder = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+            placeholder.set_vexpand(True)
+            placeholder.append(self.create_loading_placeholder())
+            self.notebook.append_page(placeholder, Gtk.Label(label=label))
+            self.tab_pages.append(placeholder)
+        
+        # switch-page also covers H/L and 1-9, which go through set_current_page
+        self.notebook.connect('switch-page', self.on_switch_page)
+        self.ensure_tab(0)
+        
+        # Build the remaining tabs once the first frame is out
+        GLib.idle_add(self.prewarm_tabs, priority=GLib.PRIORITY_LOW)
+        
+        # Search bar, revealed with /
+        self.search_entry = Gtk.SearchEntry()
+        self.search_entry.set_placeholder_text("Search all keybindings…")
+        self.search_entry.set_hexpand(True)
+        self.search_entry.connect('search-changed', self.on_search_changed)
+        self.search_entry.connect('stop-search', self.on_stop_search)
+        self.search_bar = Gtk.SearchBar()
+        self.search_bar.set_child(self.search_entry)
+        self.search_bar.connect_entry(self.search_entry)
+        
+        # Main container
+        main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        main_box.append(header)
+        main_box.append(self.search_bar)
+        main_box.append(self.notebook)
+        
+        self.window.set_content(main_box)
+        
+        # Apply CSS styling after window creation
+        display = self.window.get_display()
+        with PROFILER.phase('css load'):
+            Gtk.StyleContext.add_provider_for_display(
+                display,
+                self.css_provider,
+                Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
+            )
+        
+        # Setup keyboard navigation
+        self.setup_keyboard_navigation()
+    
+    def create_loading_placeholder(self):
+        """Spinner shown in a tab until its source has loaded"""
+        loading_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        loading_box.set_valign(Gtk.Align.CENTER)
+        loading_box.set_vexpand(True)
+        
+        spinner = Gtk.Spinner()
+        spinner.set_spinning(True)
+        loading_label = Gtk.Label(label="Loading keybindings…")
+        loading_label.set_css_classes(['nav-help-label'])
+        
+        loading_box.append(spinner)
+        loading_box.append(loading_label)
+        return loading_box
+    
+    def ensure_tab(self, index):
+        """Build the contents of a tab if it is still a placeholder
+        
+        Tabs whose source is still loading keep their spinner until
+        on_source_loaded builds them.
+        """
+        if self.scrolled_windows[index] is not None:
+            return
+        _, attribute, show_leader_note = self.tabs[index]
+        if attribute not in self.loaded_sources:
+            return
+        
+        container = self.tab_pages[index]
+        loading_box = container.get_first_child()
+        if loading_box is not None:
+            container.remove(loading_box)
+        with PROFILER.phase(f"tab {self.tabs[index][0]}"):
+            store = self.create_keybind_store(getattr(self, attribute))
+            filtered, search_filter, rank_sorter = self.create_search_models(store, attribute)
+            page, scrolled = self.create_keybind_section(filtered, rank_sorter, show_leader_note)
+            container.append(page)
+        self.scrolled_windows[index] = scrolled
+        self.tab_stores[index] = store
+        self.tab_filters[index] = search_filter
+        self.tab_sorters[index] = rank_sorter
+    
+    def on_switch_page(self, notebook, page, page_num):
+        self.ensure_tab(page_num)
+    
+    def prewarm_tabs(self):
+        """Idle callback building one pending, already loaded tab per iteration"""
+        for index, scrolled in enumerate(self.scrolled_windows):
+            if scrolled is None and self.tabs[index][1] in self.loaded_sources:
+                self.ensure_tab(index)
+                return GLib.SOURCE_CONTINUE
+        return GLib.SOURCE_REMOVE
+    
+    def on_search_changed(self, entry):
+        """Filter every tab as the query changes"""
+        query = entry.get_text().strip().lower()
+        previous = self.search_query
+        self.search_query = query
+        
+        previous_results = dict(self.search_results)
+        for attribute, search_index in self.search_indexes.items():
+            self.search_results[attribute] = search_index.search(query)
+        
+        # Tell the filter models whether they only need to re-check current matches
+        if query.startswith(previous):
+            change = Gtk.FilterChange.MORE_STRICT
+        elif previous.startswith(query):
+            change = Gtk.FilterChange.LESS_STRICT
+        else:
+            change = Gtk.FilterChange.DIFFERENT
+        for (_, attribute, _), search_filter, rank_sorter in zip(self.tabs, self.tab_filters, self.tab_sorters):
+            # Tabs not built yet read the results when they are
+            if search_filter is None or rank_sorter is None:
+                continue
+            search_filter.changed(change)
+            # A longer query only drops rows; the rest keep their order unless their scores say otherwise
+            if change != Gtk.FilterChange.MORE_STRICT or self.ranking_changed(
+                    previous_results.get(attribute), self.search_results.get(attribute)):
+                rank_sorter.changed(Gtk.SorterChange.DIFFERENT)
+        self.update_tab_labels()
+    
+    @staticmethod
+    def ranking_changed(previous, results):
+        """Whether rows that still match sort differently by their new scores than by their old ones"""
+        if not results:
+            return False
+        if not previous:
+            return True
+        ranked = sorted(results, key=lambda position: (-previous.get(position, 0), position))
+        for first, second in zip(ranked, ranked[1:]):
+            old = previous.get(first, 0) - previous.get(second, 0)
+            new = results[first] - results[second]
+            if (old > 0) != (new > 0) or (old == 0) != (new == 0):
+                return True
+        return False
+    
+    def on_stop_search(self, entry):
+        entry.set_text('')
+        self.search_bar.set_search_mode(False)
+    
+    def update_tab_labels(self):
+        """Show per-tab match counts while a search is active"""
+        if self.window is None:
+            return
+        for index, (label, attribute, _) in enumerate(self.tabs):
+            results = self.search_results.get(attribute)
+            text = label if results is None else f"{label} ({len(results)})"
+            self.notebook.get_tab_label(self.tab_pages[index]).set_label(text)
+    
+    def setup_keyboard_navigation(self):
+        """Setup vim-style keyboard navigation through a keyval dispatch table"""
+        close = lambda count: self.window.close()
+        self.key_handlers = {
+            Gdk.KEY_slash: self.open_search,
+            Gdk.KEY_Escape: close,
+            Gdk.KEY_q: close,
+            # Tabs
+            Gdk.KEY_H: lambda count: self.switch_tab(-count),
+            Gdk.KEY_L: lambda count: self.switch_tab(count),
+            # Scrolling: 3 lines vertically, 2 horizontally, or half a page
+            Gdk.KEY_j: lambda count: self.scroll('v', 'step', 3 * count),
+            Gdk.KEY_k: lambda count: self.scroll('v', 'step', -3 * count),
+            Gdk.KEY_d: lambda count: self.scroll('v', 'page', 0.5 * count),
+            Gdk.KEY_u: lambda count: self.scroll('v', 'page', -0.5 * count),
+            Gdk.KEY_h: lambda count: self.scroll('h', 'step', -2 * count),
+            Gdk.KEY_l: lambda count: self.scroll('h', 'step', 2 * count),
+            Gdk.KEY_g: lambda count: self.scroll_to_edge(top=True),
+            Gdk.KEY_G: lambda count: self.scroll_to_edge(top=False),
+        }
+        
+        # Motions: a digit typed before one of these was a count, not a tab
+        self.motion_keys = set(self.key_handlers) - {Gdk.KEY_slash, Gdk.KEY_Escape, Gdk.KEY_q}
+        
+        controller = Gtk.EventControllerKey()
+        controller.connect('key-pressed', self.on_key_pressed)
+        self.window.add_controller(controller)
+    
+    def on_key_pressed(self, controller, keyval, keycode, state):
+        """Handle keyboard navigation with vim-style motions and counts
+        
+        A lone 1-9 switches tabs at once. The digits are also kept as a
+        count: if a motion follows (5j), the tab the count was typed on
+        comes back and the motion runs there.
+        """
+        if Gdk.KEY_0 <= keyval <= Gdk.KEY_9 and (self.pending_count or keyval != Gdk.KEY_0):
+            if not self.pending_count:
+                self.count_page = self.notebook.get_current_page()
+                tab_index = keyval - Gdk.KEY_1
+                if tab_index < self.notebook.get_n_pages():
+                    self.notebook.set_current_page(tab_index)
+            elif len(self.pending_count) == 1:
+                # A second digit: only a count has two
+                self.notebook.set_current_page(self.count_page)
+            self.pending_count += chr(keyval)
+            return True
+        
+        handler = self.key_handlers.get(keyval)
+        count = 1
+        if self.pending_count:
+            if keyval in self.motion_keys:
+                count = int(self.pending_count)
+                self.notebook.set_current_page(self.count_page)
+            self.pending_count = ''
+        if handler is None:
+            return False
+        handler(count)
+        return True
+    
+    def open_search(self, count=1):
+        self.search_bar.set_search_mode(True)
+        self.search_entry.grab_focus()
+    
+    def switch_tab(self, offset):
+        current_page = self.notebook.get_current_page()
+        target = max(0, min(current_page + offset, self.notebook.get_n_pages() - 1))
+        if target != current_page:
+            self.notebook.set_current_page(target)
+    
+    def current_scroller(self, orientation):
+        """SmoothScroller for the current tab's scrolled window, or None if it is not built"""
+        current_page = self.notebook.get_current_page()
+        if not 0 <= current_page < len(self.scrolled_windows):
+            return None
+        scrolled = self.scrolled_windows[current_page]
+        if scrolled is None:
+            return None
+        scroller = self.scrollers.get((current_page, orientation))
+        if scroller is None or scroller.widget is not scrolled:
+            adjustment = scrolled.get_vadjustment() if orientation == 'v' else scrolled.get_hadjustment()
+            scroller = self.scrollers[(current_page, orientation)] = SmoothScroller(scrolled, adjustment, self.metrics)
+        return scroller
+    
+    def scroll(self, orientation, unit, amount):
+        """Animate a scroll by `amount` step increments or pages"""
+        scroller = self.current_scroller(orientation)
+        if scroller is None:
+            return
+        adjustment = scroller.adjustment
+        size = adjustment.get_step_increment() if unit == 'step' else adjustment.get_page_size()
+        scroller.scroll_by(size * amount)
+    
+    def scroll_to_edge(self, top):
+        scroller = self.current_scroller('v')
+        if scroller is None:
+            return
+        adjustment = scroller.adjustment
+        scroller.scroll_to(adjustment.get_lower() if top else adjustment.get_upper())
+    
+    def run(self, argv=None):
+        return self.app.run(argv if argv is not None else sys.argv)
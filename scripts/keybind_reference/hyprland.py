@@ -0,0 +1,381 @@
+"""
+Hyprland keybindings: the hyprland.conf parser and the compositor's IPC socket
+"""
+
+import os
+import json
+import re
+import glob
+from pathlib import Path
+
+from .core import debug
+
+
+# Flags accepted after "bind" (bindl, bindel, bindm, bindrn, ...)
+HYPRLAND_BIND_FLAGS = frozenset('lrcgoenmtidsp')
+
+
+HYPRLAND_VARIABLE = re.compile(r'\$(\w+)')
+
+
+def strip_hyprland_comment(line):
+    """Drop a trailing # comment; ## is Hyprland's escape for a literal #"""
+    if '#' not in line:
+        return line
+    kept = []
+    start = 0
+    while True:
+        hash_index = line.find('#', start)
+        if hash_index < 0:
+            kept.append(line[start:])
+            break
+        kept.append(line[start:hash_index])
+        if line.startswith('##', hash_index):
+            kept.append('#')
+            start = hash_index + 2
+        else:
+            break
+    return ''.join(kept)
+
+
+class HyprlandConfigParser:
+    """Single-pass, line-oriented parser for Hyprland configuration files
+    
+    Each file is tokenized once into its top-level statements, memoized by
+    mtime and size, so a reload only re-reads files that changed. Walking the
+    statements follows source= includes (with cycle detection), expands
+    $variables in definition order and turns every bind* line into a
+    structured record, tagged with the submap it was declared in.
+    """
+    
+    def __init__(self):
+        # path -> (mtime_ns, size, statements)
+        self.statements = {}
+    
+    def tokenize(self, path):
+        """Return (kind, keyword, value, line) statements for one file"""
+        st = os.stat(path)
+        memo = self.statements.get(path)
+        if memo is not None and memo[0] == st.st_mtime_ns and memo[1] == st.st_size:
+            return memo[2]
+        
+        statements = []
+        depth = 0
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line_number, line in enumerate(f, 1):
+                line = strip_hyprland_comment(line).strip()
+                if not line:
+                    continue
+                # Only top-level statements matter; skip the contents of sections
+                if line.endswith('{'):
+                    depth += 1
+                    continue
+                if line.startswith('}'):
+                    depth = max(depth - 1, 0)
+                    continue
+                if depth or '=' not in line:
+                    continue
+                
+                keyword, _, value = line.partition('=')
+                keyword = keyword.strip()
+                value = value.strip()
+                if keyword.startswith('$'):
+                    statements.append(('variable', keyword[1:], value, line_number))
+                elif keyword == 'source':
+                    statements.append(('source', keyword, value, line_number))
+                elif keyword == 'unbind':
+                    statements.append(('unbind', keyword, value, line_number))
+                elif keyword == 'submap':
+                    statements.append(('submap', keyword, value, line_number))
+                elif keyword.startswith('bind') and set(keyword[4:]) <= HYPRLAND_BIND_FLAGS:
+                    statements.append(('bind', keyword[4:], value, line_number))
+        
+        self.statements[path] = (st.st_mtime_ns, st.st_size, statements)
+        return statements
+    
+    def parse(self, root):
+        """Parse a config and its includes, returning (bind records, files read)"""
+        records = []
+        files = []
+        # Like variables, the current submap carries across source= includes;
+        # chords maps (mods, key) to the indices of its records once an unbind needs it
+        state = {'submap': '', 'chords': None}
+        self.walk(Path(root), {}, state, records, files, set())
+        # Unbound records were blanked in place; drop them all in one pass
+        if state['chords'] is not None:
+            records = [record for record in records if record is not None]
+        # Keep the first occurrence of each file, in read order
+        return records, list(dict.fromkeys(files))
+    
+    def chord(self, record):
+        return self.normalize_mods(record['mods']), record['key'].upper()
+    
+    def walk(self, path, variables, state, records, files, active):
+        files.append(path)
+        if path in active:
+            debug(f"hyprland: skipping recursive source of {path}")
+            return
+        try:
+            statements = self.tokenize(path)
+        except OSError as e:
+            debug(f"hyprland: cannot read {path} ({e})")
+            return
+        
+        expand = lambda value: HYPRLAND_VARIABLE.sub(
+            lambda match: variables.get(match.group(1), match.group(0)), value)
+        
+        active.add(path)
+        for kind, keyword, value, line_number in statements:
+            if kind == 'variable':
+                variables[keyword] = expand(value)
+            elif kind == 'source':
+                for include in self.resolve_includes(expand(value), path.parent):
+                    self.walk(include, variables, state, records, files, active)
+            elif kind == 'submap':
+                # 'reset' returns to the global binds, as the IPC reply's empty submap does
+                submap = expand(value)
+                state['submap'] = '' if submap == 'reset' else submap
+            elif kind == 'bind':
+                record = self.parse_bind(keyword, expand(value), path, line_number)
+                if record is not None:
+                    # Binds in a submap only apply while it is active
+                    record['mode'] = state['submap']
+                    if state['chords'] is not None:
+                        state['chords'].setdefault(self.chord(record), []).append(len(records))
+                    records.append(record)
+            elif kind == 'unbind':
+                if state['chords'] is None:
+                    # The first unbind indexes the binds so far; later binds are indexed as they come
+                    state['chords'] = {}
+                    for number, record in enumerate(records):
+                        state['chords'].setdefault(self.chord(record), []).append(number)
+                mods, _, key = expand(value).partition(',')
+                # unbind only removes the binds made before it
+                for number in state['chords'].pop((self.normalize_mods(mods), key.strip().upper()), ()):
+                    records[number] = None
+        active.discard(path)
+    
+    @staticmethod
+    def resolve_includes(value, base):
+        """Resolve a source= value (with ~, $ENV and globs) to file paths"""
+        include = Path(os.path.expandvars(os.path.expanduser(value)))
+        if not include.is_absolute():
+            include = base / include
+        if any(char in value for char in '*?['):
+            return sorted(Path(match) for match in glob.glob(str(include)))
+        return [include]
+    
+    @staticmethod
+    def normalize_mods(mods):
+        return ' '.join(sorted(re.split(r'[\s_&]+', mods.strip().upper()))).strip()
+    
+    @staticmethod
+    def parse_bind(flags, value, path, line_number):
+        """Split one bind value into mods, key, [description], dispatcher and args"""
+        has_description = 'd' in flags
+        fields = [field.strip() for field in value.split(',', 4 if has_description else 3)]
+        minimum = 4 if has_description else 3
+        if len(fields) < minimum:
+            return None
+        fields += [''] * (minimum + 1 - len(fields))
+        
+        mods, key = fields[0], fields[1]
+        if has_description:
+            description, dispatcher, args = fields[2], fields[3], fields[4]
+        else:
+            description, dispatcher, args = '', fields[2], fields[3]
+        return {
+            'mods': ' '.join(mods.split()),
+            'key': key,
+            'dispatcher': dispatcher,
+            'args': args,
+            'flags': flags,
+            'description': description,
+            'file': str(path),
+            'line': line_number,
+        }
+
+
+# Hyprland modmask bits, in the order modifiers are displayed
+HYPRLAND_MODMASK = (
+    (1 << 6, 'SUPER'), (1 << 2, 'CTRL'), (1 << 3, 'ALT'), (1 << 0, 'SHIFT'),
+    (1 << 1, 'CAPS'), (1 << 4, 'MOD2'), (1 << 5, 'MOD3'), (1 << 7, 'MOD5'),
+)
+
+
+# Boolean fields of a j/binds entry -> the bind flag they stand for
+HYPRLAND_IPC_FLAGS = (
+    ('locked', 'l'), ('release', 'r'), ('longPress', 'o'), ('repeat', 'e'),
+    ('non_consuming', 'n'), ('mouse', 'm'), ('transparent', 't'),
+    ('ignore_mods', 'i'), ('has_description', 'd'),
+)
+
+
+class HyprlandIpcClient:
+    """Reads the binds the running compositor has loaded over its request socket
+    
+    Talks to $XDG_RUNTIME_DIR/hypr/$HYPRLAND_INSTANCE_SIGNATURE/.socket.sock
+    directly instead of spawning hyprctl. The j/binds reply is decoded one
+    array element at a time as it arrives, so the end of the reply is known
+    without waiting for the socket to close; the connection is kept for the
+    next refresh and re-opened only when the compositor has closed it.
+    """
+    
+    TIMEOUT = 0.5
+    
+    def __init__(self, path=None):
+        import threading
+        
+        self.path = path
+        self.connection = None
+        # Loader threads share the connection; requests must not interleave
+        self.lock = threading.Lock()
+    
+    def socket_path(self):
+        """Path of the compositor's request socket, or None outside a Hyprland session"""
+        if self.path is not None:
+            return Path(self.path)
+        signature = os.environ.get('HYPRLAND_INSTANCE_SIGNATURE')
+        if not signature:
+            return None
+        runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or f"/run/user/{os.getuid()}"
+        path = Path(runtime_dir) / 'hypr' / signature / '.socket.sock'
+        # Hyprland before 0.40 kept its sockets under /tmp
+        legacy = Path('/tmp/hypr') / signature / '.socket.sock'
+        return legacy if not path.exists() and legacy.exists() else path
+    
+    def connect(self):
+        path = self.socket_path()
+        if path is None:
+            raise ConnectionRefusedError("no running Hyprland instance")
+        import socket
+        
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(self.TIMEOUT)
+        try:
+            connection.connect(str(path))
+        except OSError:
+            connection.close()
+            raise
+        return connection
+    
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+    
+    def request(self, command):
+        """Send one request and return its decoded JSON reply (a list)
+        
+        Raises OSError when no compositor answers and ValueError when the
+        reply is not the JSON array that was asked for.
+        """
+        with self.lock:
+            for attempt in range(2):
+                reused = self.connection is not None
+                if not reused:
+                    self.connection = self.connect()
+                try:
+                    self.connection.sendall(command.encode())
+                    reply = self.read_array()
+                except (BrokenPipeError, ConnectionResetError):
+                    reply = None
+                except (OSError, ValueError):
+                    self.close()
+                    raise
+                if reply is not None:
+                    return reply
+                # The compositor closed the kept connection: retry once on a new one
+                self.close()
+                if not reused:
+                    break
+            raise ConnectionResetError("Hyprland closed the connection without replying")
+    
+    def read_array(self):
+        """Decode a JSON array from the connection, element by element
+        
+        Returns None if the peer closed the connection before sending anything.
+        """
+        import codecs
+        
+        decoder = json.JSONDecoder()
+        text = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        items = []
+        buffer = ''
+        started = received = False
+        while True:
+            chunk = self.connection.recv(65536)
+            if not chunk:
+                if not received:
+                    return None
+                self.close()
+                raise ValueError("truncated j/binds reply")
+            received = True
+            buffer += text.decode(chunk)
+            
+            position = 0
+            while True:
+                while position < len(buffer) and buffer[position] in ' \t\r\n':
+                    position += 1
+                if position == len(buffer):
+                    break
+                char = buffer[position]
+                if not started:
+                    if char != '[':
+                        raise ValueError(f"unexpected reply: {buffer.strip()[:80]!r}")
+                    started = True
+                    position += 1
+                elif char == ',':
+                    position += 1
+                elif char == ']':
+                    return items
+                else:
+                    try:
+                        item, position = decoder.raw_decode(buffer, position)
+                    except json.JSONDecodeError:
+                        # The element is still arriving
+                        break
+                    items.append(item)
+            buffer = buffer[position:]
+    
+    def dispatch(self, command):
+        """Run a dispatcher ('workspace 3', 'exec alacritty') as a bind would
+        
+        Uses a connection of its own, read until the compositor closes it.
+        Raises OSError when no compositor answers and ValueError when it
+        rejects the dispatcher.
+        """
+        with self.lock:
+            connection = self.connect()
+            try:
+                connection.sendall(f"dispatch {command}".encode())
+                chunks = []
+                while chunk := connection.recv(4096):
+                    chunks.append(chunk)
+            finally:
+                connection.close()
+        reply = b''.join(chunks).decode('utf-8', 'replace').strip()
+        if reply != 'ok':
+            raise ValueError(reply or "no reply")
+    
+    def binds(self):
+        """The loaded binds as records shaped like HyprlandConfigParser's"""
+        records = []
+        for bind in self.request('j/binds'):
+            modmask = bind.get('modmask', 0)
+            key = bind.get('key') or (f"code:{bind['keycode']}" if bind.get('keycode') else '')
+            if bind.get('catch_all'):
+                key = 'catchall'
+            records.append({
+                'mods': ' '.join(name for bit, name in HYPRLAND_MODMASK if modmask & bit),
+                'key': key,
+                'dispatcher': bind.get('dispatcher', ''),
+                'args': bind.get('arg', ''),
+                'flags': ''.join(flag for field, flag in HYPRLAND_IPC_FLAGS if bind.get(field)),
+                'description': bind.get('description', ''),
+                # Binds in a submap only apply while it is active
+                'mode': bind.get('submap', ''),
+                'file': '',
+                'line': 0,
+            })
+        return records
@@ -0,0 +1,264 @@
+"""
+The keybind model shared by every source: the column-wise KeybindTable
+and its search index
+"""
+
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+from .conflicts import canonical_chords, chord_text
+
+
+
+def normalize_chord(key, source=''):
+    """A key chord as comparable text, in the canonical form of conflict detection
+    
+    'SUPER SHIFT + s' and 'Shift + SUPER + S' both become 'SUPER+SHIFT+S';
+    Neovim and Zellij keys keep the case that tells keys apart there.
+    """
+    return ' / '.join(chord_text(source, chord) for chord in canonical_chords(source, key))
+
+
+class Keybind:
+    """One binding, as read from a KeybindTable
+    
+    Category, mode, source and file strings are shared with the table's
+    name lists, so records of the same category point at one string.
+    """
+    __slots__ = ('key', 'action', 'category', 'mode', 'source', 'file', 'line')
+    
+    def __init__(self, key, action, category, mode='', source='', file='', line=0):
+        self.key = key
+        self.action = action
+        self.category = category
+        self.mode = mode
+        self.source = source
+        self.file = file
+        self.line = line
+    
+    def __repr__(self):
+        return f"Keybind({self.key!r}, {self.action!r}, {self.category!r})"
+
+
+class KeybindTable:
+    """Keybinds of one source stored column-wise
+    
+    Instead of one dict per binding, keys and actions are parallel string
+    lists and category, mode and file are small integer ids into interned
+    name lists. commands holds the window manager command behind each row
+    ('dispatcher args'), empty where there is nothing to run. Rows are
+    grouped by category when the table is built (categories keep the order
+    they first appear in the configuration), so a category's rows are one
+    contiguous range found by bisection, and the category id doubles as
+    the section sort key. chords maps each canonical chord (as display
+    text) to the rows bound to it; it is built once and cached with the
+    columns, so looking a chord up is one dict access.
+    """
+    __slots__ = ('source', 'keys', 'actions', 'category_ids', 'categories',
+                 'mode_ids', 'modes', 'file_ids', 'files', 'lines', 'commands', 'chords')
+    
+    def __init__(self, source=''):
+        self.source = sys.intern(source)
+        self.keys = []
+        self.actions = []
+        self.category_ids = array('H')
+        self.categories = []
+        self.mode_ids = array('H')
+        self.modes = []
+        self.file_ids = array('H')
+        self.files = []
+        self.lines = array('I')
+        self.commands = []
+        self.chords = None
+    
+    @classmethod
+    def from_records(cls, records, source=''):
+        """Build a table from keybind dicts ('key', 'action', 'category' and optional 'mode', 'file', 'line', 'command')"""
+        table = cls(source)
+        category_ids, mode_ids, file_ids = {}, {}, {}
+        for record in records:
+            category_ids.setdefault(record['category'], len(category_ids))
+        table.categories = [sys.intern(category) for category in category_ids]
+        
+        # A stable sort keeps the configuration order within each category
+        for record in sorted(records, key=lambda record: category_ids[record['category']]):
+            table.keys.append(record['key'])
+            table.actions.append(record['action'])
+            table.category_ids.append(category_ids[record['category']])
+            table.mode_ids.append(cls.name_id(mode_ids, table.modes, record.get('mode', '')))
+            table.file_ids.append(cls.name_id(file_ids, table.files, str(record.get('file', ''))))
+            table.lines.append(record.get('line') or 0)
+            table.commands.append(record.get('command', ''))
+        return table
+    
+    @staticmethod
+    def name_id(ids, names, name):
+        """Id of a name in an interned name list, adding it on first use"""
+        position = ids.get(name)
+        if position is None:
+            position = ids[name] = len(names)
+            names.append(sys.intern(name))
+        return position
+    
+    def columns(self):
+        """JSON-serializable form, as kept in the cache"""
+        return {
+            'keys': self.keys, 'actions': self.actions,
+            'categories': self.categories, 'category_ids': self.category_ids.tolist(),
+            'modes': self.modes, 'mode_ids': self.mode_ids.tolist(),
+            'files': self.files, 'file_ids': self.file_ids.tolist(),
+            'lines': self.lines.tolist(), 'commands': self.commands,
+            'chords': self.chord_positions(),
+        }
+    
+    @classmethod
+    def from_columns(cls, columns, source=''):
+        table = cls(source)
+        table.keys = columns['keys']
+        table.actions = columns['actions']
+        table.categories = [sys.intern(category) for category in columns['categories']]
+        table.category_ids = array('H', columns['category_ids'])
+        table.modes = [sys.intern(mode) for mode in columns['modes']]
+        table.mode_ids = array('H', columns['mode_ids'])
+        table.files = [sys.intern(file) for file in columns['files']]
+        table.file_ids = array('H', columns['file_ids'])
+        table.lines = array('I', columns['lines'])
+        table.commands = columns['commands']
+        table.chords = columns.get('chords')
+        return table
+    
+    def chord_positions(self):
+        """{canonical chord text: [positions]}, built on first use"""
+        if self.chords is None:
+            chords = {}
+            source = self.source
+            for position, key in enumerate(self.keys):
+                for chord in canonical_chords(source, key):
+                    chords.setdefault(chord_text(source, chord), []).append(position)
+            self.chords = chords
+        return self.chords
+    
+    def __len__(self):
+        return len(self.keys)
+    
+    def __getitem__(self, position):
+        return Keybind(self.keys[position], self.actions[position],
+                       self.categories[self.category_ids[position]], self.modes[self.mode_ids[position]],
+                       self.source, self.files[self.file_ids[position]], self.lines[position])
+    
+    def __iter__(self):
+        for position in range(len(self.keys)):
+            yield self[position]
+    
+    def category(self, position):
+        return self.categories[self.category_ids[position]]
+    
+    def sections(self):
+        """(category, start, stop) row ranges, in category order"""
+        return [(category, bisect_left(self.category_ids, category_id), bisect_right(self.category_ids, category_id))
+                for category_id, category in enumerate(self.categories)]
+
+
+def keyed_by_chord(keybinds):
+    """Map (normalized chord, occurrence) to (position, keybind), keeping duplicates distinct"""
+    keyed = {}
+    seen = {}
+    for position, keybind in enumerate(keybinds):
+        chord = normalize_chord(keybind.key, keybinds.source)
+        occurrence = seen.get(chord, 0)
+        seen[chord] = occurrence + 1
+        keyed[(chord, occurrence)] = (position, keybind)
+    return keyed
+
+
+class SearchIndex:
+    """Precomputed search index over one source's keybinds
+    
+    Built once per load: a lowercased search text per row (key, normalized
+    chord, action and category) and a trigram index over those texts. A query
+    matches rows containing every whitespace-separated term. When a query only
+    extends the previous one, the previous result set is narrowed instead of
+    looking at every row again.
+    """
+    
+    def __init__(self, keybinds):
+        self.source = keybinds.source
+        self.chords = []
+        self.texts = []
+        self.trigrams = {}
+        categories = keybinds.categories
+        for position, (key, action, category_id) in enumerate(zip(keybinds.keys, keybinds.actions,
+                                                                   keybinds.category_ids)):
+            chord = normalize_chord(key, self.source).lower()
+            text = f"{key} {chord} {action} {categories[category_id]}".lower()
+            self.chords.append(chord)
+            self.texts.append(text)
+            for start in range(len(text) - 2):
+                self.trigrams.setdefault(text[start:start + 3], set()).add(position)
+        
+        self.last_query = ''
+        self.last_results = None
+    
+    def candidates(self, terms):
+        """Rows containing every trigram of every term (a superset of the matches)"""
+        postings = []
+        for term in terms:
+            for start in range(len(term) - 2):
+                rows = self.trigrams.get(term[start:start + 3])
+                if not rows:
+                    return set()
+                postings.append(rows)
+        # Terms shorter than three characters have no trigrams to narrow with
+        if not postings:
+            return range(len(self.texts))
+        # Intersect starting from the rarest trigram to keep intermediate sets small
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+    
+    def score(self, position, terms):
+        """Match quality of one row, or None if a term is missing
+        
+        terms is a list of (term, term as a normalized chord) pairs.
+        """
+        text = self.texts[position]
+        chord = self.chords[position]
+        total = 0
+        for term, term_chord in terms:
+            found = text.find(term)
+            if found < 0:
+                return None
+            if chord == term_chord:
+                total += 100
+            elif chord.startswith(term):
+                total += 50
+            elif found == 0 or not text[found - 1].isalnum():
+                total += 20
+            else:
+                total += 5
+        return total
+    
+    def search(self, query):
+        """Return {position: score} for matching rows, or None for an empty query"""
+        query = query.strip().lower()
+        terms = query.split()
+        if not terms:
+            self.last_query, self.last_results = '', None
+            return None
+        
+        # Every term is a substring test, so extending the query can only remove
+        # rows: narrow whichever of the previous results and the trigram hits is smaller
+        candidates = self.candidates(terms)
+        if self.last_results is not None and query.startswith(self.last_query):
+            if len(self.last_results) < len(candidates):
+                candidates = self.last_results.keys()
+        
+        prepared = [(term, normalize_chord(term, self.source).lower()) for term in terms]
+        results = {}
+        for position in candidates:
+            score = self.score(position, prepared)
+            if score is not None:
+                results[position] = score
+        
+        self.last_query, self.last_results = query, results
+        return results
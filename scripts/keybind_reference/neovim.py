@@ -0,0 +1,320 @@
+"""
+Neovim keymaps: a Lua tokenizer that extracts vim.keymap.set() and friends,
+and the scanner that walks a configuration with a per-file cache
+"""
+
+import os
+import re
+from pathlib import Path
+
+from .core import debug, file_fingerprint
+
+
+LUA_TOKEN = re.compile(r"""
+    (?P<comment>--\[(?P<comment_level>=*)\[.*?\](?P=comment_level)\]|--[^\n]*)
+  | (?P<string>\[(?P<string_level>=*)\[.*?\](?P=string_level)\]|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<number>0[xX][0-9a-fA-F]+|\d+\.?\d*(?:[eE][+-]?\d+)?)
+  | (?P<space>\s+)
+  | (?P<op>\.\.\.|\.\.|==|~=|<=|>=|::|.)
+""", re.DOTALL | re.VERBOSE)
+
+
+LUA_ESCAPES = {'n': '\n', 't': '\t', '\\': '\\', '"': '"', "'": "'"}
+
+
+# Keywords opening and closing Lua blocks, tracked so commas inside function bodies
+# are not mistaken for argument separators
+LUA_BLOCK_OPEN = frozenset(('function', 'if', 'do', 'repeat'))
+
+
+LUA_BLOCK_CLOSE = frozenset(('end', 'until'))
+
+
+# Mapping functions and the position of their (mode, lhs, rhs, opts) arguments
+LUA_MAP_FUNCTIONS = {
+    'vim.keymap.set': 0,
+    'vim.api.nvim_set_keymap': 0,
+    'vim.api.nvim_buf_set_keymap': 1,
+}
+
+
+def tokenize_lua(source):
+    """Return (kind, text, line) tokens, keeping comments for descriptions"""
+    tokens = []
+    line = 1
+    for match in LUA_TOKEN.finditer(source):
+        kind = match.lastgroup
+        text = match.group()
+        if kind != 'space':
+            tokens.append((kind, text, line))
+        line += text.count('\n')
+    return tokens
+
+
+def lua_string_value(text):
+    """Decode a Lua string literal token"""
+    if text.startswith('['):
+        inner = text[text.index('[', 1) + 1:text.rindex(']', 0, -1)]
+        return inner[1:] if inner.startswith('\n') else inner
+    return re.sub(r'\\(.)', lambda match: LUA_ESCAPES.get(match.group(1), match.group(1)), text[1:-1])
+
+
+class LuaKeymapExtractor:
+    """Statically extracts keymaps from one Lua file without executing it
+    
+    Recognizes vim.keymap.set, vim.api.nvim_set_keymap and
+    nvim_buf_set_keymap calls (also through local aliases such as
+    `local map = vim.keymap.set`) and lazy.nvim `keys = { ... }` specs. Only
+    literal left-hand sides are reported; options given as a local table
+    variable are resolved within the same file.
+    """
+    
+    def __init__(self, source):
+        tokens = tokenize_lua(source)
+        self.tokens = [token for token in tokens if token[0] != 'comment']
+        # line -> trailing comment text, used as a description fallback
+        self.comments = {}
+        for kind, text, line in tokens:
+            if kind == 'comment' and not text.startswith('--['):
+                self.comments.setdefault(line, text[2:].strip())
+        self.aliases = {}
+        self.tables = {}
+    
+    def text(self, index):
+        return self.tokens[index][1] if index < len(self.tokens) else ''
+    
+    def dotted_name(self, index):
+        """Read a.b.c starting at index; return (name, index after it)"""
+        parts = []
+        while index < len(self.tokens) and self.tokens[index][0] == 'name':
+            parts.append(self.tokens[index][1])
+            if self.text(index + 1) not in ('.', ':') or index + 2 >= len(self.tokens):
+                return '.'.join(parts), index + 1
+            index += 2
+        return '.'.join(parts), index
+    
+    def split_items(self, open_index):
+        """Split a (...) or {...} at open_index into top-level items; return (items, end)"""
+        closer = ')' if self.text(open_index) == '(' else '}'
+        items = [[]]
+        depth = 0
+        index = open_index + 1
+        while index < len(self.tokens):
+            kind, text, _ = self.tokens[index]
+            if kind == 'op' and text in '({[':
+                depth += 1
+            elif kind == 'op' and text in ')}]':
+                if depth == 0 and text == closer:
+                    return [item for item in items if item], index
+                depth -= 1
+            elif kind == 'name' and text in LUA_BLOCK_OPEN:
+                depth += 1
+            elif kind == 'name' and text in LUA_BLOCK_CLOSE:
+                depth -= 1
+            elif depth == 0 and kind == 'op' and text in ',;':
+                items.append([])
+                index += 1
+                continue
+            items[-1].append(self.tokens[index])
+            index += 1
+        return [item for item in items if item], index
+    
+    def table_fields(self, tokens):
+        """Split a table constructor's tokens into (positional values, named fields)"""
+        positional, named = [], {}
+        if not tokens or tokens[0][1] != '{':
+            return positional, named
+        # Re-split the table's contents through a temporary view of the tokens
+        saved = self.tokens
+        self.tokens = tokens
+        items, _ = self.split_items(0)
+        self.tokens = saved
+        for item in items:
+            if len(item) > 2 and item[0][0] == 'name' and item[1][1] == '=':
+                named[item[0][1]] = item[2:]
+            else:
+                positional.append(item)
+        return positional, named
+    
+    def value(self, tokens):
+        """Render an expression: strings are decoded, lists of strings become lists"""
+        if not tokens:
+            return None
+        if len(tokens) == 1 and tokens[0][0] == 'string':
+            return lua_string_value(tokens[0][1])
+        if tokens[0][1] == 'function':
+            return '<Lua function>'
+        if tokens[0][1] == '{':
+            positional, _ = self.table_fields(tokens)
+            return [self.value(item) for item in positional]
+        if all(kind == 'string' or text == '..' for kind, text, _ in tokens):
+            return ''.join(lua_string_value(text) for kind, text, _ in tokens if kind == 'string')
+        return ''.join(text if kind != 'name' or index == 0 or tokens[index - 1][0] != 'name' else f" {text}"
+                       for index, (kind, text, _) in enumerate(tokens))
+    
+    def options(self, tokens):
+        """Named fields of an options table given literally or as a local variable"""
+        if len(tokens) == 1 and tokens[0][0] == 'name':
+            return self.tables.get(tokens[0][1], {})
+        return self.table_fields(tokens)[1]
+    
+    def keymap(self, modes, lhs_tokens, rhs_tokens, options, line, end_line, buffer=False):
+        lhs = self.value(lhs_tokens)
+        if not isinstance(lhs, str):
+            return None
+        if isinstance(modes, str):
+            modes = [modes]
+        desc = self.value(options.get('desc', []))
+        buffer = buffer or ('buffer' in options and self.value(options['buffer']) != 'false')
+        return {
+            'lhs': lhs,
+            'modes': [mode for mode in (modes or ['n']) if isinstance(mode, str)],
+            'rhs': self.value(rhs_tokens) or '',
+            'desc': desc if isinstance(desc, str) else self.comments.get(end_line, ''),
+            'buffer': buffer,
+            'line': line,
+        }
+    
+    def extract(self):
+        keymaps = []
+        index = 0
+        while index < len(self.tokens):
+            kind, text, line = self.tokens[index]
+            if kind != 'name' or self.text(index - 1) in ('.', ':') and index > 0:
+                index += 1
+                continue
+            
+            name, after = self.dotted_name(index)
+            
+            # local map = vim.keymap.set / local opts = { ... }
+            if name == 'local' and self.tokens[after - 1][1] == 'local':
+                target, equals = self.dotted_name(index + 1)
+                if self.text(equals) == '=':
+                    value_name, value_end = self.dotted_name(equals + 1)
+                    if value_name in LUA_MAP_FUNCTIONS:
+                        self.aliases[target] = value_name
+                    elif self.text(equals + 1) == '{':
+                        items, end = self.split_items(equals + 1)
+                        self.tables[target] = self.table_fields(self.tokens[equals + 1:end + 1])[1]
+                index += 1
+                continue
+            
+            function = self.aliases.get(name, name)
+            if function in LUA_MAP_FUNCTIONS and self.text(after) == '(':
+                args, end = self.split_items(after)
+                first = LUA_MAP_FUNCTIONS[function]
+                if len(args) >= first + 3:
+                    options = self.options(args[first + 3]) if len(args) > first + 3 else {}
+                    keymap = self.keymap(self.value(args[first]), args[first + 1], args[first + 2], options,
+                                         line, self.tokens[end][2] if end < len(self.tokens) else line,
+                                         buffer=function.endswith('buf_set_keymap'))
+                    if keymap is not None:
+                        keymaps.append(keymap)
+                index = end + 1
+                continue
+            
+            # lazy.nvim: keys = { { "<leader>ff", "<cmd>...", desc = "...", mode = ... }, ... }
+            if name == 'keys' and self.text(after) == '=' and self.text(after + 1) == '{':
+                specs, end = self.split_items(after + 1)
+                for spec in specs:
+                    if spec[0][0] == 'string':
+                        keymap = self.keymap(['n'], spec, [], {}, spec[0][2], spec[-1][2])
+                    else:
+                        positional, named = self.table_fields(spec)
+                        if not positional:
+                            continue
+                        keymap = self.keymap(self.value(named.get('mode', [])) or ['n'], positional[0],
+                                             positional[1] if len(positional) > 1 else [], named,
+                                             spec[0][2], spec[-1][2])
+                    if keymap is not None:
+                        keymaps.append(keymap)
+                index = end + 1
+                continue
+            
+            index = max(after, index + 1)
+        return keymaps
+
+
+def scan_lua_file(path):
+    """Extract the keymaps of one Lua file (also run in worker processes)"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return LuaKeymapExtractor(f.read()).extract()
+
+
+class NeovimKeymapScanner:
+    """Finds keymaps across a Neovim configuration
+    
+    Walks init.lua, lua/, plugin/ and after/. Per-file results are kept in
+    their own cache entry keyed by fingerprint, so after an edit only the
+    changed files are scanned again; large batches are scanned on a process
+    pool.
+    """
+    
+    # Below this many files to scan, starting worker processes costs more than it saves
+    PARALLEL_THRESHOLD = 32
+    
+    def __init__(self, cache, config_dir=None):
+        self.cache = cache
+        self.config_dir = Path(config_dir or Path.home() / '.config' / 'nvim')
+    
+    def exists(self):
+        return (self.config_dir / 'init.lua').is_file() or (self.config_dir / 'lua').is_dir()
+    
+    def walk(self):
+        """Return (Lua files, directories visited)"""
+        files, directories = [], [self.config_dir]
+        if (self.config_dir / 'init.lua').is_file():
+            files.append(self.config_dir / 'init.lua')
+        for subdirectory in ('lua', 'plugin', 'after'):
+            root = self.config_dir / subdirectory
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames.sort()
+                directories.append(Path(dirpath))
+                files.extend(Path(dirpath) / filename for filename in sorted(filenames)
+                             if filename.endswith('.lua'))
+        return files, directories
+    
+    def scan(self):
+        """Return ({file: keymaps}, dependency paths)"""
+        files, directories = self.walk()
+        memo = (self.cache.read_entry('neovim-files') or {}).get('files', {})
+        
+        results, fingerprints, pending = {}, {}, []
+        for path in files:
+            previous = memo.get(str(path))
+            fingerprint = file_fingerprint(path, previous and previous.get('fingerprint'))
+            fingerprints[str(path)] = fingerprint
+            if previous and fingerprint and previous.get('fingerprint', {}).get('sha256') == fingerprint['sha256']:
+                results[str(path)] = previous['keymaps']
+            else:
+                pending.append(str(path))
+        
+        debug(f"neovim: {len(files) - len(pending)} files reused, {len(pending)} scanned")
+        if len(pending) >= self.PARALLEL_THRESHOLD and (os.cpu_count() or 1) > 1:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            
+            # forkserver: never fork the (possibly multi-threaded GTK) parent directly
+            context = multiprocessing.get_context('forkserver')
+            with ProcessPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1),
+                                     mp_context=context) as pool:
+                chunk = max(1, len(pending) // ((os.cpu_count() or 1) * 4))
+                scanned = pool.map(self.scan_file, pending, chunksize=chunk)
+                results.update(zip(pending, scanned))
+        else:
+            results.update((path, self.scan_file(path)) for path in pending)
+        
+        if pending or len(memo) != len(files):
+            self.cache.write_entry('neovim-files', {'files': {
+                path: {'fingerprint': fingerprints[path], 'keymaps': results[path]} for path in results
+            }})
+        return results, files + directories
+    
+    @staticmethod
+    def scan_file(path):
+        try:
+            return scan_lua_file(path)
+        except (OSError, RecursionError) as e:
+            debug(f"neovim: cannot scan {path} ({e})")
+            return []
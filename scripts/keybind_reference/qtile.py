@@ -0,0 +1,153 @@
+"""
+Qtile keybindings, read from config.py's syntax tree without running it
+"""
+
+import re
+from pathlib import Path
+
+
+
+class QtileConfigParser:
+    """Reads Key(...) bindings from a Qtile config.py without running it
+    
+    The file is parsed with ast, so nothing in it is imported or executed.
+    Modifier lists and keys are resolved through module-level string
+    assignments (mod = "mod4"), bindings nested in KeyChord(...) get the
+    chord as a prefix, and each lazy command becomes a dispatcher such as
+    'layout.left' with its arguments. Values that are only known at run
+    time, like the i.name of a loop over groups, are shown as {i.name}.
+    """
+    
+    MODIFIERS = {
+        'mod4': 'SUPER', 'mod1': 'ALT', 'shift': 'SHIFT', 'control': 'CTRL',
+        'lock': 'CAPS', 'mod2': 'MOD2', 'mod3': 'MOD3', 'mod5': 'MOD5',
+    }
+    # EzKey("M-S-<Return>") modifier letters
+    EZ_MODIFIERS = {'M': 'mod4', 'A': 'mod1', 'S': 'shift', 'C': 'control'}
+    
+    def __init__(self):
+        self.strings = {}
+    
+    @staticmethod
+    def call_name(node):
+        function = node.func
+        if hasattr(function, 'id'):
+            return function.id
+        return getattr(function, 'attr', '')
+    
+    def describe(self, node):
+        """Render an expression as display text without evaluating it"""
+        import ast
+        
+        if isinstance(node, ast.Constant):
+            return str(node.value)
+        if isinstance(node, ast.Name):
+            return self.strings.get(node.id, f"{{{node.id}}}")
+        if isinstance(node, ast.JoinedStr):
+            return ''.join(self.describe(value.value if isinstance(value, ast.FormattedValue) else value)
+                           for value in node.values)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            return self.describe(node.left) + self.describe(node.right)
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'format'
+                and isinstance(node.func.value, ast.Constant) and isinstance(node.func.value.value, str)):
+            values = iter([self.describe(arg) for arg in node.args])
+            return re.sub(r'\{[^{}]*\}', lambda match: next(values, match.group(0)), node.func.value.value)
+        return f"{{{ast.unparse(node)}}}"
+    
+    def modifiers(self, node):
+        import ast
+        
+        if not isinstance(node, (ast.List, ast.Tuple)):
+            return ''
+        names = [self.describe(element) for element in node.elts]
+        return ' '.join(self.MODIFIERS.get(name.lower(), name) for name in names)
+    
+    def command(self, node):
+        """(dispatcher, args) of a lazy command: lazy.group["1"].toscreen() -> ('group.toscreen', '1')"""
+        import ast
+        
+        if not isinstance(node, ast.Call):
+            return ast.unparse(node), ''
+        path, args = [], [self.describe(arg) for arg in node.args]
+        target = node.func
+        while True:
+            if isinstance(target, ast.Attribute):
+                path.append(target.attr)
+                target = target.value
+            elif isinstance(target, ast.Subscript):
+                args.insert(0, self.describe(target.slice))
+                target = target.value
+            elif isinstance(target, ast.Call):
+                target = target.func
+            else:
+                break
+        if not (isinstance(target, ast.Name) and target.id == 'lazy'):
+            return ast.unparse(node.func), ', '.join(args)
+        return '.'.join(reversed(path)), ', '.join(args)
+    
+    def chord(self, mods, key):
+        return f"{mods} + {key}" if mods else key
+    
+    def key_record(self, node, prefix, path):
+        """Record of one Key(...) or EzKey(...) call, or None if it has no key"""
+        if self.call_name(node) == 'EzKey':
+            if not node.args:
+                return None
+            *letters, key = self.describe(node.args[0]).split('-')
+            mods = ' '.join(self.MODIFIERS.get(self.EZ_MODIFIERS.get(letter, letter), letter) for letter in letters)
+            key, commands = key.strip('<>'), node.args[1:]
+        else:
+            if len(node.args) < 2:
+                return None
+            mods, key, commands = self.modifiers(node.args[0]), self.describe(node.args[1]), node.args[2:]
+        
+        dispatcher, args = self.command(commands[0]) if commands else ('', '')
+        description = next((self.describe(keyword.value) for keyword in node.keywords if keyword.arg == 'desc'), '')
+        if not description and len(commands) > 1:
+            description = '; '.join(' '.join(filter(None, self.command(command))) for command in commands)
+        if prefix:
+            mods, key = '', ', '.join([*prefix, self.chord(mods, key)])
+        return {
+            'mods': mods,
+            'key': key,
+            'dispatcher': dispatcher,
+            'args': args,
+            'description': description,
+            'file': str(path),
+            'line': node.lineno,
+        }
+    
+    def walk(self, node, prefix, path, records):
+        import ast
+        
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.Call):
+                name = self.call_name(child)
+                if name in ('Key', 'EzKey'):
+                    record = self.key_record(child, prefix, path)
+                    if record is not None:
+                        records.append(record)
+                    continue
+                if name == 'KeyChord' and len(child.args) >= 3:
+                    chord = self.chord(self.modifiers(child.args[0]), self.describe(child.args[1]))
+                    self.walk(child.args[2], [*prefix, chord], path, records)
+                    continue
+            self.walk(child, prefix, path, records)
+    
+    def parse(self, path):
+        """Parse a config.py, returning (bind records, files read)"""
+        import ast
+        
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), filename=str(path))
+        # Module-level string constants, such as mod = "mod4" and terminal = "foot"
+        self.strings = {}
+        for statement in tree.body:
+            if (isinstance(statement, ast.Assign) and isinstance(statement.value, ast.Constant)
+                    and isinstance(statement.value.value, str)):
+                for target in statement.targets:
+                    if isinstance(target, ast.Name):
+                        self.strings[target.id] = statement.value.value
+        records = []
+        self.walk(tree, [], path, records)
+        return records, [Path(path)]
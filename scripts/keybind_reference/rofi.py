@@ -0,0 +1,174 @@
+"""
+rofi script mode: a prebuilt index of every binding, ranked by how often
+each one is picked
+"""
+
+import os
+import sys
+import json
+import time
+from pathlib import Path
+
+from .core import CACHE_VERSION, PROFILER, KeybindCache, code_stamp, debug, write_atomically
+from .hyprland import HyprlandIpcClient
+from .sources import KeybindSources
+
+
+class SelectionCounts:
+    """How often, and how recently, each binding was picked from the rofi menu
+    
+    A small JSON object of row id -> [count, time of the last pick] under
+    $XDG_STATE_HOME. The count decays with a 30-day half-life, so a binding
+    picked daily this month ranks above one picked often last year.
+    """
+    
+    HALF_LIFE = 30 * 86400
+    # Only the highest-ranked entries are kept, so the store stays small
+    LIMIT = 500
+    
+    def __init__(self, path=None):
+        state_home = os.environ.get('XDG_STATE_HOME') or str(Path.home() / '.local' / 'state')
+        self.path = Path(path) if path else Path(state_home) / 'keybind-reference' / 'selections.json'
+        self.counts = {}
+    
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                counts = json.load(f)
+            if not isinstance(counts, dict):
+                raise ValueError("selection counts are not an object")
+        except FileNotFoundError:
+            counts = {}
+        except (OSError, ValueError) as e:
+            debug(f"selections: ignoring unreadable store ({e})")
+            counts = {}
+        self.counts = counts
+        return self
+    
+    def score(self, row_id, now):
+        try:
+            count, last = self.counts[row_id]
+            return count * 0.5 ** (max(0.0, now - last) / self.HALF_LIFE)
+        except (KeyError, TypeError, ValueError):
+            return 0.0
+    
+    def record(self, row_id, now=None):
+        """Count one more pick of a row and write the store back"""
+        now = time.time() if now is None else now
+        self.counts[row_id] = [self.score(row_id, now) + 1, now]
+        if len(self.counts) > self.LIMIT:
+            kept = sorted(self.counts, key=lambda kept_id: self.score(kept_id, now), reverse=True)[:self.LIMIT]
+            self.counts = {kept_id: self.counts[kept_id] for kept_id in kept}
+        try:
+            write_atomically(self.path, json.dumps(self.counts))
+        except OSError as e:
+            debug(f"selections: write failed ({e})")
+
+
+class RofiIndex:
+    """Prebuilt rofi rows for every source, so the menu opens without parsing
+    
+    Each row is [id, text, command]: the id is what the selection counts
+    are kept under, the text is what rofi shows, and command is the
+    Hyprland dispatcher to run when the row is picked ('' for the other
+    sources). The index is stored next to the source cache entries with the
+    (mtime, size) of every file the sources came from, and rebuilt through
+    KeybindSources (and its cache) as soon as any of them changes.
+    """
+    
+    def __init__(self, cache):
+        self.path = cache.directory / 'rofi-index.json'
+    
+    @staticmethod
+    def stat(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+    
+    def load(self):
+        """The stored rows, or None when missing, unreadable or stale"""
+        try:
+            with open(self.path, 'r') as f:
+                index = json.load(f)
+            if index.get('version') != CACHE_VERSION or index.get('code') != code_stamp():
+                return None
+            for path, stat in index['deps']:
+                if self.stat(path) != stat:
+                    debug(f"rofi index: {path} changed")
+                    return None
+            return index['rows']
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            debug(f"rofi index: rebuilding unreadable index ({e})")
+            return None
+    
+    def build(self, sources):
+        """Load every source, store the rows and return them"""
+        labels = {provider.attribute: provider.label for provider in sources.providers}
+        rows = []
+        for attribute, keybinds in sources.load_all().items():
+            name = sources.source_name(attribute)
+            for position in range(len(keybinds)):
+                # rofi rows are single lines
+                key = ' '.join(keybinds.keys[position].split())
+                action = ' '.join(keybinds.actions[position].split())
+                command = keybinds.commands[position] if name == 'hyprland' else ''
+                rows.append([f"{name}\t{key}\t{action}", f"{key}  {action} [{labels[attribute]}]", command])
+        
+        deps = {str(path) for path in sources.config_paths()}
+        deps.update(str(path) for paths in sources.cache.deps.values() for path in paths)
+        try:
+            write_atomically(self.path, json.dumps({
+                'version': CACHE_VERSION,
+                'code': code_stamp(),
+                'deps': [[path, self.stat(path)] for path in sorted(deps)],
+                'rows': rows,
+            }, ensure_ascii=False))
+        except OSError as e:
+            debug(f"rofi index: write failed ({e})")
+        return rows
+
+
+def run_rofi(args):
+    """rofi script mode (`rofi -show keys -modi keys:'keybind-reference --rofi'`)
+    
+    rofi runs the command once to fill the menu (ROFI_RETV=0) and again with
+    the picked row (ROFI_RETV=1, its id in ROFI_INFO). Rows come from the
+    prebuilt RofiIndex, ordered by SelectionCounts; picking a Hyprland row
+    runs its dispatcher over the compositor socket.
+    """
+    index = RofiIndex(KeybindCache())
+    with PROFILER.phase('rofi index'):
+        rows = index.load()
+        if rows is None:
+            rows = index.build(KeybindSources())
+    counts = SelectionCounts().load()
+    
+    if os.environ.get('ROFI_RETV', '0') != '0' or args.rofi:
+        # Older rofi releases do not set ROFI_INFO, so fall back to the row text
+        info = os.environ.get('ROFI_INFO')
+        row = next((row for row in rows if (row[0] == info if info else row[1] == args.rofi)), None)
+        if row is None:
+            return 0
+        counts.record(row[0])
+        if row[2]:
+            try:
+                HyprlandIpcClient().dispatch(row[2])
+            except (OSError, ValueError) as e:
+                print(f"Could not run {row[2]!r}: {e}", file=sys.stderr)
+                return 1
+        return 0
+    
+    if args.source:
+        rows = [row for row in rows if row[0].startswith(args.source.lower())]
+    now = time.time()
+    # A stable sort keeps the source and configuration order among equal scores
+    rows = sorted(rows, key=lambda row: -counts.score(row[0], now))
+    PROFILER.report(rows=len(rows))
+    lines = ['\0prompt\x1fkeys', '\0no-custom\x1ftrue']
+    lines.extend(f"{text}\0info\x1f{row_id}" for row_id, text, _ in rows)
+    sys.stdout.write('\n'.join(lines) + '\n')
+    return 0
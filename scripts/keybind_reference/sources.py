@@ -0,0 +1,602 @@
+"""
+GTK-free loading of every keybind source, shared by the panel and the CLI
+"""
+
+import os
+import sys
+import json
+import threading
+from functools import cached_property
+from pathlib import Path
+
+from .core import CACHE_VERSION, PROFILER, KeybindCache, code_stamp, debug, write_atomically
+from .categories import HyprlandCategorizer
+from .conflicts import ChordIndex
+from .hyprland import HyprlandConfigParser, HyprlandIpcClient
+from .model import KeybindTable
+from .neovim import NeovimKeymapScanner
+
+
+class KeybindProvider:
+    """One keybind source: its tab, how to detect it and how to load it
+    
+    name is the source name used by the CLI; the loaded KeybindTable lives
+    in the `<name>_keybinds` attribute of KeybindSources. load() returns a
+    KeybindTable, and the files that fed it are recorded under the cache
+    entry `cache_name`, which is what the panel watches for changes.
+    """
+    
+    __slots__ = ('name', 'label', 'cache_name', 'detect', 'load', 'leader_note')
+    
+    def __init__(self, name, label, cache_name, detect, load, leader_note=False):
+        self.name = name
+        self.label = label
+        self.cache_name = cache_name
+        self.detect = detect
+        self.load = load
+        self.leader_note = leader_note
+    
+    @property
+    def attribute(self):
+        return f"{self.name}_keybinds"
+
+
+class KeybindSnapshot:
+    """Every cached source's columns in one file, written ahead of time
+    
+    `keybind-reference --build-snapshot` (run by the installer) loads every
+    source and stores the tables with the (mtime, size) of the files each
+    one came from, so a launch reads one file instead of one cache entry
+    per source. A source whose files changed since falls back to the cache.
+    """
+    
+    def __init__(self, cache):
+        self.cache = cache
+        self.path = cache.directory / 'snapshot.json'
+        # Loader threads look sources up concurrently; the file is read once
+        self.lock = threading.Lock()
+        self.stored = None
+        self.entries = {}
+    
+    @staticmethod
+    def stat(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+    
+    def read(self):
+        try:
+            with open(self.path, 'r') as f:
+                snapshot = json.load(f)
+            if snapshot.get('version') != CACHE_VERSION or snapshot.get('code') != code_stamp():
+                return {}
+            return snapshot['sources']
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            debug(f"snapshot: ignoring unreadable snapshot ({e})")
+            return {}
+    
+    def lookup(self, name):
+        """A source's columns if its files are unchanged since the snapshot, else None"""
+        with self.lock:
+            if self.stored is None:
+                self.stored = self.read()
+        entry = self.stored.get(name)
+        if entry is None:
+            return None
+        try:
+            if any(self.stat(path) != stat for path, stat in entry['deps']):
+                debug(f"snapshot {name}: stale")
+                return None
+            self.cache.deps[name] = [Path(path) for path, _ in entry['deps']]
+        except (KeyError, TypeError, ValueError) as e:
+            debug(f"snapshot {name}: unreadable ({e})")
+            return None
+        self.cache.count(hit=True)
+        debug(f"snapshot {name}: hit")
+        return entry['columns']
+    
+    def add(self, name, columns, deps):
+        with self.lock:
+            self.entries[name] = {'deps': [str(path) for path in deps], 'columns': columns}
+    
+    def write(self):
+        """Store every source loaded by this process"""
+        with self.lock:
+            write_atomically(self.path, json.dumps({
+                'version': CACHE_VERSION,
+                'code': code_stamp(),
+                'sources': {name: {**entry, 'deps': [[path, self.stat(path)] for path in entry['deps']]}
+                            for name, entry in self.entries.items()},
+            }, ensure_ascii=False))
+        return self.path
+
+
+class KeybindSources:
+    """GTK-free loading of every keybind source, shared by the panel and the CLI"""
+    
+    def __init__(self):
+        # Parsed keybindings are reused across launches while their inputs are unchanged
+        self.cache = KeybindCache()
+        # Every source's table in one file, built ahead of time by the installer
+        self.snapshot = KeybindSnapshot(self.cache)
+        self.hyprland_parser = HyprlandConfigParser()
+        self.hyprland_ipc = HyprlandIpcClient()
+        self.neovim_scanner = NeovimKeymapScanner(self.cache)
+        self.hyprland_categorizer = HyprlandCategorizer(self.cache)
+        
+        # Every known source, in tab order. Window managers only get a tab when
+        # their configuration exists; Zellij and Neovim fall back to a
+        # built-in reference, so they are always shown.
+        self.providers = [
+            KeybindProvider('hyprland', "Hyprland", 'hyprland', self.hyprland_detected,
+                            self.load_hyprland_keybinds),
+            KeybindProvider('qtile', "Qtile", 'qtile', lambda: self.qtile_config_path().is_file(),
+                            self.load_qtile_keybinds),
+            KeybindProvider('dwm', "DWM", 'dwm', lambda: self.dwm_config_path('dwm') is not None,
+                            lambda: self.load_dwm_keybinds('dwm')),
+            KeybindProvider('dwl', "DWL", 'dwl', lambda: self.dwm_config_path('dwl') is not None,
+                            lambda: self.load_dwm_keybinds('dwl')),
+            KeybindProvider('zellij', "Zellij", 'zellij', lambda: True, self.load_zellij_keybinds),
+            KeybindProvider('neovim_lsp', "Neovim", 'neovim', lambda: True, self.load_neovim_lsp_keybinds,
+                            leader_note=True),
+        ]
+        self.active_providers = [provider for provider in self.providers if provider.detect()]
+        
+        # Keybinding data, one KeybindTable per source
+        for provider in self.providers:
+            setattr(self, provider.attribute, KeybindTable(provider.name))
+        
+        # Sources as (keybind attribute, loader)
+        self.loaders = [(provider.attribute, provider.load) for provider in self.active_providers]
+        # Keybind attribute -> cache entry whose dependency files are watched
+        self.cache_names = {provider.attribute: provider.cache_name for provider in self.providers}
+        
+        # Every source's bindings by canonical chord, for conflict checks
+        self.chord_index = ChordIndex()
+        self.conflict_keybinds = KeybindTable('conflicts')
+    
+    def load_all(self):
+        """Load every detected source concurrently, returning {attribute: KeybindTable}
+        
+        Parsing is mostly file reads and regex work that releases the GIL
+        often enough that one thread per source keeps startup close to the
+        slowest source rather than the sum of all of them. Plain threads:
+        importing concurrent.futures costs more than a warm load of every
+        source together.
+        """
+        results = {}
+        
+        def load(attribute, loader):
+            # One failing source must not take the others down with it
+            try:
+                with PROFILER.phase(f"load {self.source_name(attribute)}"):
+                    results[attribute] = loader()
+            except Exception as e:
+                print(f"Error loading {self.source_name(attribute)} keybinds: {e}", file=sys.stderr)
+                results[attribute] = KeybindTable(self.source_name(attribute))
+        
+        threads = [threading.Thread(target=load, args=(attribute, loader), name=f"keybind-loader_{number}")
+                   for number, (attribute, loader) in enumerate(self.loaders)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {attribute: results[attribute] for attribute, _ in self.loaders}
+    
+    @staticmethod
+    def source_name(attribute):
+        """Short source name used by the CLI: 'neovim_lsp_keybinds' -> 'neovim_lsp'"""
+        return attribute.removesuffix('_keybinds')
+    
+    def load_cached(self, name, source, parse):
+        """Load a source from the snapshot or through the cache, which both keep it in column form"""
+        def parse_columns():
+            records, deps = parse()
+            return KeybindTable.from_records(records, source).columns(), deps
+        columns = self.snapshot.lookup(name)
+        if columns is None:
+            columns = self.cache.load(name, parse_columns)
+        # Whatever this process loaded is what the next snapshot holds
+        self.snapshot.add(name, columns, self.cache.deps.get(name, []))
+        return KeybindTable.from_columns(columns, source)
+    
+    # Parsers are only imported when a source has to be parsed, not read from the cache
+    @cached_property
+    def qtile_parser(self):
+        from .qtile import QtileConfigParser
+        return QtileConfigParser()
+    
+    @cached_property
+    def zellij_parser(self):
+        from .zellij import ZellijConfigParser
+        return ZellijConfigParser()
+    
+    @staticmethod
+    def hyprland_config_path():
+        return Path.home() / '.config' / 'hypr' / 'hyprland.conf'
+    
+    def hyprland_detected(self):
+        return bool(os.environ.get('HYPRLAND_INSTANCE_SIGNATURE')) or self.hyprland_config_path().is_file()
+    
+    def parse_hyprland_keybinds(self):
+        """Parse Hyprland configuration, returning (keybinds, files read)"""
+        records, deps = self.hyprland_parser.parse(self.hyprland_config_path())
+        # Editing the categorization rules has to re-categorize the cached binds
+        return self.window_manager_keybinds(records), [*deps, *self.hyprland_categorizer.dependencies()]
+    
+    def window_manager_keybinds(self, records):
+        """Turn window manager bind records (mods, key, dispatcher, args) into displayable keybinds"""
+        keybinds = []
+        for record in records:
+            key = f"{record['mods']} + {record['key']}" if record['mods'] else record['key']
+            action = record['dispatcher']
+            if record['args']:
+                action = f"{action}, {record['args']}"
+            keybinds.append({
+                **record,
+                'key': key,
+                'action': record['description'] or action,
+                'category': self.hyprland_categorizer.categorize(record['dispatcher'], record['args']),
+                # Mouse binds act on the drag itself and cannot be run from a menu
+                'command': '' if 'm' in record.get('flags', '') else f"{record['dispatcher']} {record['args']}".strip(),
+            })
+        return keybinds
+    
+    def load_hyprland_ipc_keybinds(self):
+        """Keybinds of the running compositor, or None when none answers
+        
+        These include binds added with `hyprctl keyword` or by plugins, so
+        they are never cached.
+        """
+        try:
+            records = self.hyprland_ipc.binds()
+        except (OSError, ValueError) as e:
+            debug(f"hyprland ipc: unavailable ({e}), parsing the config instead")
+            return None
+        # Hyprland reloads its config on save, so re-query whenever it changes
+        self.cache.deps.setdefault('hyprland', [self.hyprland_config_path().parent])
+        return KeybindTable.from_records(self.window_manager_keybinds(records), 'hyprland')
+    
+    def load_hyprland_keybinds(self):
+        """Extract keybindings from the running compositor or Hyprland configuration"""
+        keybinds = self.load_hyprland_ipc_keybinds()
+        if keybinds is not None:
+            return keybinds
+        try:
+            return self.load_cached('hyprland', 'hyprland', self.parse_hyprland_keybinds)
+        except Exception as e:
+            print(f"Error loading Hyprland keybinds: {e}", file=sys.stderr)
+            # Use your actual keybindings as fallback
+            return KeybindTable.from_records([
+                {'key': 'SUPER + Return', 'action': 'Open Terminal (Alacritty)', 'category': 'Applications'},
+                {'key': 'SUPER + Space', 'action': 'Open Launcher (Rofi)', 'category': 'Applications'},
+                {'key': 'SUPER + E', 'action': 'Open File Manager (Thunar)', 'category': 'Applications'},
+                {'key': 'SUPER + W', 'action': 'Change Wallpaper', 'category': 'Applications'},
+                {'key': 'SUPER + /', 'action': 'Show Keybinding Reference', 'category': 'Applications'},
+                
+                {'key': 'SUPER + Q', 'action': 'Close Active Window', 'category': 'Window Management'},
+                {'key': 'SUPER + M', 'action': 'Exit Hyprland', 'category': 'Window Management'},
+                {'key': 'SUPER + T', 'action': 'Toggle Floating Window', 'category': 'Window Management'},
+                {'key': 'SUPER + F', 'action': 'Toggle Fullscreen', 'category': 'Window Management'},
+                {'key': 'SUPER + P', 'action': 'Pseudotile (Dwindle)', 'category': 'Window Management'},
+                {'key': 'SUPER + J', 'action': 'Toggle Split (Dwindle)', 'category': 'Window Management'},
+                
+                {'key': 'SUPER + ↑/↓/←/→', 'action': 'Move Focus Between Windows', 'category': 'Navigation'},
+                {'key': 'SUPER + Mouse Drag', 'action': 'Move/Resize Window', 'category': 'Navigation'},
+                {'key': 'SUPER + Mouse Wheel', 'action': 'Switch Workspaces', 'category': 'Navigation'},
+                
+                {'key': 'SUPER + 1-9,0', 'action': 'Switch to Workspace N', 'category': 'Workspaces'},
+                {'key': 'SUPER + Shift + 1-9,0', 'action': 'Move Window to Workspace N', 'category': 'Workspaces'},
+                {'key': 'SUPER + S', 'action': 'Toggle Special Workspace (Magic)', 'category': 'Workspaces'},
+                {'key': 'SUPER + Shift + S', 'action': 'Move to Special Workspace', 'category': 'Workspaces'},
+                
+                {'key': 'XF86AudioRaiseVolume', 'action': 'Increase Volume (5%)', 'category': 'System'},
+                {'key': 'XF86AudioLowerVolume', 'action': 'Decrease Volume (5%)', 'category': 'System'},
+                {'key': 'XF86AudioMute', 'action': 'Toggle Audio Mute', 'category': 'System'},
+                {'key': 'XF86AudioMicMute', 'action': 'Toggle Microphone Mute', 'category': 'System'},
+                {'key': 'XF86MonBrightnessUp/Down', 'action': 'Adjust Screen Brightness', 'category': 'System'},
+                {'key': 'XF86AudioNext/Prev', 'action': 'Media Control (Next/Previous)', 'category': 'System'},
+                {'key': 'XF86AudioPlay/Pause', 'action': 'Media Control (Play/Pause)', 'category': 'System'},
+            ], 'hyprland')
+    
+    @staticmethod
+    def qtile_config_path():
+        config_home = os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config'
+        return Path(config_home) / 'qtile' / 'config.py'
+    
+    def parse_qtile_keybinds(self):
+        """Parse the Qtile configuration, returning (keybinds, files read)"""
+        records, deps = self.qtile_parser.parse(self.qtile_config_path())
+        return self.window_manager_keybinds(records), [*deps, *self.hyprland_categorizer.dependencies()]
+    
+    def load_qtile_keybinds(self):
+        """Extract keybindings from the Qtile config.py"""
+        try:
+            return self.load_cached('qtile', 'qtile', self.parse_qtile_keybinds)
+        except (OSError, SyntaxError) as e:
+            print(f"Error loading Qtile keybinds: {e}", file=sys.stderr)
+            return KeybindTable('qtile')
+    
+    @staticmethod
+    def dwm_config_path(name):
+        """config.h of dwm or dwl: the source checkout the installer builds, or a stowed copy"""
+        config_home = os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config'
+        for path in (Path.home() / '.local' / 'src' / name / 'config.h', Path(config_home) / name / 'config.h'):
+            if path.is_file():
+                return path
+        return None
+    
+    def parse_dwm_keybinds(self, name):
+        """Parse a dwm or dwl config.h, returning (keybinds, files read)"""
+        path = self.dwm_config_path(name)
+        if path is None:
+            raise FileNotFoundError(f"no {name} config.h")
+        from .dwm import DwmConfigParser
+        
+        # dwm and dwl load concurrently, and the parser keeps per-file macro state
+        records, deps = DwmConfigParser().parse(path)
+        return self.window_manager_keybinds(records), [*deps, *self.hyprland_categorizer.dependencies()]
+    
+    def load_dwm_keybinds(self, name):
+        """Extract keybindings from the keys[] and buttons[] of a dwm or dwl config.h"""
+        try:
+            return self.load_cached(name, name, lambda: self.parse_dwm_keybinds(name))
+        except OSError as e:
+            print(f"Error loading {name} keybinds: {e}", file=sys.stderr)
+            return KeybindTable(name)
+    
+    @staticmethod
+    def zellij_config_path():
+        if os.environ.get('ZELLIJ_CONFIG_FILE'):
+            return Path(os.environ['ZELLIJ_CONFIG_FILE'])
+        config_dir = os.environ.get('ZELLIJ_CONFIG_DIR') or Path.home() / '.config' / 'zellij'
+        return Path(config_dir) / 'config.kdl'
+    
+    def parse_zellij_keybinds(self):
+        """Parse the Zellij configuration, returning (keybinds, files read)"""
+        from .zellij import ZELLIJ_MODES
+        
+        records, deps = self.zellij_parser.parse(self.zellij_config_path())
+        keybinds = [{**record, 'category': ZELLIJ_MODES[record['mode']]} for record in records]
+        return keybinds, deps
+    
+    def load_zellij_keybinds(self):
+        """Extract keybindings from Zellij configuration"""
+        try:
+            if self.zellij_config_path().is_file():
+                return self.load_cached('zellij', 'zellij', self.parse_zellij_keybinds)
+            
+            # No configuration found: fall back to the tmux-style reference
+            return KeybindTable.from_records([
+                {'key': 'Ctrl + A', 'action': 'Enter Command Mode', 'category': 'Mode'},
+                {'key': 'Ctrl + A, C', 'action': 'New Tab', 'category': 'Tabs'},
+                {'key': 'Ctrl + A, &', 'action': 'Close Tab', 'category': 'Tabs'},
+                {'key': 'Ctrl + A, 1-9', 'action': 'Go to Tab N', 'category': 'Tabs'},
+                {'key': 'Ctrl + A, %', 'action': 'Split Right', 'category': 'Panes'},
+                {'key': 'Ctrl + A, "', 'action': 'Split Down', 'category': 'Panes'},
+                {'key': 'Ctrl + A, X', 'action': 'Close Pane', 'category': 'Panes'},
+                {'key': 'Ctrl + A, H/J/K/L', 'action': 'Navigate Panes', 'category': 'Panes'},
+                {'key': 'Ctrl + A, D', 'action': 'Detach Session', 'category': 'Session'},
+                {'key': 'Ctrl + A, [', 'action': 'Scroll Mode', 'category': 'Scrolling'},
+            ], 'zellij')
+        except Exception as e:
+            print(f"Error loading Zellij keybinds: {e}", file=sys.stderr)
+            return KeybindTable('zellij')
+    
+    def parse_neovim_keybinds(self):
+        """Scan the Neovim configuration, returning (keybinds, files and directories read)"""
+        results, deps = self.neovim_scanner.scan()
+        keybinds = []
+        for path, keymaps in results.items():
+            relative = Path(path).relative_to(self.neovim_scanner.config_dir)
+            category = relative.stem.replace('-', ' ').replace('_', ' ').title()
+            if relative.stem == 'init' and len(relative.parts) > 1:
+                category = relative.parent.name.replace('-', ' ').replace('_', ' ').title()
+            for keymap in keymaps:
+                modes = ', '.join(keymap['modes'])
+                keybinds.append({
+                    'key': keymap['lhs'] if keymap['modes'] == ['n'] else f"{keymap['lhs']} ({modes or 'nvo'})",
+                    'action': keymap['desc'] or keymap['rhs'],
+                    'category': f"{category} (buffer)" if keymap['buffer'] else category,
+                    'mode': modes,
+                    'file': path,
+                    'line': keymap['line'],
+                })
+        return keybinds, deps
+    
+    def load_neovim_lsp_keybinds(self):
+        """Load Neovim keybindings from configuration"""
+        try:
+            if self.neovim_scanner.exists():
+                return self.load_cached('neovim', 'neovim_lsp', self.parse_neovim_keybinds)
+            
+            # No Lua configuration found: fall back to the built-in LSP reference
+            # Note: <leader> is typically mapped to Space in modern Neovim configs
+            return KeybindTable.from_records([
+                # Navigation keybinds
+                {'key': 'gd', 'action': 'Go to Definition', 'category': 'Navigation'},
+                {'key': 'gr', 'action': 'Go to References', 'category': 'Navigation'},
+                {'key': 'gI', 'action': 'Go to Implementation', 'category': 'Navigation'},
+                {'key': 'gy', 'action': 'Go to Type Definition', 'category': 'Navigation'},
+                {'key': 'gD', 'action': 'Go to Declaration', 'category': 'Navigation'},
+                
+                # Documentation
+                {'key': 'K', 'action': 'Hover Documentation', 'category': 'Documentation'},
+                {'key': 'gK', 'action': 'Signature Help', 'category': 'Documentation'},
+                
+                # Code actions
+                {'key': '<leader>ca', 'action': 'Code Action', 'category': 'Code Actions'},
+                {'key': '<leader>rn', 'action': 'Rename Symbol', 'category': 'Code Actions'},
+                {'key': '<leader>f', 'action': 'Format Document', 'category': 'Code Actions'},
+                
+                # Diagnostics
+                {'key': '<leader>d', 'action': 'Show Diagnostic', 'category': 'Diagnostics'},
+                {'key': '[d', 'action': 'Previous Diagnostic', 'category': 'Diagnostics'},
+                {'key': ']d', 'action': 'Next Diagnostic', 'category': 'Diagnostics'},
+                {'key': '<leader>dl', 'action': 'Diagnostic Location List', 'category': 'Diagnostics'},
+                {'key': '<leader>dw', 'action': 'Diagnostic Workspace', 'category': 'Diagnostics'},
+                {'key': '<leader>dd', 'action': 'Toggle Diagnostics', 'category': 'Diagnostics'},
+                
+                # Workspace management
+                {'key': '<leader>wa', 'action': 'Add Workspace Folder', 'category': 'Workspace'},
+                {'key': '<leader>wr', 'action': 'Remove Workspace Folder', 'category': 'Workspace'},
+                {'key': '<leader>wl', 'action': 'List Workspace Folders', 'category': 'Workspace'},
+                
+                # Advanced features (FZF)
+                {'key': '<leader>lr', 'action': 'Find References (FZF)', 'category': 'Advanced'},
+                {'key': '<leader>ld', 'action': 'Find Definitions (FZF)', 'category': 'Advanced'},
+                {'key': '<leader>li', 'action': 'Find Implementations (FZF)', 'category': 'Advanced'},
+                {'key': '<leader>lt', 'action': 'Find Type Definitions (FZF)', 'category': 'Advanced'},
+                {'key': '<leader>ls', 'action': 'Document Symbols (FZF)', 'category': 'Advanced'},
+                {'key': '<leader>lS', 'action': 'Workspace Symbols (FZF)', 'category': 'Advanced'},
+                {'key': '<leader>lc', 'action': 'Code Actions (FZF)', 'category': 'Advanced'},
+                {'key': '<leader>lD', 'action': 'Workspace Diagnostics (FZF)', 'category': 'Advanced'},
+                
+                # Toggle features
+                {'key': '<leader>th', 'action': 'Toggle Inlay Hints', 'category': 'Toggle'},
+                {'key': '<leader>thl', 'action': 'Toggle Document Highlight', 'category': 'Toggle'},
+                
+                # C#-specific keybinds (OmniSharp)
+                {'key': '<leader>cb', 'action': 'Build Project', 'category': 'C# Development'},
+                {'key': '<leader>cr', 'action': 'Run Project', 'category': 'C# Development'},
+                {'key': '<leader>ct', 'action': 'Test Project', 'category': 'C# Development'},
+                {'key': '<leader>cT', 'action': 'Test with Coverage', 'category': 'C# Development'},
+                {'key': '<leader>cR', 'action': 'Restore Packages', 'category': 'C# Development'},
+                {'key': '<leader>cC', 'action': 'Clean Project', 'category': 'C# Development'},
+                {'key': '<leader>cp', 'action': 'Add Package', 'category': 'C# Development'},
+                {'key': '<leader>cP', 'action': 'Remove Package', 'category': 'C# Development'},
+                {'key': '<leader>cn', 'action': 'Create New Class', 'category': 'C# Development'},
+                {'key': '<leader>cf', 'action': 'Format Document', 'category': 'C# Development'},
+                {'key': '<leader>cA', 'action': 'Go to Alternate File (Test/Implementation)', 'category': 'C# Development'},
+                {'key': '<leader>ci', 'action': 'Show Project Info', 'category': 'C# Development'},
+                {'key': '<leader>cD', 'action': 'Decompile', 'category': 'C# Development'},
+                {'key': '<leader>cu', 'action': 'Organize Imports', 'category': 'C# Development'},
+                
+                # TypeScript/JavaScript-specific keybinds (ts_ls)
+                {'key': '<leader>to', 'action': 'Organize Imports', 'category': 'TypeScript/JavaScript'},
+                {'key': '<leader>tu', 'action': 'Remove Unused Imports', 'category': 'TypeScript/JavaScript'},
+                {'key': '<leader>ta', 'action': 'Add Missing Imports', 'category': 'TypeScript/JavaScript'},
+                {'key': '<leader>tf', 'action': 'Fix All Issues', 'category': 'TypeScript/JavaScript'},
+                {'key': 'gS', 'action': 'Go to Source Definition', 'category': 'TypeScript/JavaScript'},
+                {'key': '<leader>tr', 'action': 'Restart TypeScript Server', 'category': 'TypeScript/JavaScript'},
+                
+                # Angular-specific keybinds (angularls)
+                {'key': '<leader>ac', 'action': 'Go to Component', 'category': 'Angular Development'},
+                {'key': '<leader>at', 'action': 'Go to Template', 'category': 'Angular Development'},
+                {'key': '<leader>as', 'action': 'Go to Style', 'category': 'Angular Development'},
+                {'key': '<leader>ae', 'action': 'Extract Component', 'category': 'Angular Development'},
+                {'key': '<leader>av', 'action': 'Show Angular Version', 'category': 'Angular Development'},
+                {'key': '<leader>ar', 'action': 'Restart Angular Server', 'category': 'Angular Development'},
+                
+                # Go-specific keybinds (gopls)
+                {'key': '<leader>gi', 'action': 'Organize Imports', 'category': 'Go Development'},
+                {'key': '<leader>gt', 'action': 'Go Mod Tidy', 'category': 'Go Development'},
+                {'key': '<leader>gT', 'action': 'Generate Tests', 'category': 'Go Development'},
+                {'key': '<leader>gr', 'action': 'Run Tests', 'category': 'Go Development'},
+                {'key': '<leader>gR', 'action': 'Run Test Function', 'category': 'Go Development'},
+                {'key': '<leader>gf', 'action': 'Fill Struct', 'category': 'Go Development'},
+                {'key': '<leader>ga', 'action': 'Add Struct Tags', 'category': 'Go Development'},
+                {'key': '<leader>gA', 'action': 'Go to Alternate File (Test/Implementation)', 'category': 'Go Development'},
+                {'key': '<leader>gb', 'action': 'Run Benchmarks', 'category': 'Go Development'},
+                {'key': '<leader>gv', 'action': 'Vulnerability Check', 'category': 'Go Development'},
+                {'key': '<leader>gc', 'action': 'Regenerate CGO', 'category': 'Go Development'},
+                
+                # Elixir-specific keybinds (elixirls)
+                {'key': '<leader>et', 'action': 'Run Tests', 'category': 'Elixir Development'},
+                {'key': '<leader>eT', 'action': 'Run Test Under Cursor', 'category': 'Elixir Development'},
+                {'key': '<leader>ep', 'action': 'Convert to Pipe', 'category': 'Elixir Development'},
+                {'key': '<leader>eP', 'action': 'Convert from Pipe', 'category': 'Elixir Development'},
+                {'key': '<leader>em', 'action': 'Expand Macro', 'category': 'Elixir Development'},
+                {'key': '<leader>ef', 'action': 'Format with Mix', 'category': 'Elixir Development'},
+                {'key': '<leader>er', 'action': 'Restart ElixirLS', 'category': 'Elixir Development'},
+                {'key': '<leader>ed', 'action': 'Show Documentation', 'category': 'Elixir Development'},
+                {'key': '<leader>ei', 'action': 'Open IEx', 'category': 'Elixir Development'},
+                
+                # Kotlin-specific keybinds (kotlin_language_server)
+                {'key': '<leader>kb', 'action': 'Build Project', 'category': 'Kotlin Development'},
+                {'key': '<leader>kr', 'action': 'Run Project', 'category': 'Kotlin Development'},
+                {'key': '<leader>kt', 'action': 'Run Tests', 'category': 'Kotlin Development'},
+                {'key': '<leader>kT', 'action': 'Run Current Test Class', 'category': 'Kotlin Development'},
+                {'key': '<leader>kj', 'action': 'Build JVM Target', 'category': 'Kotlin Multiplatform'},
+                {'key': '<leader>kn', 'action': 'Build Native Target', 'category': 'Kotlin Multiplatform'},
+                {'key': '<leader>ks', 'action': 'Build JS Target', 'category': 'Kotlin Multiplatform'},
+                {'key': '<leader>ka', 'action': 'Build Android Target', 'category': 'Kotlin Multiplatform'},
+                {'key': '<leader>kg', 'action': 'Generate Data Class', 'category': 'Kotlin Development'},
+                {'key': '<leader>kc', 'action': 'Generate Constructor', 'category': 'Kotlin Development'},
+                {'key': '<leader>ke', 'action': 'Generate Equals/HashCode', 'category': 'Kotlin Development'},
+                {'key': '<leader>ki', 'action': 'Organize Imports', 'category': 'Kotlin Development'},
+                {'key': '<leader>kf', 'action': 'Extract Function', 'category': 'Kotlin Development'},
+                {'key': '<leader>kv', 'action': 'Extract Variable', 'category': 'Kotlin Development'},
+                {'key': '<leader>kd', 'action': 'Generate KDoc', 'category': 'Kotlin Development'},
+                
+                # Clojure-specific keybinds (Conjure REPL - j for "jack-in")
+                {'key': '<leader>jj', 'action': 'Jack-in to REPL', 'category': 'Clojure REPL'},
+                {'key': '<leader>jJ', 'action': 'Select REPL (Shadow CLJS)', 'category': 'Clojure REPL'},
+                {'key': '<leader>jc', 'action': 'Connect to port', 'category': 'Clojure REPL'},
+                {'key': '<leader>jp', 'action': 'Connect to host/port', 'category': 'Clojure REPL'},
+                {'key': '<leader>jd', 'action': 'Disconnect from REPL', 'category': 'Clojure REPL'},
+                {'key': '<leader>jq', 'action': 'Close session', 'category': 'Clojure REPL'},
+                {'key': '<leader>jQ', 'action': 'Close all sessions', 'category': 'Clojure REPL'},
+                {'key': '<leader>jl', 'action': 'List sessions', 'category': 'Clojure REPL'},
+                {'key': '<leader>js', 'action': 'Assume session', 'category': 'Clojure REPL'},
+                {'key': '<leader>jS', 'action': 'Assume session (prompt)', 'category': 'Clojure REPL'},
+                {'key': '<leader>jR', 'action': 'Refresh all changed namespaces', 'category': 'Clojure REPL'},
+                {'key': '<leader>jr', 'action': 'Refresh current namespace', 'category': 'Clojure REPL'},
+                
+                # Clojure evaluation keybinds
+                {'key': '<leader>ee', 'action': 'Evaluate current form', 'category': 'Clojure Evaluation'},
+                {'key': '<leader>ee (visual)', 'action': 'Evaluate selection', 'category': 'Clojure Evaluation',
+                 'mode': 'v'},
+                {'key': '<leader>er', 'action': 'Evaluate root form', 'category': 'Clojure Evaluation'},
+                {'key': '<leader>ew', 'action': 'Evaluate word under cursor', 'category': 'Clojure Evaluation'},
+                {'key': '<leader>eb', 'action': 'Evaluate buffer', 'category': 'Clojure Evaluation'},
+                {'key': '<leader>ef', 'action': 'Evaluate file from disk', 'category': 'Clojure Evaluation'},
+                {'key': '<leader>em', 'action': 'Evaluate form at mark', 'category': 'Clojure Evaluation'},
+                {'key': '<leader>e!', 'action': 'Evaluate and replace form', 'category': 'Clojure Evaluation'},
+                
+                # Clojure development keybinds
+                {'key': '<leader>cd', 'action': 'Show documentation', 'category': 'Clojure Development'},
+                {'key': 'K', 'action': 'Show documentation (hover)', 'category': 'Clojure Development'},
+                {'key': '<leader>gd', 'action': 'Go to definition', 'category': 'Clojure Development'},
+                {'key': 'gd', 'action': 'Go to definition (direct)', 'category': 'Clojure Development'},
+                {'key': '<leader>vs', 'action': 'View source', 'category': 'Clojure Development'},
+                
+                # Clojure testing keybinds
+                {'key': '<leader>tt', 'action': 'Run test under cursor', 'category': 'Clojure Testing'},
+                {'key': '<leader>tT', 'action': 'Run all tests in namespace', 'category': 'Clojure Testing'},
+                {'key': '<leader>ta', 'action': 'Run all loaded tests', 'category': 'Clojure Testing'},
+                {'key': '<leader>tr', 'action': 'Rerun last test', 'category': 'Clojure Testing'},
+                
+                # Clojure log management
+                {'key': '<leader>lg', 'action': 'Go to log buffer', 'category': 'Clojure Log'},
+                {'key': '<leader>ls', 'action': 'Show/hide log', 'category': 'Clojure Log'},
+                {'key': '<leader>lr', 'action': 'Reset log (clear)', 'category': 'Clojure Log'},
+                {'key': '<leader>lv', 'action': 'Toggle log', 'category': 'Clojure Log'},
+                {'key': '<leader>lt', 'action': 'Toggle log HUD', 'category': 'Clojure Log'},
+            ], 'neovim_lsp')
+        except Exception as e:
+            print(f"Error loading Neovim LSP keybinds: {e}", file=sys.stderr)
+            return KeybindTable('neovim_lsp')
+    
+    def categorize_hyprland_action(self, action):
+        """Categorize a Hyprland action given as 'dispatcher, args'"""
+        dispatcher, _, args = action.partition(',')
+        return self.hyprland_categorizer.categorize(dispatcher, args.strip())
+    
+    def config_paths(self):
+        """Every configuration a source reads or would read if it existed
+        
+        Fallback sources have no dependency files, so these are what notice
+        a configuration appearing (or disappearing) between loads.
+        """
+        return [
+            self.hyprland_config_path(), self.qtile_config_path(),
+            *(Path.home() / '.local' / 'src' / name / 'config.h' for name in ('dwm', 'dwl')),
+            *(Path(os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config') / name / 'config.h'
+              for name in ('dwm', 'dwl')),
+            self.zellij_config_path(), self.neovim_scanner.config_dir,
+        ]
@@ -0,0 +1,306 @@
+"""
+Catppuccin palettes, the panel stylesheet template and its compiler
+"""
+
+import os
+from pathlib import Path
+
+from .core import debug, write_atomically
+
+
+# Catppuccin Macchiato color palette
+CATPPUCCIN_MACCHIATO = {
+    'rosewater': '#f4dbd6',
+    'flamingo': '#f0c6c6',
+    'pink': '#f5bde6',
+    'mauve': '#c6a0f6',
+    'red': '#ed8796',
+    'maroon': '#ee99a0',
+    'peach': '#f5a97f',
+    'yellow': '#eed49f',
+    'green': '#a6da95',
+    'teal': '#8bd5ca',
+    'sky': '#91d7e3',
+    'sapphire': '#7dc4e4',
+    'blue': '#8aadf4',
+    'lavender': '#b7bdf8',
+    'text': '#cad3f5',
+    'subtext1': '#b8c0e0',
+    'subtext0': '#a5adcb',
+    'overlay2': '#939ab7',
+    'overlay1': '#8087a2',
+    'overlay0': '#6e738d',
+    'surface2': '#5b6078',
+    'surface1': '#494d64',
+    'surface0': '#363a4f',
+    'base': '#24273a',
+    'mantle': '#1e2030',
+    'crust': '#181926'
+}
+
+
+CATPPUCCIN_MOCHA = {
+    'rosewater': '#f5e0dc', 'flamingo': '#f2cdcd', 'pink': '#f5c2e7', 'mauve': '#cba6f7',
+    'red': '#f38ba8', 'maroon': '#eba0ac', 'peach': '#fab387', 'yellow': '#f9e2af',
+    'green': '#a6e3a1', 'teal': '#94e2d5', 'sky': '#89dceb', 'sapphire': '#74c7ec',
+    'blue': '#89b4fa', 'lavender': '#b4befe', 'text': '#cdd6f4', 'subtext1': '#bac2de',
+    'subtext0': '#a6adc8', 'overlay2': '#9399b2', 'overlay1': '#7f849c', 'overlay0': '#6c7086',
+    'surface2': '#585b70', 'surface1': '#45475a', 'surface0': '#313244', 'base': '#1e1e2e',
+    'mantle': '#181825', 'crust': '#11111b'
+}
+
+
+CATPPUCCIN_FRAPPE = {
+    'rosewater': '#f2d5cf', 'flamingo': '#eebebe', 'pink': '#f4b8e4', 'mauve': '#ca9ee6',
+    'red': '#e78284', 'maroon': '#ea999c', 'peach': '#ef9f76', 'yellow': '#e5c890',
+    'green': '#a6d189', 'teal': '#81c8be', 'sky': '#99d1db', 'sapphire': '#85c1dc',
+    'blue': '#8caaee', 'lavender': '#babbf1', 'text': '#c6d0f5', 'subtext1': '#b5bfe2',
+    'subtext0': '#a5adce', 'overlay2': '#949cbb', 'overlay1': '#838ba7', 'overlay0': '#737994',
+    'surface2': '#626880', 'surface1': '#51576d', 'surface0': '#414559', 'base': '#303446',
+    'mantle': '#292c3c', 'crust': '#232634'
+}
+
+
+CATPPUCCIN_LATTE = {
+    'rosewater': '#dc8a78', 'flamingo': '#dd7878', 'pink': '#ea76cb', 'mauve': '#8839ef',
+    'red': '#d20f39', 'maroon': '#e64553', 'peach': '#fe640b', 'yellow': '#df8e1d',
+    'green': '#40a02b', 'teal': '#179299', 'sky': '#04a5e5', 'sapphire': '#209fb5',
+    'blue': '#1e66f5', 'lavender': '#7287fd', 'text': '#4c4f69', 'subtext1': '#5c5f77',
+    'subtext0': '#6c6f85', 'overlay2': '#7c7f93', 'overlay1': '#8c8fa1', 'overlay0': '#9ca0b0',
+    'surface2': '#acb0be', 'surface1': '#bcc0cc', 'surface0': '#ccd0da', 'base': '#eff1f5',
+    'mantle': '#e6e9ef', 'crust': '#dce0e8'
+}
+
+
+# Built-in palettes for --theme; TOML palettes in the themes directory are added to these
+PALETTES = {
+    'macchiato': CATPPUCCIN_MACCHIATO,
+    'mocha': CATPPUCCIN_MOCHA,
+    'frappe': CATPPUCCIN_FRAPPE,
+    'latte': CATPPUCCIN_LATTE,
+}
+
+
+DEFAULT_THEME = 'macchiato'
+
+
+# Panel stylesheet, rendered once per palette by ThemeCompiler ($name is a palette color)
+THEME_CSS = """
+.keybind-window {
+    background-color: $base;
+    border: 2px solid $surface1;
+    border-radius: 12px;
+}
+
+.title-label {
+    color: $text;
+    font-size: 24px;
+    font-weight: bold;
+    margin: 16px;
+}
+
+.nav-help-label {
+    color: $subtext1;
+    font-size: 12px;
+    font-weight: normal;
+    margin: 0 16px 8px 16px;
+}
+
+.category-label {
+    color: $mauve;
+    font-size: 18px;
+    font-weight: bold;
+    margin: 12px 0 8px 0;
+}
+
+.keybind-row {
+    background-color: $surface0;
+    border-radius: 8px;
+    margin: 4px;
+    padding: 8px 12px;
+    border: 1px solid $surface1;
+    min-height: 40px;
+}
+
+.keybind-row:hover {
+    background-color: $surface1;
+    border-color: $mauve;
+}
+
+.key-label {
+    color: $peach;
+    font-family: 'JetBrains Mono', monospace;
+    font-weight: bold;
+    font-size: 14px;
+}
+
+.action-label {
+    color: $text;
+    font-size: 14px;
+}
+
+.notebook {
+    background-color: $base;
+}
+
+.notebook tab {
+    background-color: $surface0;
+    color: $subtext1;
+    border-radius: 8px 8px 0 0;
+    margin-right: 4px;
+    padding: 12px 20px;
+}
+
+.notebook tab:checked {
+    background-color: $surface1;
+    color: $text;
+    border-bottom: 3px solid $mauve;
+}
+
+.keybind-list,
+.keybind-list > row,
+.keybind-list > header {
+    background-color: transparent;
+}
+
+.scrolled-window {
+    background-color: transparent;
+    min-width: 600px;
+}
+"""
+
+
+def mix_colors(first, second, amount):
+    """Blend two #rrggbb colors, amount=0 giving first and 1 giving second"""
+    channels = [round(int(first[i:i + 2], 16) * (1 - amount) + int(second[i:i + 2], 16) * amount)
+                for i in (1, 3, 5)]
+    return '#' + ''.join(f"{channel:02x}" for channel in channels)
+
+
+class ThemeCompiler:
+    """Renders palettes into ready-made stylesheets, once per palette change
+    
+    Besides the built-in Catppuccin flavors, any TOML file in
+    $XDG_CONFIG_HOME/keybind-reference/themes is a theme named after its
+    stem: either a flat (or [palette]) table of Catppuccin color names, or
+    an Alacritty color scheme. Compiled CSS lives in the cache directory and
+    is tracked like a cache entry, so it is rebuilt only when the palette
+    file or this script changes. compile_bundle() additionally packs every
+    stylesheet into a GResource bundle that GTK maps instead of reading.
+    """
+    
+    RESOURCE_PREFIX = '/org/keybind/reference/themes'
+    
+    def __init__(self, cache):
+        self.cache = cache
+        self.directory = cache.directory / 'themes'
+        self.bundle_path = self.directory / 'themes.gresource'
+        config_home = os.environ.get('XDG_CONFIG_HOME') or str(Path.home() / '.config')
+        self.source_directory = Path(config_home) / 'keybind-reference' / 'themes'
+    
+    def names(self):
+        names = list(PALETTES)
+        names.extend(sorted(path.stem for path in self.source_directory.glob('*.toml') if path.stem not in PALETTES))
+        return names
+    
+    def source_path(self, name):
+        """The TOML file defining a theme, or None for a built-in palette"""
+        path = self.source_directory / f"{name}.toml"
+        if path.is_file():
+            return path
+        if name in PALETTES:
+            return None
+        raise KeyError(f"unknown theme {name!r} (available: {', '.join(self.names())})")
+    
+    def css_path(self, name):
+        return self.directory / f"{name}.css"
+    
+    def resource_path(self, name):
+        return f"{self.RESOURCE_PREFIX}/{name}.css"
+    
+    def load_palette(self, name):
+        source = self.source_path(name)
+        if source is None:
+            return PALETTES[name]
+        import tomllib
+        
+        with open(source, 'rb') as f:
+            return self.palette_from_toml(tomllib.load(f))
+    
+    @staticmethod
+    def palette_from_toml(data):
+        """Map a TOML palette, or an Alacritty color scheme, onto Catppuccin color names"""
+        colors = data.get('colors')
+        if isinstance(colors, dict) and 'primary' in colors:
+            primary, normal = colors['primary'], colors.get('normal', {})
+            base, text = primary['background'], primary['foreground']
+            surface1 = normal.get('black', mix_colors(base, text, 0.2))
+            return {
+                'base': base,
+                'text': text,
+                'surface0': mix_colors(base, surface1, 0.5),
+                'surface1': surface1,
+                'subtext1': normal.get('white', mix_colors(text, base, 0.15)),
+                'mauve': normal.get('magenta', text),
+                'peach': normal.get('yellow', text),
+            }
+        palette = data.get('palette', data)
+        return {name: value for name, value in palette.items() if isinstance(value, str)}
+    
+    def render(self, palette):
+        from string import Template
+        
+        template = Template(THEME_CSS)
+        missing = sorted({match.group('named') for match in template.pattern.finditer(THEME_CSS)
+                          if match.group('named')} - set(palette))
+        if missing:
+            raise ValueError(f"palette lacks {', '.join(missing)}")
+        return template.substitute(palette)
+    
+    def compile(self, name):
+        """Return the path of the compiled stylesheet for a theme, rendering it if stale"""
+        entry_name = f"theme-{name}"
+        css_path = self.cache.lookup(entry_name)
+        if css_path is not None:
+            return Path(css_path)
+        
+        debug(f"theme {name}: compiling")
+        source = self.source_path(name)
+        css_path = self.css_path(name)
+        write_atomically(css_path, self.render(self.load_palette(name)))
+        # The stylesheet itself is a dependency, so deleting it forces a rebuild
+        deps = [*([source] if source else []), css_path]
+        self.cache.store(entry_name, deps, str(css_path))
+        return css_path
+    
+    def compile_bundle(self):
+        """Compile every theme and pack the stylesheets into a GResource bundle
+        
+        Returns the bundle path, or None when glib-compile-resources is not
+        installed (the stylesheets are then loaded from their files).
+        """
+        import shutil
+        import subprocess
+        
+        files = [self.compile(name).name for name in self.names()]
+        compiler = shutil.which('glib-compile-resources')
+        if compiler is None:
+            return None
+        
+        manifest = self.directory / 'themes.gresource.xml'
+        write_atomically(manifest, '<?xml version="1.0" encoding="UTF-8"?>\n<gresources>\n'
+                         f'  <gresource prefix="{self.RESOURCE_PREFIX}">\n'
+                         + ''.join(f'    <file>{file}</file>\n' for file in files)
+                         + '  </gresource>\n</gresources>\n')
+        result = subprocess.run([compiler, f"--sourcedir={self.directory}", f"--target={self.bundle_path}",
+                                 str(manifest)])
+        if result.returncode != 0:
+            raise OSError(f"glib-compile-resources exited with status {result.returncode}")
+        return self.bundle_path
+    
+    def bundle_is_current(self, css_path):
+        """Whether the bundle exists and is at least as new as a compiled stylesheet"""
+        try:
+            return self.bundle_path.stat().st_mtime_ns >= css_path.stat().st_mtime_ns
+        except OSError:
+            return False
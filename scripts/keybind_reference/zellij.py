@@ -0,0 +1,288 @@
+"""
+Zellij keybindings: a KDL parser and the config.kdl keybinds block
+"""
+
+import re
+from pathlib import Path
+
+
+
+KDL_TOKEN = re.compile(r"""
+    (?P<newline>\r\n|[\n\r\x0c\u0085\u2028\u2029])
+  | (?P<space>(?:[ \t\ufeff\u00a0]|\\[ \t]*(?://[^\n]*)?\r?\n)+)
+  | (?P<line_comment>//[^\r\n]*)
+  | (?P<block_comment>/\*)
+  | (?P<slashdash>/-)
+  | (?P<raw>r(?P<hashes>\#*)"(?P<raw_body>.*?)"(?P=hashes))
+  | (?P<string>"(?P<body>[^"\\]*(?:\\.[^"\\]*)*)")
+  | (?P<annotation>\([^)]*\))
+  | (?P<open>\{) | (?P<close>\}) | (?P<semicolon>;) | (?P<equals>=)
+  | (?P<bare>(?:[^\s{}()\[\];="\\/]+|/(?![/*-]))+)
+""", re.DOTALL | re.VERBOSE)
+
+
+# Everything that can hide a brace, for skipping blocks that are not needed
+KDL_SKIP = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|r(\#*)".*?"\1|//[^\n]*|/\*|[{}]', re.DOTALL)
+
+
+KDL_BLOCK_COMMENT = re.compile(r'/\*|\*/')
+
+
+KDL_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', 'b': '\b', 'f': '\f', '\\': '\\', '"': '"', '/': '/'}
+
+
+class KdlError(ValueError):
+    pass
+
+
+def unescape_kdl(body):
+    if '\\' not in body:
+        return body
+    return re.sub(r'\\(u\{[0-9a-fA-F]{1,6}\}|\s+|.)', lambda escape: (
+        chr(int(escape.group(1)[2:-1], 16)) if escape.group(1).startswith('u{')
+        else '' if escape.group(1).isspace()
+        else KDL_ESCAPES.get(escape.group(1), escape.group(1))), body)
+
+
+class KdlParser:
+    """Streaming KDL parser producing nodes as plain dicts
+    
+    Each node is {'name', 'args', 'props', 'children', 'line'}. The source is
+    tokenized lazily in a single pass; the children of top-level nodes not
+    listed in `only` (layouts, themes, plugins) are skipped by brace
+    matching without being tokenized at all.
+    """
+    
+    def __init__(self, source, only=None):
+        self.source = source
+        self.pos = 0
+        self.line = 1
+        self.lookahead = None
+        self.only = only
+    
+    def read_token(self):
+        """Return the next (kind, value, line) token, skipping whitespace and comments"""
+        source = self.source
+        while self.pos < len(source):
+            match = KDL_TOKEN.match(source, self.pos)
+            if match is None:
+                raise KdlError(f"line {self.line}: unexpected {source[self.pos]!r}")
+            kind = match.lastgroup
+            line = self.line
+            if kind == 'block_comment':
+                self.pos = self.skip(match.end(), comment=True)
+            else:
+                self.pos = match.end()
+            if kind not in ('bare', 'open', 'close', 'semicolon', 'equals'):
+                self.line += source.count('\n', match.start(), self.pos)
+            
+            if kind == 'bare':
+                return 'value', match.group(), line
+            if kind == 'string':
+                return 'value', unescape_kdl(match.group('body')), line
+            if kind == 'raw':
+                return 'value', match.group('raw_body'), line
+            if kind not in ('space', 'line_comment', 'block_comment'):
+                return kind, match.group(), line
+        return 'eof', None, self.line
+    
+    def skip(self, pos, comment=False):
+        """Return the position just past the block comment or children block opened before pos"""
+        pattern = KDL_BLOCK_COMMENT if comment else KDL_SKIP
+        depth = 1
+        while True:
+            for match in pattern.finditer(self.source, pos):
+                text = match.group()
+                if text == '/*' and not comment:
+                    # Restart after the comment, which may hide braces
+                    pos = self.skip(match.end(), comment=True)
+                    break
+                if text in ('{', '/*'):
+                    depth += 1
+                elif text in ('}', '*/'):
+                    depth -= 1
+                    if depth == 0:
+                        return match.end()
+            else:
+                raise KdlError(f"line {self.line}: unterminated {'comment' if comment else 'block'}")
+    
+    def peek(self):
+        if self.lookahead is None:
+            self.lookahead = self.read_token()
+        return self.lookahead
+    
+    def next(self):
+        token = self.peek()
+        self.lookahead = None
+        return token
+    
+    def skip_children(self):
+        """Skip a children block whose '{' was just read"""
+        end = self.skip(self.pos)
+        self.line += self.source.count('\n', self.pos, end)
+        self.pos = end
+    
+    def value(self):
+        """Read one value, dropping a leading type annotation"""
+        kind, value, line = self.next()
+        if kind == 'annotation':
+            kind, value, line = self.next()
+        if kind != 'value':
+            raise KdlError(f"line {line}: expected a value, found {value!r}")
+        return value
+    
+    def parse(self):
+        nodes = self.nodes(top=True)
+        kind, value, line = self.peek()
+        if kind != 'eof':
+            raise KdlError(f"line {line}: unbalanced {value!r}")
+        return nodes
+    
+    def nodes(self, build=True, top=False):
+        """Parse nodes until '}' or the end of input"""
+        nodes = []
+        while True:
+            kind, value, line = self.peek()
+            if kind in ('eof', 'close'):
+                return nodes
+            self.next()
+            if kind in ('newline', 'semicolon'):
+                continue
+            discard = kind == 'slashdash'
+            if discard:
+                while self.peek()[0] == 'newline':
+                    self.next()
+                kind, value, line = self.next()
+            if kind == 'annotation':
+                kind, value, line = self.next()
+            if kind != 'value':
+                raise KdlError(f"line {line}: expected a node name, found {value!r}")
+            
+            keep = build and not discard and (not top or self.only is None or value in self.only)
+            node = {'name': value, 'args': [], 'props': {}, 'children': None, 'line': line}
+            skip_next = False
+            while True:
+                kind, value, line = self.peek()
+                if kind in ('newline', 'semicolon', 'eof', 'close'):
+                    break
+                self.next()
+                if kind == 'slashdash':
+                    skip_next = True
+                    continue
+                if kind == 'open':
+                    if not keep or skip_next:
+                        self.skip_children()
+                    else:
+                        node['children'] = self.nodes()
+                        if self.next()[0] != 'close':
+                            raise KdlError(f"line {line}: unterminated children block")
+                        if self.peek()[0] == 'value':
+                            # Be lenient about a missing terminator after the children
+                            break
+                elif kind == 'annotation':
+                    continue
+                elif kind == 'value' and self.peek()[0] == 'equals':
+                    self.next()
+                    prop = self.value()
+                    if not skip_next:
+                        node['props'][value] = prop
+                elif kind == 'value':
+                    if not skip_next:
+                        node['args'].append(value)
+                else:
+                    raise KdlError(f"line {line}: unexpected {value!r}")
+                skip_next = False
+            if keep:
+                nodes.append(node)
+
+
+# Zellij input modes, with display names for the ones that are run together
+ZELLIJ_MODES = {
+    'normal': 'Normal', 'locked': 'Locked', 'resize': 'Resize', 'pane': 'Pane', 'move': 'Move',
+    'tab': 'Tab', 'scroll': 'Scroll', 'search': 'Search', 'entersearch': 'Enter Search',
+    'renametab': 'Rename Tab', 'renamepane': 'Rename Pane', 'session': 'Session',
+    'tmux': 'Tmux', 'prompt': 'Prompt',
+}
+
+
+class ZellijConfigParser:
+    """Resolves the keybinds of a Zellij config.kdl into per-mode bindings
+    
+    Honors clear-defaults (on keybinds and on single modes), shared,
+    shared_except and shared_among blocks, and unbind, in file order so a
+    later bind overrides an earlier one. Zellij's built-in defaults are not
+    listed when clear-defaults is unset; only the configured binds are.
+    """
+    
+    @staticmethod
+    def is_true(value):
+        return value in ('true', '#true')
+    
+    @staticmethod
+    def format_chord(key):
+        return ' + '.join(key.split())
+    
+    @staticmethod
+    def format_action(node):
+        return ' '.join([node['name'], *node['args']])
+    
+    def target_modes(self, node):
+        """Modes a block under keybinds applies to"""
+        name = node['name']
+        if name == 'shared':
+            return list(ZELLIJ_MODES)
+        if name == 'shared_except':
+            return [mode for mode in ZELLIJ_MODES if mode not in node['args']]
+        if name == 'shared_among':
+            return [mode for mode in node['args'] if mode in ZELLIJ_MODES]
+        if name in ZELLIJ_MODES:
+            return [name]
+        return []
+    
+    def parse(self, path):
+        """Return (records, files read) for a Zellij config file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            nodes = KdlParser(f.read(), only={'keybinds'}).parse()
+        
+        # mode -> {chord: (bind id, keys, action, line)}
+        modes = {mode: {} for mode in ZELLIJ_MODES}
+        bind_id = 0
+        for keybinds in nodes:
+            if self.is_true(keybinds['props'].get('clear-defaults')):
+                for bindings in modes.values():
+                    bindings.clear()
+            for block in keybinds['children'] or []:
+                if block['name'] == 'unbind':
+                    for bindings in modes.values():
+                        for key in block['args']:
+                            bindings.pop(key, None)
+                    continue
+                targets = self.target_modes(block)
+                if self.is_true(block['props'].get('clear-defaults')):
+                    for mode in targets:
+                        modes[mode].clear()
+                for statement in block['children'] or []:
+                    if statement['name'] == 'unbind':
+                        for mode in targets:
+                            for key in statement['args']:
+                                modes[mode].pop(key, None)
+                    elif statement['name'] == 'bind':
+                        bind_id += 1
+                        action = '; '.join(self.format_action(node) for node in statement['children'] or [])
+                        for mode in targets:
+                            for key in statement['args']:
+                                modes[mode][key] = (bind_id, statement['args'], action, statement['line'])
+        
+        records = []
+        for mode, bindings in modes.items():
+            # A bind with several keys becomes one record unless some keys were overridden
+            seen = {}
+            for key, (bind_id, keys, action, line) in bindings.items():
+                if bind_id in seen:
+                    seen[bind_id]['keys'].append(key)
+                    continue
+                seen[bind_id] = {'mode': mode, 'keys': [key], 'action': action, 'file': str(path), 'line': line}
+                records.append(seen[bind_id])
+        for record in records:
+            record['key'] = ' / '.join(self.format_chord(key) for key in record['keys'])
+        return records, [Path(path)]
@@ -0,0 +1,121 @@
+"""
+HyprlandCategorizer over the binds of the shipped hyprland.conf
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+
+from keybind_reference.categories import HyprlandCategorizer
+from keybind_reference.core import KeybindCache
+from keybind_reference.hyprland import HyprlandConfigParser
+
+
+HYPRLAND_CONF = SCRIPTS.parent / 'hyprland' / '.config' / 'hypr' / 'hyprland.conf'
+
+
+# (mods, key) -> (dispatcher, category) for every bind in hyprland.conf
+EXPECTED = {
+    ('SUPER', 'RETURN'): ('exec', 'Applications'),
+    ('SUPER', 'Q'): ('killactive', 'Window Management'),
+    ('SUPER', 'M'): ('exit', 'System'),
+    ('SUPER', 'E'): ('exec', 'Applications'),
+    ('SUPER', 'T'): ('togglefloating', 'Window Management'),
+    ('SUPER', 'F'): ('fullscreen', 'Window Management'),
+    ('SUPER', 'SPACE'): ('exec', 'Applications'),
+    ('SUPER', 'P'): ('pseudo', 'Window Management'),
+    ('SUPER', 'J'): ('togglesplit', 'Window Management'),
+    ('SUPER', 'W'): ('exec', 'Applications'),
+    ('SUPER', 'SLASH'): ('exec', 'Applications'),
+    ('SUPER', 'left'): ('movefocus', 'Navigation'),
+    ('SUPER', 'right'): ('movefocus', 'Navigation'),
+    ('SUPER', 'up'): ('movefocus', 'Navigation'),
+    ('SUPER', 'down'): ('movefocus', 'Navigation'),
+    **{('SUPER', str(number)): ('workspace', 'Workspaces') for number in range(10)},
+    **{('SUPER SHIFT', str(number)): ('movetoworkspace', 'Workspaces') for number in range(10)},
+    ('SUPER', 'S'): ('togglespecialworkspace', 'Workspaces'),
+    ('SUPER SHIFT', 'S'): ('movetoworkspace', 'Workspaces'),
+    ('SUPER', 'mouse_down'): ('workspace', 'Workspaces'),
+    ('SUPER', 'mouse_up'): ('workspace', 'Workspaces'),
+    ('SUPER', 'mouse:272'): ('movewindow', 'Window Management'),
+    ('SUPER', 'mouse:273'): ('resizewindow', 'Window Management'),
+    # exec binds the argument patterns claim before the dispatcher table sees them
+    ('', 'XF86AudioRaiseVolume'): ('exec', 'System'),
+    ('', 'XF86AudioLowerVolume'): ('exec', 'System'),
+    ('', 'XF86AudioMute'): ('exec', 'System'),
+    ('', 'XF86AudioMicMute'): ('exec', 'System'),
+    ('', 'XF86MonBrightnessUp'): ('exec', 'System'),
+    ('', 'XF86MonBrightnessDown'): ('exec', 'System'),
+    ('', 'XF86AudioNext'): ('exec', 'System'),
+    ('', 'XF86AudioPause'): ('exec', 'System'),
+    ('', 'XF86AudioPlay'): ('exec', 'System'),
+    ('', 'XF86AudioPrev'): ('exec', 'System'),
+}
+
+
+class HyprlandCategorizerTest(unittest.TestCase):
+    
+    def setUp(self):
+        # A private cache and no user categories.toml
+        self.directory = tempfile.mkdtemp(prefix='keybind-categories-')
+        self.environ = dict(os.environ)
+        os.environ['XDG_CACHE_HOME'] = os.path.join(self.directory, 'cache')
+        os.environ['XDG_CONFIG_HOME'] = os.path.join(self.directory, 'config')
+        self.categorizer = HyprlandCategorizer(KeybindCache())
+    
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.directory)
+    
+    def write_rules(self, text):
+        self.categorizer.rules_path.parent.mkdir(parents=True)
+        self.categorizer.rules_path.write_text(text)
+    
+    def test_hyprland_conf(self):
+        records, _ = HyprlandConfigParser().parse(HYPRLAND_CONF)
+        self.assertEqual(len(records), len(EXPECTED))
+        for record in records:
+            chord = (record['mods'], record['key'])
+            with self.subTest(chord=chord, args=record['args']):
+                dispatcher, category = EXPECTED[chord]
+                self.assertEqual(record['dispatcher'], dispatcher)
+                self.assertEqual(self.categorizer.categorize(record['dispatcher'], record['args']), category)
+    
+    def test_patterns_come_before_dispatchers(self):
+        self.assertEqual(self.categorizer.categorize('exec', 'alacritty -e fish'), 'Applications')
+        self.assertEqual(self.categorizer.categorize('exec', 'wpctl set-volume @DEFAULT_AUDIO_SINK@ 5%+'), 'System')
+        self.assertEqual(self.categorizer.categorize('spawn', 'PlayerCtl next'), 'System')
+    
+    def test_dispatcher_fallbacks(self):
+        self.assertEqual(self.categorizer.categorize(' MoveFocus ', 'l'), 'Navigation')
+        # Qtile's object.method commands fall back to the object
+        self.assertEqual(self.categorizer.categorize('window.kill'), 'Window Management')
+        self.assertEqual(self.categorizer.categorize('nosuchdispatcher'), 'General')
+    
+    def test_user_patterns_come_before_built_in_ones(self):
+        self.write_rules('default = "Other"\n'
+                         '[dispatchers]\ntogglesplit = "Layout"\n'
+                         '[[patterns]]\ncategory = "Media"\nwords = ["playerctl"]\n')
+        self.assertEqual(self.categorizer.categorize('exec', 'playerctl next'), 'Media')
+        self.assertEqual(self.categorizer.categorize('exec', 'wpctl set-mute @DEFAULT_AUDIO_SINK@ toggle'), 'System')
+        self.assertEqual(self.categorizer.categorize('togglesplit'), 'Layout')
+        self.assertEqual(self.categorizer.categorize('nosuchdispatcher'), 'Other')
+    
+    def test_malformed_rules_fall_back_to_built_in_ones(self):
+        self.write_rules('patterns = 3\n')
+        with unittest.mock.patch('sys.stderr') as stderr:
+            self.assertEqual(self.categorizer.categorize('exec', 'playerctl next'), 'System')
+            self.assertEqual(self.categorizer.categorize('killactive'), 'Window Management')
+        self.assertTrue(stderr.write.called)
+
+
+if __name__ == '__main__':
+    unittest.main()
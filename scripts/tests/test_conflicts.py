@@ -0,0 +1,63 @@
+"""
+ChordIndex conflict detection over Neovim mode scopes
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+
+from keybind_reference.conflicts import ChordIndex
+from keybind_reference.model import KeybindTable
+from keybind_reference.sources import KeybindSources
+
+
+def neovim_table(*records):
+    return KeybindTable.from_records([{'action': record['key'], 'category': 'Test', **record} for record in records],
+                                     'neovim_lsp')
+
+
+def conflicts(table):
+    index = ChordIndex()
+    index.update(table)
+    return [(conflict['kind'], conflict['chord'], conflict['scopes']) for conflict in index.conflicts()]
+
+
+class ChordIndexTest(unittest.TestCase):
+    
+    def test_visual_mapping_does_not_duplicate_normal_one(self):
+        table = neovim_table({'key': '<leader>ee'}, {'key': '<leader>ee (v)', 'mode': 'v'})
+        self.assertEqual(conflicts(table), [])
+    
+    def test_same_mode_is_a_duplicate(self):
+        table = neovim_table({'key': '<Leader>ee'}, {'key': '<leader>ee'})
+        self.assertEqual(conflicts(table), [('duplicate', '<leader>ee', ['n'])])
+    
+    def test_nvo_mapping_covers_normal_mode(self):
+        table = neovim_table({'key': '<leader>ee'}, {'key': '<leader>ee (nvo)', 'mode': ''})
+        self.assertEqual(conflicts(table), [('duplicate', '<leader>ee', ['n'])])
+    
+    def test_neovim_fallback_visual_entry(self):
+        # An empty HOME has no Neovim configuration, so the built-in reference loads
+        directory = tempfile.mkdtemp(prefix='keybind-conflicts-')
+        environ = dict(os.environ)
+        try:
+            os.environ['HOME'] = directory
+            os.environ['XDG_CACHE_HOME'] = os.path.join(directory, 'cache')
+            os.environ['XDG_CONFIG_HOME'] = os.path.join(directory, 'config')
+            table = KeybindSources().load_neovim_lsp_keybinds()
+        finally:
+            os.environ.clear()
+            os.environ.update(environ)
+            shutil.rmtree(directory)
+        self.assertIn('<leader>ee (visual)', table.keys)
+        self.assertNotIn('<leader>ee', [chord for _, chord, _ in conflicts(table)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+HyprlandIpcClient against a Unix socket server replaying canned j/binds replies
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+import socketserver
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keybind_reference.hyprland import HyprlandIpcClient
+
+
+BINDS = [
+    {'modmask': 64, 'submap': '', 'key': 'Q', 'keycode': 0, 'catch_all': False, 'description': '',
+     'dispatcher': 'killactive', 'arg': '', 'locked': False, 'mouse': False},
+    {'modmask': 0, 'submap': '', 'key': 'XF86AudioRaiseVolume', 'keycode': 0, 'catch_all': False,
+     'description': 'Lautstärke erhöhen', 'has_description': True, 'dispatcher': 'exec',
+     'arg': 'wpctl set-volume @DEFAULT_AUDIO_SINK@ 5%+', 'locked': True, 'repeat': True},
+    {'modmask': 0, 'submap': 'resize', 'key': 'escape', 'keycode': 0, 'catch_all': False, 'description': '',
+     'dispatcher': 'submap', 'arg': 'reset'},
+]
+
+
+REPLY = json.dumps(BINDS, ensure_ascii=False, indent=4).encode()
+
+
+def split_reply():
+    """The reply in three reads: inside the first element and inside the two bytes of 'ä'"""
+    umlaut = REPLY.index('ä'.encode()) + 1
+    return [REPLY[:40], REPLY[40:umlaut], REPLY[umlaut:]]
+
+
+class ReplayHandler(socketserver.BaseRequestHandler):
+    """Answers every request on a connection with the server's chunks
+    
+    Each connection takes the next behaviour from server.behaviours:
+    'keep' answers until the client hangs up, 'once' closes after the
+    first reply and 'drop' closes without replying.
+    """
+    
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+            behaviour = server.behaviours.pop(0) if server.behaviours else 'keep'
+        while True:
+            request = self.request.recv(4096)
+            if not request:
+                return
+            server.requests.append(request.decode())
+            if behaviour == 'drop':
+                return
+            for chunk in server.chunks:
+                self.request.sendall(chunk)
+                # Give the client a chance to read a partial reply
+                time.sleep(0.02)
+            if behaviour == 'once':
+                return
+
+
+class HyprlandIpcClientTest(unittest.TestCase):
+    
+    def setUp(self):
+        # AF_UNIX paths are limited to about 100 bytes, so stay out of deep temp dirs
+        self.directory = tempfile.mkdtemp(prefix='hypr-ipc-')
+        path = os.path.join(self.directory, '.socket.sock')
+        self.server = socketserver.ThreadingUnixStreamServer(path, ReplayHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.connections = 0
+        self.server.behaviours = []
+        self.server.requests = []
+        self.server.chunks = [REPLY]
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.client = HyprlandIpcClient(path)
+    
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+    
+    def test_reply_split_across_reads(self):
+        self.server.chunks = split_reply()
+        self.assertEqual(self.client.request('j/binds'), BINDS)
+    
+    def test_binds_are_shaped_like_parsed_records(self):
+        self.server.chunks = split_reply()
+        records = self.client.binds()
+        self.assertEqual([(record['mods'], record['key'], record['mode']) for record in records],
+                         [('SUPER', 'Q', ''), ('', 'XF86AudioRaiseVolume', ''), ('', 'escape', 'resize')])
+        self.assertEqual(records[1]['description'], 'Lautstärke erhöhen')
+        self.assertEqual(records[1]['flags'], 'led')
+    
+    def test_connection_is_reused(self):
+        for _ in range(3):
+            self.assertEqual(self.client.request('j/binds'), BINDS)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.server.requests, ['j/binds'] * 3)
+    
+    def test_dropped_connection_is_reopened_once(self):
+        # The compositor hangs up after its first reply, as it does between requests
+        self.server.behaviours = ['once']
+        self.assertEqual(self.client.request('j/binds'), BINDS)
+        self.assertEqual(self.client.request('j/binds'), BINDS)
+        self.assertEqual(self.server.connections, 2)
+    
+    def test_fresh_connection_closed_without_reply_is_not_retried(self):
+        self.server.behaviours = ['drop']
+        with self.assertRaises(ConnectionResetError):
+            self.client.request('j/binds')
+        self.assertEqual(self.server.connections, 1)
+        self.assertIsNone(self.client.connection)
+    
+    def test_truncated_reply(self):
+        self.server.behaviours = ['once']
+        self.server.chunks = [REPLY[:-10]]
+        with self.assertRaises(ValueError):
+            self.client.request('j/binds')
+        self.assertIsNone(self.client.connection)
+    
+    def test_no_compositor(self):
+        client = HyprlandIpcClient(os.path.join(self.directory, 'missing.sock'))
+        with self.assertRaises(OSError):
+            client.request('j/binds')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,19 @@
+#!/usr/bin/python3
+"""
+Wallpaper Library
+Indexed wallpaper collection with cached thumbnails and a GTK picker
+
+This launcher stays tiny on purpose: Python compiles a script run as
+__main__ from source on every launch, while the wallpaper_library package
+next to it is imported from cached bytecode.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from wallpaper_library.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,11 @@
+"""
+Wallpaper Library
+An indexed wallpaper collection with cached thumbnails and a GTK picker
+
+The index (path, mtime, size, dimensions and dominant colour of every
+image) is what `wallpaper.sh set` and `random` query, so neither walks the
+wallpapers directory. Thumbnails follow the freedesktop thumbnail spec
+and are rendered on a process pool; the picker only ever decodes them.
+"""
+
+__version__ = '1.0.0'
@@ -0,0 +1,130 @@
+"""
+Command line entry point: index queries for wallpaper.sh, the thumbnail
+build and the picker, importing GTK only for the picker
+"""
+
+import sys
+
+from . import __version__
+from .index import WallpaperIndex
+
+
+def create_argument_parser():
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        prog='wallpaper-library',
+        description="Indexed wallpaper collection with cached thumbnails and a GTK picker.",
+        epilog="Without a command the picker is started.",
+    )
+    parser.add_argument('--version', action='version', version=f"%(prog)s {__version__}")
+    parser.add_argument('--dir', metavar='PATH',
+                        help="wallpaper directory (default: $WALLPAPER_DIR or ~/dotfiles/wallpapers)")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    
+    random = commands.add_parser('random', help="print a random wallpaper from the index")
+    random.add_argument('--match', metavar='GLOB', action='append', default=[],
+                        help="only file names matching GLOB (case-insensitive, repeatable)")
+    
+    listing = commands.add_parser('list', help="print the indexed wallpapers")
+    listing.add_argument('--match', metavar='GLOB', action='append', default=[],
+                         help="only file names matching GLOB (case-insensitive, repeatable)")
+    listing.add_argument('--json', action='store_true',
+                         help="one JSON object per line with size, dimensions and dominant colour")
+    
+    update = commands.add_parser('update', help="re-stat every file and render missing thumbnails")
+    update.add_argument('-j', '--jobs', type=int, metavar='N', help="worker processes (default: CPUs - 1)")
+    
+    pick = commands.add_parser('pick', help="open the thumbnail picker (the default; experimental)")
+    pick.add_argument('-d', '--daemon', action='store_true', help="stay resident with the window pre-built")
+    pick.add_argument('-t', '--toggle', action='store_true', help="show the picker if hidden, hide it otherwise")
+    return parser
+
+
+def load_index(args):
+    """The index, brought up to date with one stat per directory"""
+    index = WallpaperIndex(args.dir).load()
+    index.refresh()
+    try:
+        index.save()
+    except OSError as e:
+        print(f"Error saving the index: {e}", file=sys.stderr)
+    return index
+
+
+def run_random(args):
+    import random
+    
+    index = load_index(args)
+    relpaths = index.matching(args.match)
+    if not relpaths:
+        print(f"No wallpaper files found in {index.root}", file=sys.stderr)
+        return 1
+    print(index.absolute(random.choice(relpaths)))
+    return 0
+
+
+def run_list(args):
+    import json
+    
+    index = load_index(args)
+    for relpath in index.matching(args.match):
+        if args.json:
+            print(json.dumps(index.row(relpath), ensure_ascii=False))
+        else:
+            print(index.absolute(relpath))
+    return 0
+
+
+def run_update(args):
+    """Full refresh plus analysis of every image lacking a row or a current thumbnail"""
+    import time
+    from .index import analyze_pending
+    from .thumbnails import create_pool, is_current, thumbnail_path
+    
+    start = time.perf_counter()
+    index = WallpaperIndex(args.dir).load()
+    changed, removed = index.refresh(full=True)
+    pending = set(index.unanalyzed())
+    for relpath, row in index.files.items():
+        if not is_current(thumbnail_path(index.absolute(relpath)), row[index.MTIME]):
+            pending.add(relpath)
+    
+    failed = 0
+    if pending:
+        with create_pool(args.jobs) as pool:
+            failed = analyze_pending(index, sorted(pending), pool)
+    try:
+        index.save()
+    except OSError as e:
+        print(f"Error saving the index: {e}", file=sys.stderr)
+        return 1
+    print(f"{len(index)} wallpapers ({len(changed)} new or changed, {len(removed)} removed), "
+          f"{len(pending) - failed} thumbnails rendered in {time.perf_counter() - start:.1f}s")
+    return 1 if failed else 0
+
+
+def main(argv):
+    # Unknown options (e.g. --gapplication-service) are left for GApplication
+    args, unknown = create_argument_parser().parse_known_args(argv[1:])
+    
+    if args.command == 'random':
+        return run_random(args)
+    if args.command == 'list':
+        try:
+            return run_list(args)
+        except BrokenPipeError:
+            # Output piped into head, which exited early; keep the exit flush quiet too
+            import os
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 0
+    if args.command == 'update':
+        return run_update(args)
+    
+    from .picker import WallpaperPicker
+    app_argv = argv[:1] + unknown
+    if args.command == 'pick' and args.daemon:
+        app_argv.append('--daemon')
+    elif args.command == 'pick' and args.toggle:
+        app_argv.append('--toggle')
+    return WallpaperPicker(args.dir).run(app_argv)
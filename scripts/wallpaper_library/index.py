@@ -0,0 +1,297 @@
+"""
+The persistent index of a wallpaper directory
+
+One JSON file per library root in $XDG_CACHE_HOME/wallpaper-library holds
+a row per image (mtime, size, dimensions and dominant colour, keyed by the
+path relative to the root) and the mtime of every directory. Adding,
+removing or renaming a file changes its directory's mtime, so a refresh
+stats the directories and lists only those that changed; a file is
+analyzed again only when its own mtime or size changed.
+
+Next to the JSON file, plain newline-separated lists of the image paths
+(.paths) and the directories (.dirs) let `wallpaper.sh set` pick a random
+wallpaper in bash alone. The .paths file carries the newest directory
+mtime the index has seen, so any directory newer than it (test -nt) means
+the lists are stale and this module has to run. When it does run, it
+sticks to os.path: pathlib and hashlib would cost more to import than a
+refresh.
+"""
+
+import os
+import sys
+import json
+import fnmatch
+
+
+# Bump when the index file changes shape
+INDEX_VERSION = 1
+
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.webp')
+
+DEFAULT_ROOT = '~/dotfiles/wallpapers'
+
+
+# Set WALLPAPER_LIBRARY_DEBUG=1 to report index changes on stderr
+DEBUG = os.environ.get('WALLPAPER_LIBRARY_DEBUG', '') not in ('', '0')
+
+
+def debug(message):
+    if DEBUG:
+        print(f"[wallpaper-library] {message}", file=sys.stderr)
+
+
+def write_atomically(path, text):
+    """Replace a file through a temporary file and a rename, so readers never see it half-written"""
+    import tempfile
+    
+    directory, name = os.path.split(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.splitext(name)[0]}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def is_image(name):
+    return name.lower().endswith(IMAGE_SUFFIXES)
+
+
+class WallpaperIndex:
+    """Rows of the images under a root directory, kept in step with the filesystem
+    
+    `files` maps a relative path to [mtime_ns, size, width, height, color];
+    the last three stay None until the image has been analyzed (see
+    thumbnails.analyze). `dirs` maps a relative directory ('' for the root)
+    to its mtime_ns.
+    """
+    
+    MTIME, SIZE, WIDTH, HEIGHT, COLOR = range(5)
+    
+    def __init__(self, root=None):
+        root = root or os.environ.get('WALLPAPER_DIR') or DEFAULT_ROOT
+        self.root = os.path.abspath(os.path.expanduser(root))
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+        # One index per root, named after its path like systemd escapes unit names
+        name = self.root.strip('/').replace('-', '--').replace('/', '-') or '-'
+        self.path = os.path.join(cache_home, 'wallpaper-library', f"index-{name}.json")
+        base = os.path.splitext(self.path)[0]
+        self.paths_path = f"{base}.paths"
+        self.dirs_path = f"{base}.dirs"
+        self.files = {}
+        self.dirs = {}
+        self.dirty = False
+    
+    def __len__(self):
+        return len(self.files)
+    
+    def absolute(self, relpath):
+        return os.path.join(self.root, relpath) if relpath else self.root
+    
+    def relative(self, path):
+        """Relative path of a file under the root, or None outside it"""
+        relpath = os.path.relpath(os.path.abspath(path), self.root)
+        if relpath == os.curdir:
+            return ''
+        return None if relpath == os.pardir or relpath.startswith(os.pardir + os.sep) else relpath
+    
+    def load(self):
+        """Read the index file; a missing or outdated one leaves the index empty"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get('version') != INDEX_VERSION or data.get('root') != self.root:
+            return self
+        self.files = data.get('files', {})
+        self.dirs = data.get('dirs', {})
+        return self
+    
+    def save(self):
+        if not self.dirty and os.path.exists(self.paths_path):
+            return
+        write_atomically(self.path, json.dumps({
+            'version': INDEX_VERSION,
+            'root': self.root,
+            'dirs': self.dirs,
+            'files': self.files,
+        }, separators=(',', ':'), ensure_ascii=False))
+        self.save_lists()
+        self.dirty = False
+    
+    def save_lists(self):
+        """Write the plain path lists wallpaper.sh reads, stamped with the newest directory mtime"""
+        # A name with a newline in it cannot be told apart in a line-based list
+        lines = lambda relpaths: ''.join(f"{self.absolute(relpath)}\n" for relpath in relpaths if '\n' not in relpath)
+        write_atomically(self.dirs_path, lines(sorted(self.dirs)))
+        write_atomically(self.paths_path, lines(self.matching()))
+        if self.dirs:
+            newest = max(self.dirs.values())
+            os.utime(self.paths_path, ns=(newest, newest))
+    
+    def refresh(self, full=False):
+        """Bring the index up to date; returns (added or changed, removed) relative paths
+        
+        Without full, only directories whose mtime changed are listed, which
+        catches added, removed and renamed files with one stat per directory.
+        full also stats every file, to notice images rewritten in place.
+        """
+        changed, removed = [], []
+        if not self.dirs or not os.path.isdir(self.root):
+            removed.extend(self.files)
+            self.files, self.dirs = {}, {}
+            self.dirty = self.dirty or bool(removed)
+            if os.path.isdir(self.root):
+                self.scan_dir('', changed, removed)
+            return changed, removed
+        
+        for reldir, mtime_ns in list(self.dirs.items()):
+            if reldir not in self.dirs:
+                # Dropped with a parent directory earlier in this refresh
+                continue
+            try:
+                current = os.stat(self.absolute(reldir)).st_mtime_ns
+            except OSError:
+                self.drop_dir(reldir, removed)
+                continue
+            if full or current != mtime_ns:
+                self.scan_dir(reldir, changed, removed, stat_files=full)
+        return changed, removed
+    
+    def scan_dir(self, reldir, changed, removed, stat_files=True):
+        """List one directory, recursing into subdirectories the index does not know yet"""
+        directory = self.absolute(reldir)
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            entries = list(os.scandir(directory))
+        except OSError:
+            self.drop_dir(reldir, removed)
+            return
+        self.dirs[reldir] = mtime_ns
+        self.dirty = True
+        
+        present = set()
+        subdirs = set()
+        for entry in entries:
+            relpath = os.path.join(reldir, entry.name)
+            try:
+                if entry.is_dir():
+                    if not entry.name.startswith('.'):
+                        subdirs.add(relpath)
+                    continue
+                if not (entry.is_file() and is_image(entry.name)):
+                    continue
+                present.add(relpath)
+                if relpath in self.files and not stat_files:
+                    continue
+                self.update_row(relpath, entry.stat(), changed)
+            except OSError:
+                continue
+        
+        for relpath in [relpath for relpath in self.files
+                        if os.path.dirname(relpath) == reldir and relpath not in present]:
+            del self.files[relpath]
+            removed.append(relpath)
+        for subdir in [subdir for subdir in self.dirs
+                       if subdir and os.path.dirname(subdir) == reldir and subdir not in subdirs]:
+            self.drop_dir(subdir, removed)
+        for subdir in sorted(subdirs - self.dirs.keys()):
+            self.scan_dir(subdir, changed, removed)
+    
+    def drop_dir(self, reldir, removed):
+        """Forget a directory that disappeared, with everything below it"""
+        prefix = os.path.join(reldir, '')
+        for subdir in [subdir for subdir in self.dirs if subdir == reldir or subdir.startswith(prefix)]:
+            del self.dirs[subdir]
+        for relpath in [relpath for relpath in self.files if relpath.startswith(prefix)]:
+            del self.files[relpath]
+            removed.append(relpath)
+        self.dirty = True
+    
+    def update_row(self, relpath, st, changed):
+        """Record a file's stat; a new mtime or size clears its analysis"""
+        row = self.files.get(relpath)
+        if row is not None and row[self.MTIME] == st.st_mtime_ns and row[self.SIZE] == st.st_size:
+            return
+        self.files[relpath] = [st.st_mtime_ns, st.st_size, None, None, None]
+        self.dirty = True
+        changed.append(relpath)
+        debug(f"{'changed' if row else 'added'} {relpath}")
+    
+    def update_file(self, relpath):
+        """Re-stat one file after a file monitor event; returns (changed, removed)"""
+        changed, removed = [], []
+        try:
+            st = os.stat(self.absolute(relpath))
+        except OSError:
+            st = None
+        if st is None or not is_image(relpath):
+            if self.files.pop(relpath, None) is not None:
+                removed.append(relpath)
+                self.dirty = True
+        else:
+            self.update_row(relpath, st, changed)
+        return changed, removed
+    
+    def set_analysis(self, relpath, mtime_ns, width, height, color):
+        """Store an analysis result unless the file changed while it ran"""
+        row = self.files.get(relpath)
+        if row is None or row[self.MTIME] != mtime_ns:
+            return False
+        row[self.WIDTH:] = [width, height, color]
+        self.dirty = True
+        return True
+    
+    def unanalyzed(self):
+        return [relpath for relpath, row in self.files.items() if row[self.WIDTH] is None]
+    
+    def matching(self, patterns=()):
+        """Sorted relative paths whose file name matches any of the glob patterns (all without any)"""
+        relpaths = sorted(self.files, key=str.lower)
+        if not patterns:
+            return relpaths
+        patterns = [pattern.lower() for pattern in patterns]
+        return [relpath for relpath in relpaths
+                if any(fnmatch.fnmatchcase(os.path.basename(relpath).lower(), pattern) for pattern in patterns)]
+    
+    def row(self, relpath):
+        """A row as a dict, as printed by `list --json`"""
+        mtime_ns, size, width, height, color = self.files[relpath]
+        return {'path': self.absolute(relpath), 'mtime_ns': mtime_ns, 'size': size,
+                'width': width, 'height': height, 'color': color}
+
+
+def analyze_pending(index, relpaths, pool, on_result=None):
+    """Analyze images on the pool, storing each result in the index as it arrives
+    
+    Images whose thumbnail is already current are still analyzed when their
+    dimensions are unknown, since those live only in the index. Returns the
+    number of images that failed to load.
+    """
+    from concurrent.futures import as_completed
+    from .thumbnails import analyze
+    
+    futures = {}
+    for relpath in relpaths:
+        row = index.files.get(relpath)
+        if row is None:
+            continue
+        futures[pool.submit(analyze, index.absolute(relpath), row[index.MTIME])] = (relpath, row[index.MTIME])
+    
+    failed = 0
+    for future in as_completed(futures):
+        relpath, mtime_ns = futures[future]
+        try:
+            width, height, color = future.result()
+        except Exception as e:
+            failed += 1
+            print(f"Error analyzing {relpath}: {e}", file=sys.stderr)
+            continue
+        index.set_analysis(relpath, mtime_ns, width, height, color)
+        if on_result is not None:
+            on_result(relpath)
+    return failed
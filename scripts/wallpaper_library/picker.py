@@ -0,0 +1,607 @@
+"""
+The GTK 4 / libadwaita wallpaper picker (experimental)
+
+Unlike the index commands, the picker has not been exercised against a
+real GTK yet, so nothing binds it: run `wallpaper-library.py pick` (or
+`wallpaper.sh pick`) by hand.
+"""
+
+import os
+import sys
+import time
+from collections import OrderedDict
+
+from .index import WallpaperIndex, debug
+from .thumbnails import analyze, create_pool, import_pixbuf, is_current, thumbnail_path
+
+
+# GTK is imported on demand by import_gtk(), so the index commands never load gi
+Gtk = Adw = Gdk = GLib = Gio = GObject = Pango = None
+
+
+WallpaperItem = None
+
+
+# Picking a tile runs this with the wallpaper's path appended
+SET_COMMAND = ('~/.config/waybar/scripts/wallpaper.sh', 'set')
+
+TILE_WIDTH = 200
+TILE_HEIGHT = 125
+
+PICKER_CSS = """
+.wallpaper-window { background-color: #24273a; }
+.wallpaper-grid { background-color: transparent; padding: 12px; }
+.wallpaper-grid > child { border-radius: 10px; padding: 6px; }
+.wallpaper-grid > child:selected { background-color: alpha(#8aadf4, 0.25); }
+.wallpaper-thumbnail { border-radius: 6px; }
+.wallpaper-name { color: #cad3f5; font-size: 0.9em; }
+"""
+
+
+def import_gtk():
+    """Import GTK 4 and libadwaita, and define the GObject types that need them"""
+    global Gtk, Adw, Gdk, GLib, Gio, GObject, Pango, WallpaperItem
+    if WallpaperItem is not None:
+        return
+    
+    import gi
+    gi.require_version('Gtk', '4.0')
+    gi.require_version('Adw', '1')
+    from gi.repository import Gtk, Adw, Gdk, GLib, Gio, GObject, Pango
+    
+    class _WallpaperItem(GObject.Object):
+        """List model item for one indexed image in Gtk.GridView"""
+        __gtype_name__ = 'WallpaperItem'
+        
+        name = GObject.Property(type=str, default='')
+        details = GObject.Property(type=str, default='')
+        # The decoded thumbnail (a Gdk.Texture) while it is cached, otherwise None
+        texture = GObject.Property(type=GObject.Object)
+        
+        def __init__(self, index, relpath):
+            super().__init__(name=os.path.splitext(os.path.basename(relpath))[0])
+            self.relpath = relpath
+            self.key = relpath.lower()
+            self.color = None
+            # Number of tiles showing this item; thumbnails are only decoded for bound items
+            self.bound = 0
+            self.update(index)
+        
+        def update(self, index):
+            _mtime_ns, size, width, height, color = index.files[self.relpath]
+            self.color = color
+            dimensions = f"{width}×{height} · " if width else ''
+            self.details = f"{self.relpath}\n{dimensions}{size / 1048576:.1f} MiB"
+    
+    WallpaperItem = _WallpaperItem
+
+
+class ThumbnailLoader:
+    """Fills in WallpaperItem.texture for the tiles on screen
+    
+    Tiles request their item's texture when they are bound, so the work
+    follows the visible part of the grid whatever the size of the library.
+    Current thumbnails are decoded on a thread; missing or stale ones are
+    rendered on the process pool first (which also stores the image's
+    dimensions and dominant colour in the index). Requests for items that
+    scrolled out of view before their turn are dropped. Textures of at most
+    CAPACITY items are kept, least recently requested first out.
+    """
+    
+    CAPACITY = 384
+    
+    def __init__(self, index, on_analyzed):
+        from concurrent.futures import ThreadPoolExecutor
+        
+        self.index = index
+        self.on_analyzed = on_analyzed
+        self.threads = ThreadPoolExecutor(max_workers=2, thread_name_prefix='wallpaper-thumbnail')
+        # Created on the first missing thumbnail, so a warm cache never starts workers
+        self.pool = None
+        self.cached = OrderedDict()
+        self.decoding = set()
+        self.rendering = {}
+        # Images that failed to load keep their swatch instead of being retried on every bind
+        self.failed = set()
+    
+    def request(self, item):
+        if item.texture is not None:
+            self.cached.move_to_end(item)
+            return
+        if item.relpath in self.decoding or item.relpath in self.rendering or item.relpath in self.failed:
+            return
+        row = self.index.files.get(item.relpath)
+        if row is None:
+            return
+        thumbnail = thumbnail_path(self.index.absolute(item.relpath))
+        if row[WallpaperIndex.WIDTH] is None or not is_current(thumbnail, row[WallpaperIndex.MTIME]):
+            self.render(item, row[WallpaperIndex.MTIME])
+        else:
+            self.load(item, thumbnail)
+    
+    def load(self, item, thumbnail):
+        self.decoding.add(item.relpath)
+        future = self.threads.submit(self.decode, item, thumbnail)
+        # Results are applied on the main loop, never from the worker thread
+        future.add_done_callback(lambda future: GLib.idle_add(self.on_decoded, item, future))
+    
+    @staticmethod
+    def decode(item, thumbnail):
+        """Thread job: decode a thumbnail unless its tile has been recycled meanwhile
+        
+        Only GdkPixbuf runs here; the texture is made from the pixbuf on the
+        main loop (see on_decoded), so no GDK object is created off it.
+        """
+        if not item.bound:
+            return None
+        return import_pixbuf().Pixbuf.new_from_file(str(thumbnail))
+    
+    def on_decoded(self, item, future):
+        self.decoding.discard(item.relpath)
+        try:
+            pixbuf = future.result()
+        except GLib.Error as e:
+            # A truncated or foreign thumbnail: render it again
+            debug(f"unreadable thumbnail for {item.relpath} ({e.message})")
+            row = self.index.files.get(item.relpath)
+            if row is not None:
+                self.render(item, row[WallpaperIndex.MTIME])
+            return GLib.SOURCE_REMOVE
+        if pixbuf is not None:
+            item.texture = Gdk.Texture.new_for_pixbuf(pixbuf)
+            self.cached[item] = None
+            self.evict()
+        return GLib.SOURCE_REMOVE
+    
+    def evict(self):
+        """Drop the least recently requested textures, sparing the tiles on screen"""
+        for _ in range(len(self.cached) - self.CAPACITY):
+            item = next(iter(self.cached))
+            if item.bound:
+                self.cached.move_to_end(item)
+                continue
+            del self.cached[item]
+            item.texture = None
+    
+    def render(self, item, mtime_ns):
+        if self.pool is None:
+            self.pool = create_pool()
+        future = self.pool.submit(analyze, self.index.absolute(item.relpath), mtime_ns)
+        self.rendering[item.relpath] = future
+        future.add_done_callback(lambda future: GLib.idle_add(self.on_rendered, item, mtime_ns, future))
+    
+    def on_rendered(self, item, mtime_ns, future):
+        self.rendering.pop(item.relpath, None)
+        try:
+            width, height, color = future.result()
+        except Exception as e:
+            print(f"Error analyzing {item.relpath}: {e}", file=sys.stderr)
+            self.failed.add(item.relpath)
+            return GLib.SOURCE_REMOVE
+        if self.index.set_analysis(item.relpath, mtime_ns, width, height, color):
+            self.on_analyzed(item)
+            if item.bound:
+                # Straight to decoding: an image dated in the future never looks current
+                self.load(item, thumbnail_path(self.index.absolute(item.relpath)))
+        return GLib.SOURCE_REMOVE
+    
+    def forget(self, item):
+        """Drop an item's texture after its image changed or was removed"""
+        self.cached.pop(item, None)
+        self.failed.discard(item.relpath)
+        item.texture = None
+    
+    def shutdown(self):
+        self.threads.shutdown(wait=False, cancel_futures=True)
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class WallpaperPicker:
+    def __init__(self, root=None):
+        import_gtk()
+        
+        self.app = Adw.Application(
+            application_id='org.wallpaper.library',
+            flags=Gio.ApplicationFlags.HANDLES_COMMAND_LINE
+        )
+        self.app.connect('startup', self.on_startup)
+        self.app.connect('activate', self.on_activate)
+        self.app.connect('command-line', self.on_command_line)
+        self.app.connect('shutdown', self.on_shutdown)
+        
+        # Options are parsed locally and forwarded over D-Bus to the primary instance
+        self.app.add_main_option('daemon', ord('d'), GLib.OptionFlags.NONE, GLib.OptionArg.NONE,
+                                 "Stay resident with the window pre-built", None)
+        self.app.add_main_option('toggle', ord('t'), GLib.OptionFlags.NONE, GLib.OptionArg.NONE,
+                                 "Show the picker if hidden, hide it otherwise", None)
+        
+        # The index is read by the primary instance only, so forwarding launches stay cheap
+        self.index = WallpaperIndex(root)
+        self.thumbnails = None
+        self.store = None
+        self.items = {}
+        self.swatches = {}
+        self.save_timeout = 0
+        
+        # Window state (built once and reused for the lifetime of the process)
+        self.window = None
+        self.daemon = False
+        self.search_words = []
+        
+        # Live updates: watched directory -> Gio.FileMonitor, and paths waiting for the debounce
+        self.file_monitors = {}
+        self.pending_paths = set()
+        self.pending_timeout = 0
+    
+    def on_startup(self, app):
+        """Read the index and register show/hide/toggle actions for D-Bus activation"""
+        for name, callback in (('show', self.show_window),
+                               ('hide', self.hide_window),
+                               ('toggle', self.toggle_window)):
+            action = Gio.SimpleAction.new(name, None)
+            action.connect('activate', lambda _action, _param, cb=callback: cb())
+            app.add_action(action)
+        
+        start = time.perf_counter()
+        self.index.load()
+        self.thumbnails = ThumbnailLoader(self.index, self.on_analyzed)
+        self.store = Gio.ListStore(item_type=WallpaperItem)
+        self.items = {relpath: WallpaperItem(self.index, relpath) for relpath in self.index.matching()}
+        self.store.splice(0, 0, list(self.items.values()))
+        debug(f"{len(self.items)} wallpapers loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+        
+        # Catch up with changes made while nothing was watching, once the window is up
+        GLib.idle_add(self.refresh_index, priority=GLib.PRIORITY_LOW)
+        
+        # Started through D-Bus activation (--gapplication-service): stay resident
+        if app.get_flags() & Gio.ApplicationFlags.IS_SERVICE:
+            self.start_daemon()
+    
+    def on_shutdown(self, app):
+        self.thumbnails.shutdown()
+        self.save_index()
+    
+    def refresh_index(self):
+        changed, removed = self.index.refresh()
+        self.apply_changes(changed, removed)
+        self.watch_directories()
+        return GLib.SOURCE_REMOVE
+    
+    def apply_changes(self, changed, removed):
+        """Mirror index changes in the grid's store"""
+        for relpath in removed:
+            item = self.items.pop(relpath, None)
+            if item is None:
+                continue
+            self.thumbnails.forget(item)
+            found, position = self.store.find(item)
+            if found:
+                self.store.remove(position)
+        added = []
+        for relpath in changed:
+            item = self.items.get(relpath)
+            if item is None:
+                item = self.items[relpath] = WallpaperItem(self.index, relpath)
+                added.append(item)
+                continue
+            # Rewritten in place: the tile shows the swatch until the new thumbnail is rendered
+            item.update(self.index)
+            self.thumbnails.forget(item)
+            if item.bound:
+                self.thumbnails.request(item)
+        if self.store.get_n_items() == 0:
+            # First run: the whole library arrives at once
+            self.store.splice(0, 0, sorted(added, key=lambda item: item.key))
+        else:
+            for item in added:
+                self.store.insert_sorted(item, self.compare_items)
+        if changed or removed:
+            self.update_title()
+            self.schedule_save()
+    
+    @staticmethod
+    def compare_items(first, second):
+        return (first.key > second.key) - (first.key < second.key)
+    
+    def on_analyzed(self, item):
+        item.update(self.index)
+        self.schedule_save()
+    
+    def schedule_save(self):
+        """Write the index at most every few seconds while thumbnails are being rendered"""
+        if not self.save_timeout:
+            self.save_timeout = GLib.timeout_add_seconds(3, self.on_save_timeout)
+    
+    def on_save_timeout(self):
+        self.save_timeout = 0
+        self.save_index()
+        return GLib.SOURCE_REMOVE
+    
+    def save_index(self):
+        if self.save_timeout:
+            GLib.source_remove(self.save_timeout)
+            self.save_timeout = 0
+        try:
+            self.index.save()
+        except OSError as e:
+            print(f"Error saving the index: {e}", file=sys.stderr)
+    
+    def watch_directories(self):
+        """Monitor every indexed directory, so files added, removed or rewritten show up live"""
+        for reldir in list(self.file_monitors):
+            if reldir not in self.index.dirs:
+                self.file_monitors.pop(reldir).cancel()
+        for reldir in self.index.dirs:
+            if reldir in self.file_monitors:
+                continue
+            directory = Gio.File.new_for_path(self.index.absolute(reldir))
+            try:
+                monitor = directory.monitor_directory(Gio.FileMonitorFlags.WATCH_MOVES, None)
+            except GLib.Error as e:
+                debug(f"cannot watch {reldir or '.'} ({e.message})")
+                continue
+            monitor.connect('changed', self.on_directory_changed)
+            self.file_monitors[reldir] = monitor
+    
+    def on_directory_changed(self, monitor, file, other_file, event_type):
+        """Collect changed paths and apply them together once a copy or save burst settles"""
+        if event_type in (Gio.FileMonitorEvent.ATTRIBUTE_CHANGED, Gio.FileMonitorEvent.PRE_UNMOUNT,
+                          Gio.FileMonitorEvent.CHANGED):
+            # CHANGED fires per write; CHANGES_DONE_HINT follows once the file is complete
+            return
+        for changed_file in (file, other_file):
+            path = changed_file.get_path() if changed_file is not None else None
+            relpath = self.index.relative(path) if path else None
+            if relpath:
+                self.pending_paths.add(relpath)
+        if self.pending_timeout:
+            GLib.source_remove(self.pending_timeout)
+        self.pending_timeout = GLib.timeout_add(250, self.apply_pending_paths)
+    
+    def apply_pending_paths(self):
+        self.pending_timeout = 0
+        changed, removed = [], []
+        for relpath in sorted(self.pending_paths):
+            if os.path.isdir(self.index.absolute(relpath)):
+                if relpath not in self.index.dirs and not os.path.basename(relpath).startswith('.'):
+                    self.index.scan_dir(relpath, changed, removed)
+            elif relpath in self.index.dirs:
+                self.index.drop_dir(relpath, removed)
+            else:
+                file_changed, file_removed = self.index.update_file(relpath)
+                changed.extend(file_changed)
+                removed.extend(file_removed)
+        self.pending_paths.clear()
+        # Directory mtimes move with every change; keep them current for the next refresh
+        for reldir in self.file_monitors:
+            try:
+                self.index.dirs[reldir] = os.stat(self.index.absolute(reldir)).st_mtime_ns
+            except OSError:
+                pass
+        self.apply_changes(changed, removed)
+        self.watch_directories()
+        return GLib.SOURCE_REMOVE
+    
+    def on_command_line(self, app, command_line):
+        """Handle options from this process or forwarded from a later launch"""
+        options = command_line.get_options_dict()
+        if options.contains('daemon'):
+            self.start_daemon()
+        elif options.contains('toggle'):
+            self.toggle_window()
+        else:
+            app.activate()
+        return 0
+    
+    def on_activate(self, app):
+        self.show_window()
+    
+    def start_daemon(self):
+        """Keep the application and a pre-built, hidden window alive"""
+        if self.daemon:
+            return
+        self.daemon = True
+        self.app.hold()
+        self.build_window()
+        # Closing only hides the window so the next toggle is instant
+        self.window.set_hide_on_close(True)
+    
+    def show_window(self):
+        self.build_window()
+        self.window.present()
+        self.grid.grab_focus()
+    
+    def hide_window(self):
+        if self.window is not None and self.window.get_visible():
+            self.window.close()
+    
+    def toggle_window(self):
+        if self.window is not None and self.window.get_visible():
+            self.hide_window()
+        else:
+            self.show_window()
+    
+    def build_window(self):
+        """Build the window, grid and CSS provider once"""
+        if self.window is not None:
+            return
+        
+        self.window = Adw.ApplicationWindow(application=self.app)
+        self.window.set_title("Wallpapers")
+        self.window.set_css_classes(['wallpaper-window'])
+        self.window.set_default_size(1120, 760)
+        
+        # Set window class for Hyprland window rules
+        GLib.set_prgname('wallpaper-library')
+        
+        header = Adw.HeaderBar()
+        self.window_title = Adw.WindowTitle(title="Wallpapers")
+        header.set_title_widget(self.window_title)
+        self.update_title()
+        
+        # Search bar, revealed with /
+        self.search_entry = Gtk.SearchEntry()
+        self.search_entry.set_placeholder_text("Search wallpapers…")
+        self.search_entry.set_hexpand(True)
+        self.search_entry.connect('search-changed', self.on_search_changed)
+        self.search_entry.connect('activate', self.on_search_activate)
+        self.search_bar = Gtk.SearchBar()
+        self.search_bar.set_child(self.search_entry)
+        self.search_bar.connect_entry(self.search_entry)
+        
+        # Only the tiles in view exist; they are recycled while scrolling
+        self.search_filter = Gtk.CustomFilter.new(self.matches_search, None)
+        self.filtered = Gtk.FilterListModel(model=self.store, filter=self.search_filter)
+        factory = Gtk.SignalListItemFactory()
+        factory.connect('setup', self.on_tile_setup)
+        factory.connect('bind', self.on_tile_bind)
+        factory.connect('unbind', self.on_tile_unbind)
+        self.grid = Gtk.GridView(model=Gtk.SingleSelection(model=self.filtered), factory=factory)
+        self.grid.set_css_classes(['wallpaper-grid'])
+        self.grid.set_min_columns(2)
+        self.grid.set_max_columns(8)
+        self.grid.set_single_click_activate(True)
+        self.grid.connect('activate', self.on_tile_activate)
+        self.tile_handlers = {}
+        
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        scrolled.set_vexpand(True)
+        scrolled.set_child(self.grid)
+        
+        main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        main_box.append(header)
+        main_box.append(self.search_bar)
+        main_box.append(scrolled)
+        self.window.set_content(main_box)
+        
+        css_provider = Gtk.CssProvider()
+        if hasattr(css_provider, 'load_from_string'):
+            css_provider.load_from_string(PICKER_CSS)
+        else:
+            # GTK before 4.12
+            css_provider.load_from_data(PICKER_CSS, -1)
+        Gtk.StyleContext.add_provider_for_display(self.window.get_display(), css_provider,
+                                                  Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+        
+        controller = Gtk.EventControllerKey()
+        controller.connect('key-pressed', self.on_key_pressed)
+        self.window.add_controller(controller)
+    
+    def update_title(self):
+        if self.window is not None:
+            self.window_title.set_subtitle(f"{len(self.items)} in {self.index.root}")
+    
+    def on_tile_setup(self, factory, list_item):
+        """Build one reusable tile; its picture and label are filled in on bind"""
+        tile = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        
+        picture = Gtk.Picture()
+        picture.set_css_classes(['wallpaper-thumbnail'])
+        picture.set_content_fit(Gtk.ContentFit.COVER)
+        picture.set_size_request(TILE_WIDTH, TILE_HEIGHT)
+        picture.set_overflow(Gtk.Overflow.HIDDEN)
+        
+        name_label = Gtk.Label()
+        name_label.set_css_classes(['wallpaper-name'])
+        name_label.set_ellipsize(Pango.EllipsizeMode.MIDDLE)
+        name_label.set_max_width_chars(24)
+        
+        tile.append(picture)
+        tile.append(name_label)
+        list_item.set_child(tile)
+    
+    def on_tile_bind(self, factory, list_item):
+        item = list_item.get_item()
+        tile = list_item.get_child()
+        picture = tile.get_first_child()
+        name_label = picture.get_next_sibling()
+        
+        name_label.set_label(item.name)
+        tile.set_tooltip_text(item.details)
+        self.show_thumbnail(picture, item)
+        
+        item.bound += 1
+        self.tile_handlers[list_item] = item.connect('notify::texture', self.on_texture_changed, picture)
+        self.thumbnails.request(item)
+    
+    def on_tile_unbind(self, factory, list_item):
+        item = list_item.get_item()
+        handler = self.tile_handlers.pop(list_item, None)
+        if item is None or handler is None:
+            return
+        item.disconnect(handler)
+        item.bound -= 1
+    
+    def on_texture_changed(self, item, _pspec, picture):
+        self.show_thumbnail(picture, item)
+    
+    def show_thumbnail(self, picture, item):
+        """The thumbnail when it is decoded, else a swatch of the image's dominant colour"""
+        picture.set_paintable(item.texture or self.swatch(item.color))
+    
+    def swatch(self, color):
+        """A 1x1 texture of a colour, which the picture stretches over the tile"""
+        color = color or '#363a4f'
+        texture = self.swatches.get(color)
+        if texture is None:
+            GdkPixbuf = import_pixbuf()
+            pixbuf = GdkPixbuf.Pixbuf.new(GdkPixbuf.Colorspace.RGB, False, 8, 1, 1)
+            pixbuf.fill(int(color[1:], 16) << 8 | 0xff)
+            texture = Gdk.Texture.new_for_pixbuf(pixbuf)
+            self.swatches[color] = texture
+        return texture
+    
+    def matches_search(self, item, _data):
+        return all(word in item.key for word in self.search_words)
+    
+    def on_search_changed(self, entry):
+        """Refilter, telling the filter model when it only has to look at the current matches"""
+        text = entry.get_text().lower()
+        previous = ' '.join(self.search_words)
+        self.search_words = text.split()
+        if previous and text.startswith(previous):
+            change = Gtk.FilterChange.MORE_STRICT
+        elif previous.startswith(text):
+            change = Gtk.FilterChange.LESS_STRICT
+        else:
+            change = Gtk.FilterChange.DIFFERENT
+        self.search_filter.changed(change)
+    
+    def on_search_activate(self, entry):
+        """Enter in the search entry picks the first match"""
+        if self.filtered.get_n_items():
+            self.on_tile_activate(self.grid, 0)
+    
+    def on_tile_activate(self, grid, position):
+        item = self.filtered.get_item(position)
+        if item is None:
+            return
+        import subprocess
+        
+        command = [os.path.expanduser(part) for part in SET_COMMAND] + [self.index.absolute(item.relpath)]
+        try:
+            subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL, start_new_session=True)
+        except OSError as e:
+            print(f"Error setting wallpaper: {e}", file=sys.stderr)
+            return
+        self.window.close()
+    
+    def on_key_pressed(self, controller, keyval, keycode, state):
+        if keyval == Gdk.KEY_slash:
+            self.search_bar.set_search_mode(True)
+            self.search_entry.grab_focus()
+            return True
+        if keyval in (Gdk.KEY_Escape, Gdk.KEY_q):
+            if self.search_bar.get_search_mode():
+                self.search_bar.set_search_mode(False)
+                self.grid.grab_focus()
+            else:
+                self.window.close()
+            return True
+        return False
+    
+    def run(self, argv=None):
+        return self.app.run(argv if argv is not None else sys.argv)
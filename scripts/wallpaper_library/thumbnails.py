@@ -0,0 +1,141 @@
+"""
+Thumbnails in the freedesktop thumbnail cache, rendered on a process pool
+
+Each image gets a 256px "large" thumbnail at
+$XDG_CACHE_HOME/thumbnails/large/<md5 of its file URI>.png, so file
+managers share them. Rendering (decoding a full-resolution image) is the
+only expensive step in the library and runs in worker processes; this
+module imports nothing from GTK at module level, so workers stay small.
+"""
+
+import os
+import hashlib
+from pathlib import Path
+
+
+# The spec's "large" size; the picker shows tiles of about 200px
+THUMBNAIL_SIZE = 256
+
+# Side of the grid the dominant colour is sampled on, and the bits kept per channel
+COLOR_SAMPLE_SIZE = 24
+COLOR_BITS = 3
+
+
+GdkPixbuf = None
+
+
+def import_pixbuf():
+    """Import GdkPixbuf on first use (in workers and the picker only)"""
+    global GdkPixbuf
+    if GdkPixbuf is None:
+        import gi
+        gi.require_version('GdkPixbuf', '2.0')
+        from gi.repository import GdkPixbuf as _GdkPixbuf
+        GdkPixbuf = _GdkPixbuf
+    return GdkPixbuf
+
+
+def thumbnail_dir():
+    cache_home = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / '.cache')
+    return Path(cache_home) / 'thumbnails' / 'large'
+
+
+def thumbnail_path(path):
+    """Where the thumbnail spec stores the large thumbnail of an image"""
+    uri = Path(path).absolute().as_uri()
+    return thumbnail_dir() / f"{hashlib.md5(uri.encode()).hexdigest()}.png"
+
+
+def is_current(thumbnail, mtime_ns):
+    """Whether a thumbnail exists and was written after the image last changed
+    
+    The spec's Thumb::MTime chunk would need the PNG read; comparing file
+    times needs one stat and agrees with it for thumbnails written here.
+    """
+    try:
+        return thumbnail.stat().st_mtime_ns >= mtime_ns
+    except OSError:
+        return False
+
+
+def dominant_color(pixbuf):
+    """Most common colour of an image as '#rrggbb'
+    
+    Pixels of a small copy are bucketed by their top COLOR_BITS bits per
+    channel; the result is the mean of the fullest bucket, so it is a
+    colour actually in the image rather than an average of all of them.
+    """
+    small = pixbuf.scale_simple(COLOR_SAMPLE_SIZE, COLOR_SAMPLE_SIZE, GdkPixbuf.InterpType.BILINEAR)
+    pixels = small.get_pixels()
+    channels = small.get_n_channels()
+    rowstride = small.get_rowstride()
+    shift = 8 - COLOR_BITS
+    buckets = {}
+    for y in range(small.get_height()):
+        row = y * rowstride
+        for offset in range(row, row + small.get_width() * channels, channels):
+            if channels == 4 and pixels[offset + 3] < 128:
+                continue
+            red, green, blue = pixels[offset], pixels[offset + 1], pixels[offset + 2]
+            key = (red >> shift, green >> shift, blue >> shift)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [1, red, green, blue]
+            else:
+                bucket[0] += 1
+                bucket[1] += red
+                bucket[2] += green
+                bucket[3] += blue
+    if not buckets:
+        return None
+    count, red, green, blue = max(buckets.values())
+    return f"#{red // count:02x}{green // count:02x}{blue // count:02x}"
+
+
+def analyze(path, mtime_ns):
+    """Pool job: (width, height, dominant colour) of an image, writing its thumbnail
+    
+    Loaders such as JPEG's decode straight at the thumbnail's scale, so a
+    large image is never held at full resolution.
+    """
+    import_pixbuf()
+    image_format, width, height = GdkPixbuf.Pixbuf.get_file_info(path)
+    if image_format is None:
+        raise ValueError(f"not an image: {path}")
+    pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(path, THUMBNAIL_SIZE, THUMBNAIL_SIZE, True)
+    pixbuf = pixbuf.apply_embedded_orientation() or pixbuf
+    color = dominant_color(pixbuf)
+    
+    # The spec asks for a private directory and an atomic rename into place
+    thumbnail = thumbnail_path(path)
+    thumbnail.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    tmp_path = thumbnail.with_name(f".{thumbnail.stem}.{os.getpid()}.tmp")
+    options = {
+        'tEXt::Thumb::URI': Path(path).absolute().as_uri(),
+        'tEXt::Thumb::MTime': str(mtime_ns // 1_000_000_000),
+        'tEXt::Thumb::Size': str(os.stat(path).st_size),
+        'tEXt::Thumb::Image::Width': str(width),
+        'tEXt::Thumb::Image::Height': str(height),
+        'tEXt::Software': 'wallpaper-library',
+    }
+    try:
+        pixbuf.savev(str(tmp_path), 'png', list(options), list(options.values()))
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, thumbnail)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return width, height, color
+
+
+def create_pool(workers=None):
+    """Process pool for analyze()
+    
+    Workers come from a fork server, so they never inherit the picker's
+    GTK state, display connection or threads.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    
+    workers = workers or max(1, min(8, (os.cpu_count() or 2) - 1))
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('forkserver'))
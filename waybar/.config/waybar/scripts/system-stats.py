@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Persistent CPU, memory and disk stats for Waybar custom modules
+
+Replaces system-info.sh, which forked bash, top, free, df, uptime and a
+handful of awk and sed processes on every tick of every module. This
+process stays running (use it as a Waybar `exec` without `interval`),
+reads /proc/stat, /proc/meminfo, /proc/loadavg and statvfs directly,
+computes CPU usage from the delta between two /proc/stat samples, and
+prints one JSON line per module whenever its text or tooltip changes.
+
+    system-stats.py cpu                     # one module at its default rate
+    system-stats.py cpu=1                   # refresh every second
+    system-stats.py memory=5 disk=60        # several modules, one stream
+    system-stats.py --once cpu memory disk  # one line each, then exit
+
+Waybar reads one stream per custom module, so each module in the bar runs
+its own streamer; none of them forks anything after startup.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+
+
+class ProcFile:
+    """A /proc file kept open and re-read in place with pread"""
+
+    def __init__(self, path, size=4096):
+        self.fd = os.open(path, os.O_RDONLY)
+        self.size = size
+
+    def read(self):
+        return os.pread(self.fd, self.size, 0).decode('ascii', 'replace')
+
+
+def human_size(size, binary=True, round_up=False):
+    """Format bytes the way `free -h` (binary) and `df -h` do: 516Mi, 5.9Gi, 18G"""
+    units = ('B', 'K', 'M', 'G', 'T', 'P')
+    value = float(size)
+    unit = 0
+    while value >= 1024 and unit < len(units) - 1:
+        value /= 1024
+        unit += 1
+    suffix = units[unit] + ('i' if binary and unit else '')
+    if unit and value < 10:
+        value = math.ceil(value * 10) / 10 if round_up else value
+        return f"{value:.1f}{suffix}"
+    return f"{math.ceil(value) if round_up else round(value)}{suffix}"
+
+
+class CpuModule:
+    """Busy share of all CPUs since the previous sample, with the 1-minute load"""
+
+    name = 'cpu'
+    interval = 3
+
+    def __init__(self):
+        self.stat = ProcFile('/proc/stat', 256)
+        self.loadavg = ProcFile('/proc/loadavg', 128)
+        self.previous = self.times()
+
+    def times(self):
+        """(busy, total) jiffies from the aggregate cpu line"""
+        fields = [int(field) for field in self.stat.read().split('\n', 1)[0].split()[1:]]
+        # guest and guest_nice are already counted in user and nice
+        total = sum(fields[:8])
+        idle = fields[3] + fields[4]
+        return total - idle, total
+
+    def sample(self):
+        busy, total = self.times()
+        previous_busy, previous_total = self.previous
+        self.previous = busy, total
+        elapsed = total - previous_total
+        usage = f"{(busy - previous_busy) * 100 / elapsed:.1f}%" if elapsed > 0 else "0.0%"
+        load = self.loadavg.read().split()[0]
+        return {'text': f"\U000f035b {usage}", 'tooltip': f"CPU Usage: {usage}\nLoad Average: {load}"}
+
+
+class MemoryModule:
+    """Used memory as `free` counts it: total minus available"""
+
+    name = 'memory'
+    interval = 3
+
+    def __init__(self):
+        self.meminfo = ProcFile('/proc/meminfo', 512)
+
+    def sample(self):
+        values = {}
+        for line in self.meminfo.read().splitlines():
+            key, _, value = line.partition(':')
+            if key in ('MemTotal', 'MemAvailable'):
+                values[key] = int(value.split()[0]) * 1024
+        total, available = values['MemTotal'], values['MemAvailable']
+        used = total - available
+        usage = f"{used * 100 / total:.0f}%"
+        return {
+            'text': f"  {usage}",
+            'tooltip': f"Memory Usage: {usage}\nUsed: {human_size(used)} / {human_size(total)}",
+        }
+
+
+class DiskModule:
+    """Space used on a filesystem, rounded up like `df`"""
+
+    name = 'disk'
+    interval = 30
+
+    def __init__(self, path='/'):
+        self.path = path
+
+    def sample(self):
+        st = os.statvfs(self.path)
+        size = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        available = st.f_bavail * st.f_frsize
+        usage = f"{math.ceil(used * 100 / (used + available)) if used + available else 0}%"
+        return {
+            'text': f"\U000f01bc {usage}",
+            'tooltip': (f"Disk Usage: {usage}\nUsed: {human_size(used, False, True)} / "
+                        f"{human_size(size, False, True)}\nAvailable: {human_size(available, False, True)}"),
+        }
+
+
+MODULES = {module.name: module for module in (CpuModule, MemoryModule, DiskModule)}
+
+
+def parse_module(spec):
+    """'cpu' or 'cpu=1.5' -> (name, interval in seconds)"""
+    import argparse
+
+    name, _, interval = spec.partition('=')
+    if name not in MODULES:
+        raise argparse.ArgumentTypeError(f"unknown module {name!r} (choose from {', '.join(MODULES)})")
+    try:
+        seconds = float(interval) if interval else MODULES[name].interval
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid interval {interval!r}") from None
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError("the interval must be positive")
+    return name, seconds
+
+
+def stream(modules, once=False):
+    """Print a JSON line for each module when it is due and its output changed"""
+    start = time.monotonic()
+    due = {}
+    for module, interval in modules:
+        # The first CPU figure needs a second /proc/stat sample to diff against
+        warmup = (0.25 if once else min(1.0, interval)) if isinstance(module, CpuModule) else 0.0
+        due[module] = start + warmup
+    last = {}
+    while True:
+        now = time.monotonic()
+        lines = []
+        for module, interval in modules:
+            if due[module] > now:
+                continue
+            line = json.dumps(module.sample(), ensure_ascii=False)
+            if line != last.get(module):
+                last[module] = line
+                lines.append(line)
+            # Stay on the original schedule unless a whole tick was missed
+            due[module] = max(due[module] + interval, now)
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
+            sys.stdout.flush()
+        if once and len(last) == len(modules):
+            return
+        time.sleep(max(0.0, min(due.values()) - time.monotonic()))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Stream CPU, memory and disk stats as Waybar JSON lines.",
+        epilog="Intervals default to cpu=3, memory=3 and disk=30 seconds.",
+    )
+    parser.add_argument('modules', nargs='+', type=parse_module, metavar='MODULE[=SECONDS]',
+                        help="cpu, memory or disk, optionally with its refresh interval")
+    parser.add_argument('--path', default='/', help="filesystem shown by the disk module (default: /)")
+    parser.add_argument('--once', action='store_true', help="print each module once and exit")
+    args = parser.parse_args()
+
+    modules = []
+    for name, interval in dict(args.modules).items():
+        module = DiskModule(args.path) if name == 'disk' else MODULES[name]()
+        modules.append((module, interval))
+
+    try:
+        stream(modules, once=args.once)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # Waybar went away; do not print a traceback on the way out
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
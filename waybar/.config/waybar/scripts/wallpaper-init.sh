@@ -7,6 +7,7 @@ set -euo pipefail
 
 # Configuration
 WALLPAPER_DIR="$HOME/dotfiles/wallpapers"
+WALLPAPER_LIBRARY="$HOME/dotfiles/scripts/wallpaper-library.py"
 MAX_WAIT_TIME=30
 WAIT_INTERVAL=1
 
@@ -49,9 +50,9 @@ set_initial_wallpaper() {
     # Find a nice default wallpaper (prefer catppuccin themed ones)
     local default_wallpaper=""
     
-    # Try to find catppuccin themed wallpapers first
+    # Try to find catppuccin themed wallpapers first (from the wallpaper library's index)
     for pattern in "catppuccin*" "*catppuccin*" "*macchiato*"; do
-        local found_wallpaper=$(find "$WALLPAPER_DIR" -maxdepth 1 -iname "$pattern" -type f \( -iname "*.png" -o -iname "*.jpg" -o -iname "*.jpeg" -o -iname "*.webp" \) | head -1)
+        local found_wallpaper=$(python3 "$WALLPAPER_LIBRARY" --dir "$WALLPAPER_DIR" list --match "$pattern" | head -1)
         if [[ -n "$found_wallpaper" ]]; then
             default_wallpaper="$found_wallpaper"
             break
@@ -60,7 +61,7 @@ set_initial_wallpaper() {
     
     # If no catppuccin wallpaper found, use any wallpaper
     if [[ -z "$default_wallpaper" ]]; then
-        default_wallpaper=$(find "$WALLPAPER_DIR" -maxdepth 1 -type f \( -iname "*.png" -o -iname "*.jpg" -o -iname "*.jpeg" -o -iname "*.webp" \) | head -1)
+        default_wallpaper=$(python3 "$WALLPAPER_LIBRARY" --dir "$WALLPAPER_DIR" list | head -1)
     fi
     
     if [[ -z "$default_wallpaper" ]]; then
@@ -92,6 +93,8 @@ main() {
     
     # Set initial wallpaper
     if set_initial_wallpaper; then
+        # Index new images and render their thumbnails in the background
+        nohup python3 "$WALLPAPER_LIBRARY" --dir "$WALLPAPER_DIR" update >/dev/null 2>&1 &
         log_info "Wallpaper initialization completed successfully"
         exit 0
     else
@@ -33,7 +33,7 @@ case "${1:-status}" in
         ;;
     "set"|"random")
         # Execute wallpaper set command, but don't output to stdout
-        "$WALLPAPER_SCRIPT" set >/dev/null 2>&1 &
+        "$WALLPAPER_SCRIPT" "$@" >/dev/null 2>&1 &
         ;;
     *)
         # Pass through other commands
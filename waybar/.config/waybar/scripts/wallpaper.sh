@@ -1,7 +1,7 @@
 #!/bin/bash
 
-# Wallpaper randomization script using swww and waypaper
-# This script sets a random wallpaper from the dotfiles wallpapers directory
+# Wallpaper randomization script using swww and the wallpaper library
+# This script sets a random (or a given) wallpaper from the dotfiles wallpapers directory
 
 set -euo pipefail
 
@@ -14,6 +14,12 @@ NC='\033[0m' # No Color
 
 # Configuration
 WALLPAPER_DIR="$HOME/dotfiles/wallpapers"
+# Indexed wallpaper library: random picks, thumbnails and the picker
+WALLPAPER_LIBRARY="$HOME/dotfiles/scripts/wallpaper-library.py"
+WALLPAPER_CACHE="${XDG_CACHE_HOME:-$HOME/.cache}/wallpaper-library"
+# Below this many images a find costs less than starting Python to refresh the
+# index (about 3 ms for 60 images against 56 ms; find reaches that near 3500)
+WALLPAPER_INDEX_THRESHOLD=2000
 TRANSITION_TYPES=("simple" "fade" "wipe" "wave" "grow" "center")
 TRANSITION_DURATION="1.5"
 NOTIFICATION_TIMEOUT=3000
@@ -51,27 +57,51 @@ send_notification() {
     fi
 }
 
-# Get random wallpaper from directory
+# Get a random wallpaper: find for small collections, the library's index for large ones
 get_random_wallpaper() {
     if [[ ! -d "$WALLPAPER_DIR" ]]; then
         log_error "Wallpapers directory not found: $WALLPAPER_DIR"
         return 1
     fi
     
-    # Find all image files (png, jpg, jpeg, webp)
-    local wallpapers=()
-    while IFS= read -r -d '' file; do
-        wallpapers+=("$file")
-    done < <(find "$WALLPAPER_DIR" -type f \( -iname "*.png" -o -iname "*.jpg" -o -iname "*.jpeg" -o -iname "*.webp" \) -print0)
+    # The library keeps plain lists next to its index, named like index.py names it
+    local name="${WALLPAPER_DIR#/}"
+    name="${name%/}"
+    name="${name//-/--}"
+    name="${name//\//-}"
+    local paths_file="$WALLPAPER_CACHE/index-$name.paths"
+    local dirs_file="$WALLPAPER_CACHE/index-$name.dirs"
+    
+    local -a wallpapers=()
+    if [[ -f "$paths_file" && -f "$dirs_file" ]]; then
+        mapfile -t wallpapers < "$paths_file"
+    fi
+    
+    if (( ${#wallpapers[@]} < WALLPAPER_INDEX_THRESHOLD )); then
+        # Find all image files (png, jpg, jpeg, webp)
+        wallpapers=()
+        mapfile -d '' wallpapers < <(find "$WALLPAPER_DIR" -type f \( -iname "*.png" -o -iname "*.jpg" -o -iname "*.jpeg" -o -iname "*.webp" \) -print0)
+    else
+        # The list is current unless a directory changed after the newest mtime it records
+        local dir
+        local -a dirs=()
+        mapfile -t dirs < "$dirs_file"
+        for dir in "${dirs[@]}"; do
+            if [[ ! -d "$dir" || "$dir" -nt "$paths_file" ]]; then
+                # Python refreshes the index with one stat per directory and rewrites the lists
+                python3 "$WALLPAPER_LIBRARY" --dir "$WALLPAPER_DIR" random
+                return
+            fi
+        done
+    fi
     
     if [[ ${#wallpapers[@]} -eq 0 ]]; then
         log_error "No wallpaper files found in $WALLPAPER_DIR"
         return 1
     fi
     
-    # Select random wallpaper
-    local random_index=$((RANDOM % ${#wallpapers[@]}))
-    echo "${wallpapers[$random_index]}"
+    # Select random wallpaper; $RANDOM has 15 bits, two of them cover any collection
+    echo "${wallpapers[((RANDOM << 15 | RANDOM) % ${#wallpapers[@]})]}"
 }
 
 # Get random transition type
@@ -135,11 +165,13 @@ EOF
 main() {
     case "${1:-}" in
         "set"|"random")
-            # Set random wallpaper
+            # Set the given wallpaper, or a random one
             check_swww_daemon
             
-            local wallpaper
-            wallpaper=$(get_random_wallpaper) || exit 1
+            local wallpaper="${2:-}"
+            if [[ -z "$wallpaper" ]]; then
+                wallpaper=$(get_random_wallpaper) || exit 1
+            fi
             
             local transition
             transition=$(get_random_transition)
@@ -152,6 +184,12 @@ main() {
             check_swww_daemon
             sleep 1
             main "set"
+            # Index new images and render their thumbnails in the background
+            nohup python3 "$WALLPAPER_LIBRARY" --dir "$WALLPAPER_DIR" update >/dev/null 2>&1 &
+            ;;
+        "pick")
+            # Choose a wallpaper from thumbnails (picking one runs `$0 set PATH`)
+            python3 "$WALLPAPER_LIBRARY" --dir "$WALLPAPER_DIR" pick --toggle
             ;;
         "status"|"")
             # Output status for Waybar
@@ -165,14 +203,16 @@ Usage:
     $0 [command]
 
 Commands:
-    set, random    Set a random wallpaper
-    init          Initialize swww daemon and set initial wallpaper
-    status        Output status JSON for Waybar (default)
-    help          Show this help message
+    set, random [PATH]  Set PATH, or a random wallpaper
+    pick                Choose a wallpaper from thumbnails (experimental)
+    init                Initialize swww daemon and set initial wallpaper
+    status              Output status JSON for Waybar (default)
+    help                Show this help message
 
 Examples:
     $0              # Output Waybar JSON status
     $0 set          # Set random wallpaper
+    $0 pick         # Open the wallpaper picker
     $0 init         # Initialize system
 EOF
             ;;